@@ -0,0 +1,368 @@
+"""
+Micro benchmarks of the tiling pipeline, run on deterministic synthetic data.
+
+Run from the root of the repository:
+
+    python benchmarks/bench.py --sizes 100 1000 --output results.json
+
+and compare a later run against a saved baseline:
+
+    python benchmarks/bench.py --compare results.json --threshold 0.2
+
+The exit code is 1 when a benchmark is slower than its baseline by more than
+the threshold. Benchmarks are compared by their fastest repeat, which is the
+least affected by other load on the machine, and only count as slower when
+none of their repeats is as fast as the slowest baseline repeat. Benchmarks
+whose baseline is shorter than --min-duration are too noisy to compare and
+are skipped.
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pdg3dtiles import (  # noqa: E402
+    BoundingVolume,
+    BoundingVolumeBox,
+    BoundingVolumeRegion,
+    Cesium3DTile,
+    Tileset,
+    parent_tile_from_children_json,
+)
+from tests.synthetic import GENERATORS  # noqa: E402
+
+# Keep the progress logs of the tiles out of the benchmark output
+logging.getLogger("pdg3dtiles").setLevel(logging.WARNING)
+
+BENCHMARKS = {}
+
+
+def benchmark(name, datasets=True):
+    """
+    Register a benchmark. The decorated function gets the synthetic
+    GeoDataFrame (or None when datasets is False), the size, and a temporary
+    directory, and returns a (setup, run) pair: setup is called before every
+    repeat and is not timed, and run gets the result of setup and is timed.
+    """
+
+    def register(function):
+        BENCHMARKS[name] = (function, datasets)
+        return function
+
+    return register
+
+
+def _prepared_tile(gdf):
+    # A tile with its geometries reprojected, ready to tesselate
+    tile = Cesium3DTile()
+    gdf = gdf.copy()
+    gdf["geometry"] = gdf["geometry"].apply(tile.to_multipolygon)
+    tile.geodataframe = gdf
+    tile.transformed_geometries = gdf.to_crs(epsg=Cesium3DTile.CESIUM_EPSG).geometry
+    return tile
+
+
+@benchmark("to_multipolygon")
+def bench_to_multipolygon(gdf, size, tmp):
+    tile = Cesium3DTile()
+    return (lambda: gdf.geometry), lambda geoms: geoms.apply(tile.to_multipolygon)
+
+
+@benchmark("tesselate")
+def bench_tesselate(gdf, size, tmp):
+    tile = _prepared_tile(gdf)
+
+    def setup():
+        tile.geometries = []
+        return tile
+
+    return setup, lambda tile: tile.tesselate()
+
+
+@benchmark("create_gltf")
+def bench_create_gltf(gdf, size, tmp):
+    tile = _prepared_tile(gdf)
+    tile.tesselate()
+    return (lambda: tile), lambda tile: tile.create_gltf()
+
+
+@benchmark("create_batch_table")
+def bench_create_batch_table(gdf, size, tmp):
+    tile = _prepared_tile(gdf)
+
+    def setup():
+        tile.geodataframe = tile.geodataframe.drop(columns="uuid", errors="ignore")
+        return tile
+
+    return setup, lambda tile: tile.create_batch_table()
+
+
+@benchmark("bounding_box_from_points")
+def bench_box_from_points(gdf, size, tmp):
+    points = BoundingVolume.ecef_points_from_gdf(gdf)
+    return (lambda: points), BoundingVolumeBox.from_points
+
+
+@benchmark("bounding_box_add")
+def bench_box_add(gdf, size, tmp):
+    points = BoundingVolume.ecef_points_from_gdf(gdf)
+    boxes = [
+        BoundingVolumeBox.from_points(chunk)
+        for chunk in np.array_split(points, min(size, len(points)))
+    ]
+
+    def run(boxes):
+        box = boxes[0]
+        for other in boxes[1:]:
+            box = box.add(other)
+        return box
+
+    return (lambda: boxes), run
+
+
+def _tree_tileset(size):
+    # A tileset with a root tile and size leaf tiles in a grid
+    n = int(np.ceil(np.sqrt(size)))
+    children = []
+    for i in range(size):
+        west, south = -150 + (i % n) / n, 68 + (i // n) / n
+        region = BoundingVolumeRegion.values_list_from_degrees(
+            west, south, west + 1 / n, south + 1 / n, 0, 10
+        )
+        children.append(
+            {
+                "boundingVolume": {"region": region},
+                "geometricError": 0.0,
+                "content": {"uri": f"tiles/{i}.b3dm"},
+            }
+        )
+    return Tileset.from_json(
+        {
+            "asset": {"version": "1.0"},
+            "geometricError": 100.0,
+            "root": {
+                "boundingVolume": {
+                    "region": BoundingVolumeRegion.values_list_from_degrees(
+                        -150, 68, -149, 69, 0, 10
+                    )
+                },
+                "geometricError": 100.0,
+                "refine": "REPLACE",
+                "children": children,
+            },
+        }
+    )
+
+
+@benchmark("tileset_to_file", datasets=False)
+def bench_tileset_to_file(gdf, size, tmp):
+    tileset = _tree_tileset(size)
+    path = os.path.join(tmp, "tileset.json")
+    return (lambda: tileset), lambda tileset: tileset.to_file(path)
+
+
+@benchmark("tileset_from_file", datasets=False)
+def bench_tileset_from_file(gdf, size, tmp):
+    path = os.path.join(tmp, "tileset.json")
+    _tree_tileset(size).to_file(path)
+    return (lambda: path), Tileset.from_file
+
+
+@benchmark("parent_tile_from_children_json", datasets=False)
+def bench_parent_tile(gdf, size, tmp):
+    tileset = _tree_tileset(size)
+    paths = []
+    for i, child in enumerate(tileset.root.children):
+        leaf = Tileset.from_json(
+            {
+                "asset": {"version": "1.0"},
+                "geometricError": 1.0,
+                "root": child.to_dict(),
+            }
+        )
+        path = os.path.join(tmp, f"leaf_{i}.json")
+        leaf.to_file(path)
+        paths.append(path)
+
+    def run(paths):
+        return parent_tile_from_children_json(paths, dir=tmp, filename="parent")
+
+    return (lambda: paths), run
+
+
+def run_benchmarks(names, datasets, sizes, repeat=10, seed=0):
+    """
+    Run benchmarks on every dataset and size.
+
+    Returns
+    -------
+    list of dict
+        One result per benchmark, dataset and size, with the time of every
+        repeat and their min, median and mean, in seconds.
+    """
+    results = []
+    for name in names:
+        function, uses_data = BENCHMARKS[name]
+        for dataset in datasets if uses_data else ["tree"]:
+            for size in sizes:
+                gdf = GENERATORS[dataset](size, seed=seed) if uses_data else None
+                tmp = tempfile.mkdtemp(prefix="pdg3dtiles-bench-")
+                try:
+                    setup, run = function(gdf, size, tmp)
+                    # One untimed warm-up run fills caches and lazy imports
+                    run(setup())
+                    times = []
+                    for _ in range(repeat):
+                        state = setup()
+                        start = time.perf_counter()
+                        run(state)
+                        times.append(time.perf_counter() - start)
+                finally:
+                    shutil.rmtree(tmp, ignore_errors=True)
+                result = {
+                    "benchmark": name,
+                    "dataset": dataset,
+                    "size": size,
+                    "repeat": repeat,
+                    "min": min(times),
+                    "median": statistics.median(times),
+                    "mean": statistics.mean(times),
+                    "times": times,
+                }
+                print(
+                    f"{name:32s} {dataset:14s} {size:>8d} "
+                    f"{result['median'] * 1000:12.3f} ms",
+                    flush=True,
+                )
+                results.append(result)
+    return results
+
+
+def compare(results, baseline, threshold=0.2, min_duration=0.05):
+    """
+    Compare results with a baseline. A benchmark has regressed when its min
+    time is more than (1 + threshold) times the baseline min, and all of its
+    repeats are slower than every baseline repeat, so that a single slow
+    repeat on a busy machine is not reported. Benchmarks whose baseline min is
+    shorter than min_duration are skipped, because timer resolution and
+    scheduling noise are a large part of their time.
+
+    Returns
+    -------
+    list of dict
+        The benchmarks that are in both, with the ratio of their min times,
+        whether they were skipped, and whether they regressed.
+    """
+    key = lambda r: (r["benchmark"], r["dataset"], r["size"])  # noqa: E731
+    base = {key(r): r for r in baseline["results"]}
+    comparison = []
+    for result in results:
+        old = base.get(key(result))
+        if old is None or old["min"] == 0:
+            continue
+        ratio = result["min"] / old["min"]
+        skipped = old["min"] < min_duration
+        # Baselines saved before the times of each repeat were kept only have
+        # the min, median and mean
+        slowest = max(old.get("times") or [old["median"]])
+        separated = min(result.get("times") or [result["min"]]) > slowest
+        comparison.append(
+            {
+                "benchmark": result["benchmark"],
+                "dataset": result["dataset"],
+                "size": result["size"],
+                "baseline": old["min"],
+                "min": result["min"],
+                "ratio": ratio,
+                "skipped": skipped,
+                "regression": not skipped and ratio > 1 + threshold and separated,
+            }
+        )
+    return comparison
+
+
+def metadata():
+    """
+    Describe the machine and versions that the benchmarks ran on.
+    """
+    import geopandas
+    import shapely
+
+    return {
+        "date": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "processor": platform.processor(),
+        "numpy": np.__version__,
+        "shapely": shapely.__version__,
+        "geopandas": geopandas.__version__,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000])
+    parser.add_argument(
+        "--datasets", nargs="+", default=list(GENERATORS), choices=list(GENERATORS)
+    )
+    parser.add_argument(
+        "--benchmarks", nargs="+", default=list(BENCHMARKS), choices=list(BENCHMARKS)
+    )
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Save the results to this JSON file")
+    parser.add_argument("--compare", help="A baseline JSON file to compare with")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.2,
+        help="The allowed slowdown compared to the baseline (default 0.2)",
+    )
+    parser.add_argument(
+        "--min-duration",
+        type=float,
+        default=0.05,
+        help="Skip benchmarks whose baseline is shorter, in seconds (default 0.05)",
+    )
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(
+        args.benchmarks, args.datasets, args.sizes, args.repeat, args.seed
+    )
+    output = {"meta": metadata(), "results": results}
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(output, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        comparison = compare(results, baseline, args.threshold, args.min_duration)
+        print()
+        for row in comparison:
+            flag = "REGRESSION" if row["regression"] else ""
+            if row["skipped"]:
+                flag = "skipped (too short)"
+            print(
+                f"{row['benchmark']:32s} {row['dataset']:14s} {row['size']:>8d} "
+                f"{row['ratio']:8.2f}x {flag}"
+            )
+        if any(row["regression"] for row in comparison):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
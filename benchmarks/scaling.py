@@ -0,0 +1,272 @@
+"""
+Scaling benchmark of a full tileset build: leaf tiles are built from
+synthetic polygons with leaf_tile_from_gdf in a pool of worker processes, and
+the tree of parent tiles is then built level by level with
+parent_tile_from_children_json. Each combination of feature count and worker
+count runs in a fresh process, so that its peak memory can be measured.
+
+Run from the root of the repository:
+
+    python benchmarks/scaling.py --features 1000 10000 100000 --workers 1 4 16 \
+        --output scaling
+
+This writes scaling.csv and scaling.json, with one row per run.
+"""
+
+import argparse
+import csv
+import json
+import logging
+import math
+import os
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pdg3dtiles import leaf_tile_from_gdf, parent_tile_from_children_json  # noqa
+from tests.synthetic import GENERATORS  # noqa: E402
+
+# Keep the progress logs of the tiles out of the benchmark output
+logging.getLogger("pdg3dtiles").setLevel(logging.WARNING)
+
+# The area that the synthetic layer covers
+BOUNDS = (-150.0, 68.0, -148.0, 69.0)
+
+COLUMNS = [
+    "features",
+    "workers",
+    "dataset",
+    "leaves",
+    "vertices",
+    "leaf_seconds",
+    "parent_seconds",
+    "total_seconds",
+    "features_per_second",
+    "vertices_per_second",
+    "speedup",
+    "efficiency",
+    "peak_rss_main_mb",
+    "peak_rss_worker_mb",
+    "output_bytes",
+    "files",
+]
+
+
+def leaf_bounds(i, leaves):
+    """
+    Get the bounds of leaf i in a grid of square-ish cells over BOUNDS.
+    """
+    columns = math.ceil(math.sqrt(leaves))
+    rows = math.ceil(leaves / columns)
+    west, south, east, north = BOUNDS
+    width, height = (east - west) / columns, (north - south) / rows
+    x, y = i % columns, i // columns
+    return (
+        west + x * width,
+        south + y * height,
+        west + (x + 1) * width,
+        south + (y + 1) * height,
+    )
+
+
+def build_leaf(args):
+    """
+    Generate the polygons of one leaf and build its tile. Runs in a worker.
+
+    Returns
+    -------
+    path, vertices : str, int
+        The path to the leaf tileset JSON, and the number of vertices in its
+        B3DM.
+    """
+    i, leaves, n, dataset, seed, out_dir = args
+    gdf = GENERATORS[dataset](n, seed=seed + i, bounds=leaf_bounds(i, leaves))
+    tile, tileset = leaf_tile_from_gdf(gdf, dir=out_dir, filename=f"leaf_{i}")
+    vertices = sum(len(g["position"]) // 12 for g in tile.geometries)
+    return os.path.join(out_dir, f"leaf_{i}.json"), vertices
+
+
+def build_parent(args):
+    """
+    Build one parent tile from its children. Runs in a worker.
+    """
+    children, out_dir, filename = args
+    parent_tile_from_children_json(children, dir=out_dir, filename=filename)
+    return os.path.join(out_dir, filename + ".json")
+
+
+def peak_rss_mb(who):
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    rss = resource.getrusage(who).ru_maxrss
+    return rss / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+def run_build(features, workers, dataset, per_leaf, fanout, seed, out_dir):
+    """
+    Build a tileset with the given number of features and workers.
+
+    Returns
+    -------
+    dict
+        The measurements of the run, with the keys in COLUMNS (except speedup
+        and efficiency, which are computed from several runs).
+    """
+    leaves = max(1, math.ceil(features / per_leaf))
+    counts = [per_leaf] * (leaves - 1) + [features - per_leaf * (leaves - 1)]
+    tasks = [(i, leaves, n, dataset, seed, out_dir) for i, n in enumerate(counts)]
+
+    with ProcessPoolExecutor(workers) as pool:
+        start = time.perf_counter()
+        built = list(pool.map(build_leaf, tasks, chunksize=1))
+        leaf_seconds = time.perf_counter() - start
+
+        # Build the parent levels until there is one root tile
+        start = time.perf_counter()
+        level = [path for path, _ in built]
+        depth = 0
+        while len(level) > 1:
+            groups = [level[i : i + fanout] for i in range(0, len(level), fanout)]
+            tasks = [
+                (group, out_dir, f"parent_{depth}_{i}")
+                for i, group in enumerate(groups)
+            ]
+            level = list(pool.map(build_parent, tasks, chunksize=1))
+            depth += 1
+        parent_seconds = time.perf_counter() - start
+
+    vertices = sum(v for _, v in built)
+    total = leaf_seconds + parent_seconds
+    files = [os.path.join(out_dir, name) for name in os.listdir(out_dir)]
+    return {
+        "features": features,
+        "workers": workers,
+        "dataset": dataset,
+        "leaves": leaves,
+        "vertices": vertices,
+        "leaf_seconds": leaf_seconds,
+        "parent_seconds": parent_seconds,
+        "total_seconds": total,
+        "features_per_second": features / total,
+        "vertices_per_second": vertices / total,
+        "peak_rss_main_mb": peak_rss_mb(resource.RUSAGE_SELF),
+        "peak_rss_worker_mb": peak_rss_mb(resource.RUSAGE_CHILDREN),
+        "output_bytes": sum(os.path.getsize(path) for path in files),
+        "files": len(files),
+    }
+
+
+def run_single(args):
+    # Run one build in this process and print its result as JSON
+    out_dir = tempfile.mkdtemp(prefix="pdg3dtiles-scaling-", dir=args.tmp)
+    try:
+        result = run_build(
+            args.features[0],
+            args.workers[0],
+            args.dataset,
+            args.per_leaf,
+            args.fanout,
+            args.seed,
+            out_dir,
+        )
+    finally:
+        if not args.keep:
+            shutil.rmtree(out_dir, ignore_errors=True)
+    print(json.dumps(result))
+
+
+def add_speedup(results):
+    """
+    Add the speedup and parallel efficiency of each run, relative to the run
+    with the fewest workers for the same number of features.
+    """
+    for result in results:
+        same = [r for r in results if r["features"] == result["features"]]
+        base = min(same, key=lambda r: r["workers"])
+        speedup = base["total_seconds"] / result["total_seconds"]
+        result["speedup"] = speedup
+        result["efficiency"] = speedup * base["workers"] / result["workers"]
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--features", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument(
+        "--dataset", default="lakes", choices=["lakes", "multipolygons"]
+    )
+    parser.add_argument(
+        "--per-leaf", type=int, default=1000, help="Features per leaf tile"
+    )
+    parser.add_argument(
+        "--fanout", type=int, default=8, help="Children per parent tile"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--tmp", help="The directory to build the tilesets in")
+    parser.add_argument("--keep", action="store_true", help="Keep the built tilesets")
+    parser.add_argument(
+        "--output",
+        default="scaling",
+        help="The path, without extension, of the CSV and JSON results",
+    )
+    parser.add_argument("--single", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.single:
+        return run_single(args)
+
+    results = []
+    for features in args.features:
+        for workers in args.workers:
+            command = [
+                sys.executable,
+                os.path.abspath(__file__),
+                "--single",
+                "--features",
+                str(features),
+                "--workers",
+                str(workers),
+                "--dataset",
+                args.dataset,
+                "--per-leaf",
+                str(args.per_leaf),
+                "--fanout",
+                str(args.fanout),
+                "--seed",
+                str(args.seed),
+            ]
+            if args.tmp:
+                command += ["--tmp", args.tmp]
+            if args.keep:
+                command.append("--keep")
+            output = subprocess.run(
+                command, check=True, capture_output=True, text=True
+            ).stdout
+            result = json.loads(output.strip().splitlines()[-1])
+            print(
+                f"{features:>10d} features {workers:>4d} workers "
+                f"{result['total_seconds']:10.2f} s "
+                f"{result['features_per_second']:12.0f} features/s "
+                f"{result['peak_rss_worker_mb']:8.0f} MB",
+                flush=True,
+            )
+            results.append(result)
+
+    add_speedup(results)
+    with open(args.output + ".json", "w") as f:
+        json.dump({"results": results}, f, indent=2)
+    with open(args.output + ".csv", "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=COLUMNS)
+        writer.writeheader()
+        writer.writerows(results)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,497 @@
+import json
+import struct
+import numpy as np
+
+
+class BatchedModel:
+    """
+    A Batched 3D Model (b3dm) tile content, split into its feature table,
+    batch table, and embedded glTF (GLB). Several models can be merged into
+    one with merge, without re-tessellating their geometry: the glTF buffers
+    are concatenated and re-indexed, the batch IDs of each model are offset,
+    and the batch tables are concatenated.
+
+    Attributes
+    ----------
+    feature_table : dict
+        The feature table JSON, e.g. BATCH_LENGTH and RTC_CENTER.
+    feature_table_binary : bytes
+        The feature table binary body.
+    batch_table : dict
+        The batch table JSON. Properties are lists of values, or references
+        to batch_table_binary.
+    batch_table_binary : bytes
+        The batch table binary body.
+    gltf : dict
+        The glTF JSON.
+    gltf_binary : bytes
+        The glTF binary buffer (the BIN chunk of the GLB).
+    """
+
+    B3DM_HEADER = 28
+    GLB_HEADER = 12
+    CHUNK_HEADER = 8
+    VERSION = 1
+
+    # The primitive attributes that hold batch IDs
+    BATCH_ID_ATTRIBUTES = ["_BATCHID", "_BATCHID_0", "BATCHID"]
+
+    # numpy dtypes of glTF accessor and batch table component types
+    COMPONENT_TYPES = {
+        5120: np.int8,
+        5121: np.uint8,
+        5122: np.int16,
+        5123: np.uint16,
+        5125: np.uint32,
+        5126: np.float32,
+    }
+    BATCH_TABLE_TYPES = {
+        "BYTE": np.int8,
+        "UNSIGNED_BYTE": np.uint8,
+        "SHORT": np.int16,
+        "UNSIGNED_SHORT": np.uint16,
+        "INT": np.int32,
+        "UNSIGNED_INT": np.uint32,
+        "FLOAT": np.float32,
+        "DOUBLE": np.float64,
+    }
+    TYPE_SIZES = {"SCALAR": 1, "VEC2": 2, "VEC3": 3, "VEC4": 4}
+
+    # glTF arrays whose items are referenced by index, and the arrays that
+    # refer to them
+    GLTF_ARRAYS = [
+        "accessors",
+        "bufferViews",
+        "meshes",
+        "materials",
+        "nodes",
+        "textures",
+        "images",
+        "samplers",
+    ]
+
+    def __init__(
+        self,
+        gltf,
+        gltf_binary=b"",
+        feature_table=None,
+        batch_table=None,
+        feature_table_binary=b"",
+        batch_table_binary=b"",
+    ):
+        self.gltf = gltf
+        self.gltf_binary = bytes(gltf_binary)
+        self.feature_table = feature_table if feature_table is not None else {}
+        self.batch_table = batch_table if batch_table is not None else {}
+        self.feature_table_binary = bytes(feature_table_binary)
+        self.batch_table_binary = bytes(batch_table_binary)
+
+    @classmethod
+    def from_file(cls, path):
+        """
+        Read a b3dm file.
+        """
+        with open(path, "rb") as f:
+            return cls.from_bytes(f.read())
+
+    @classmethod
+    def from_bytes(cls, data):
+        """
+        Read a b3dm tile content from bytes.
+        """
+        data = bytes(data)
+        if len(data) < cls.B3DM_HEADER or data[:4] != b"b3dm":
+            raise ValueError("The data is not a b3dm tile.")
+        header = struct.unpack("<4s6I", data[: cls.B3DM_HEADER])
+        byte_length, ft_json, ft_bin, bt_json, bt_bin = header[2:7]
+        offset = cls.B3DM_HEADER
+        sections = []
+        for length in (ft_json, ft_bin, bt_json, bt_bin):
+            sections.append(data[offset : offset + length])
+            offset += length
+        gltf, gltf_binary = cls._read_glb(data[offset:byte_length])
+        return cls(
+            gltf,
+            gltf_binary,
+            feature_table=_read_json(sections[0]),
+            batch_table=_read_json(sections[2]),
+            feature_table_binary=sections[1],
+            batch_table_binary=sections[3],
+        )
+
+    @classmethod
+    def _read_glb(cls, data):
+        magic, _, length = struct.unpack("<4s2I", data[: cls.GLB_HEADER])
+        if magic != b"glTF":
+            raise ValueError("The b3dm does not contain a binary glTF.")
+        gltf = {}
+        binary = b""
+        offset = cls.GLB_HEADER
+        while offset < length:
+            chunk_length, chunk_type = struct.unpack(
+                "<I4s", data[offset : offset + cls.CHUNK_HEADER]
+            )
+            chunk = data[
+                offset + cls.CHUNK_HEADER : offset + cls.CHUNK_HEADER + chunk_length
+            ]
+            if chunk_type == b"JSON":
+                gltf = _read_json(chunk)
+            elif chunk_type == b"BIN\x00":
+                binary = chunk
+            offset += cls.CHUNK_HEADER + chunk_length
+        return gltf, binary
+
+    @property
+    def batch_length(self):
+        """
+        The number of features in the model. This is BATCH_LENGTH from the
+        feature table. If it is missing, the length of the batch table
+        properties, or else the largest batch ID plus one, is used.
+        """
+        if "BATCH_LENGTH" in self.feature_table:
+            return int(self.feature_table["BATCH_LENGTH"])
+        for name, values in self.batch_table.items():
+            if isinstance(values, list):
+                return len(values)
+        batch_ids = [ids for _, ids in self._batch_ids()]
+        if not batch_ids:
+            return 0
+        return int(max((ids.max() for ids in batch_ids if len(ids)), default=-1)) + 1
+
+    def get_rtc_center(self):
+        """
+        Get the RTC_CENTER of the feature table as a list, or None.
+        """
+        center = self.feature_table.get("RTC_CENTER")
+        if isinstance(center, dict):
+            offset = center["byteOffset"]
+            center = struct.unpack(
+                "<3f", self.feature_table_binary[offset : offset + 12]
+            )
+        return [float(c) for c in center] if center is not None else None
+
+    def get_properties(self):
+        """
+        Get the batch table properties as lists, decoding the properties that
+        are stored in the binary body.
+
+        Returns
+        -------
+        dict
+            The list of values of each property, in batch ID order.
+        """
+        properties = {}
+        n = self.batch_length
+        for name, values in self.batch_table.items():
+            if name in ("extensions", "extras"):
+                continue
+            if isinstance(values, dict) and "byteOffset" in values:
+                dtype = self.BATCH_TABLE_TYPES[values["componentType"]]
+                size = self.TYPE_SIZES[values["type"]]
+                array = np.frombuffer(
+                    self.batch_table_binary,
+                    dtype=np.dtype(dtype).newbyteorder("<"),
+                    count=n * size,
+                    offset=values["byteOffset"],
+                )
+                values = array.reshape(n, size) if size > 1 else array
+                values = values.tolist()
+            properties[name] = list(values)
+        return properties
+
+    def _batch_ids(self):
+        """
+        Get the batch IDs of each batch ID accessor of the model, as (accessor
+        index, numpy array) pairs.
+        """
+        accessors = set()
+        for mesh in self.gltf.get("meshes", []):
+            for primitive in mesh.get("primitives", []):
+                attributes = primitive.get("attributes", {})
+                for name in self.BATCH_ID_ATTRIBUTES:
+                    if name in attributes:
+                        accessors.add(attributes[name])
+        return [(i, self._read_accessor(i)) for i in sorted(accessors)]
+
+    def _read_accessor(self, i):
+        accessor = self.gltf["accessors"][i]
+        view = self.gltf["bufferViews"][accessor["bufferView"]]
+        dtype = np.dtype(self.COMPONENT_TYPES[accessor["componentType"]])
+        size = self.TYPE_SIZES[accessor.get("type", "SCALAR")]
+        offset = view.get("byteOffset", 0) + accessor.get("byteOffset", 0)
+        stride = view.get("byteStride", dtype.itemsize * size)
+        count = accessor["count"]
+        if count == 0:
+            return np.zeros(0, dtype=dtype)
+        data = np.frombuffer(
+            self.gltf_binary,
+            dtype=np.uint8,
+            count=stride * (count - 1) + dtype.itemsize * size,
+            offset=offset,
+        )
+        data = np.lib.stride_tricks.as_strided(
+            data, shape=(count, dtype.itemsize * size), strides=(stride, 1)
+        )
+        return np.ascontiguousarray(data).view(dtype.newbyteorder("<")).ravel()
+
+    @classmethod
+    def merge(cls, models):
+        """
+        Merge several models into one. The nodes of every model are added to
+        one glTF scene, so each keeps its own transform. The batch IDs of each
+        model are offset by the number of features in the models before it,
+        and the batch tables are concatenated. Properties that a model does
+        not have are set to None for its features.
+
+        Parameters
+        ----------
+        models : list of BatchedModel
+            The models to merge. They must have the same RTC_CENTER, if any.
+
+        Returns
+        -------
+        BatchedModel
+            The merged model.
+        """
+        if len(models) == 0:
+            raise ValueError("At least one model is needed to merge.")
+        centers = [model.get_rtc_center() for model in models]
+        if any(center != centers[0] for center in centers):
+            raise ValueError("Models with different RTC_CENTERs cannot be merged.")
+        gltf_rtc = [
+            model.gltf.get("extensions", {}).get("CESIUM_RTC") for model in models
+        ]
+        if any(rtc != gltf_rtc[0] for rtc in gltf_rtc):
+            raise ValueError("Models with different CESIUM_RTC cannot be merged.")
+
+        merged = {"asset": models[0].gltf.get("asset", {"version": "2.0"})}
+        for name in cls.GLTF_ARRAYS:
+            merged[name] = []
+        scene_nodes = []
+        extensions = []
+        binary = bytearray()
+        properties = {}
+        batch_offset = 0
+
+        for model in models:
+            gltf = model.gltf
+            if len(gltf.get("buffers", [])) > 1 or any(
+                "uri" in buffer for buffer in gltf.get("buffers", [])
+            ):
+                raise ValueError("Only models with one embedded buffer can be merged.")
+            offsets = {name: len(merged[name]) for name in cls.GLTF_ARRAYS}
+            data = bytearray(model.gltf_binary)
+
+            # Offset the batch IDs in a copy of the binary buffer
+            accessors = _copy_json(gltf.get("accessors", []))
+            views = _copy_json(gltf.get("bufferViews", []))
+            batch_ids = model._batch_ids() if batch_offset else []
+            for i, ids in batch_ids:
+                accessor = accessors[i]
+                ids = ids.astype(np.float64) + batch_offset
+                dtype = np.dtype(cls.COMPONENT_TYPES[accessor["componentType"]])
+                view = views[accessor["bufferView"]]
+                overflow = (
+                    dtype.kind != "f" and ids.max(initial=0) > np.iinfo(dtype).max
+                )
+                if accessor.get("byteOffset", 0) or view.get("byteStride") or overflow:
+                    # Write the IDs to a new buffer view
+                    dtype = np.dtype(np.float32)
+                    accessor["componentType"] = 5126
+                    accessor["byteOffset"] = 0
+                    accessor["bufferView"] = len(views)
+                    start = _pad_to(data, 4)
+                    views.append(
+                        {"buffer": 0, "byteOffset": start, "byteLength": len(ids) * 4}
+                    )
+                    data.extend(ids.astype("<f4").tobytes())
+                else:
+                    start = view.get("byteOffset", 0)
+                    encoded = ids.astype(dtype.newbyteorder("<")).tobytes()
+                    data[start : start + len(encoded)] = encoded
+                if "min" in accessor and len(ids):
+                    accessor["min"] = [float(ids.min())]
+                    accessor["max"] = [float(ids.max())]
+
+            # Append the binary buffer, aligned to 8 bytes
+            start = _pad_to(binary, 8)
+            binary.extend(data)
+            for view in views:
+                view["buffer"] = 0
+                view["byteOffset"] = view.get("byteOffset", 0) + start
+                merged["bufferViews"].append(view)
+
+            for accessor in accessors:
+                if "bufferView" in accessor:
+                    accessor["bufferView"] += offsets["bufferViews"]
+                merged["accessors"].append(accessor)
+
+            for mesh in _copy_json(gltf.get("meshes", [])):
+                for primitive in mesh.get("primitives", []):
+                    attributes = primitive.get("attributes", {})
+                    for name in attributes:
+                        attributes[name] += offsets["accessors"]
+                    if "indices" in primitive:
+                        primitive["indices"] += offsets["accessors"]
+                    if "material" in primitive:
+                        primitive["material"] += offsets["materials"]
+                    for target in primitive.get("targets", []):
+                        for name in target:
+                            target[name] += offsets["accessors"]
+                merged["meshes"].append(mesh)
+
+            for material in _copy_json(gltf.get("materials", [])):
+                _offset_textures(material, offsets["textures"])
+                merged["materials"].append(material)
+
+            for texture in _copy_json(gltf.get("textures", [])):
+                if "source" in texture:
+                    texture["source"] += offsets["images"]
+                if "sampler" in texture:
+                    texture["sampler"] += offsets["samplers"]
+                merged["textures"].append(texture)
+
+            for image in _copy_json(gltf.get("images", [])):
+                if "bufferView" in image:
+                    image["bufferView"] += offsets["bufferViews"]
+                merged["images"].append(image)
+
+            merged["samplers"].extend(_copy_json(gltf.get("samplers", [])))
+
+            for node in _copy_json(gltf.get("nodes", [])):
+                if "mesh" in node:
+                    node["mesh"] += offsets["meshes"]
+                if "children" in node:
+                    node["children"] = [c + offsets["nodes"] for c in node["children"]]
+                merged["nodes"].append(node)
+
+            scenes = gltf.get("scenes", [])
+            if scenes:
+                roots = scenes[gltf.get("scene", 0)].get("nodes", [])
+            else:
+                roots = range(len(gltf.get("nodes", [])))
+            scene_nodes.extend(node + offsets["nodes"] for node in roots)
+
+            for name in gltf.get("extensionsUsed", []):
+                if name not in extensions:
+                    extensions.append(name)
+
+            # Concatenate the batch tables
+            n = model.batch_length
+            for name, values in model.get_properties().items():
+                if name not in properties:
+                    properties[name] = [None] * batch_offset
+                properties[name].extend(values)
+            batch_offset += n
+            for values in properties.values():
+                values.extend([None] * (batch_offset - len(values)))
+
+        merged["scenes"] = [{"nodes": scene_nodes}]
+        merged["scene"] = 0
+        merged["buffers"] = [{"byteLength": len(binary)}]
+        if gltf_rtc[0] is not None:
+            merged["extensions"] = {"CESIUM_RTC": gltf_rtc[0]}
+        if extensions:
+            merged["extensionsUsed"] = extensions
+        merged = {key: value for key, value in merged.items() if value != []}
+
+        feature_table = {"BATCH_LENGTH": batch_offset}
+        if centers[0] is not None:
+            feature_table["RTC_CENTER"] = centers[0]
+        return cls(merged, bytes(binary), feature_table, properties)
+
+    def to_bytes(self):
+        """
+        Encode the model as a b3dm tile.
+        """
+        feature_json = _encode_json(self.feature_table, 8, self.B3DM_HEADER)
+        feature_binary = _pad_bytes(self.feature_table_binary, 8)
+        batch_json = _encode_json(self.batch_table, 8) if self.batch_table else b""
+        batch_binary = _pad_bytes(self.batch_table_binary, 8)
+        glb = self.to_glb()
+        byte_length = (
+            self.B3DM_HEADER
+            + len(feature_json)
+            + len(feature_binary)
+            + len(batch_json)
+            + len(batch_binary)
+            + len(glb)
+        )
+        header = struct.pack(
+            "<4s6I",
+            b"b3dm",
+            self.VERSION,
+            byte_length,
+            len(feature_json),
+            len(feature_binary),
+            len(batch_json),
+            len(batch_binary),
+        )
+        return b"".join(
+            [header, feature_json, feature_binary, batch_json, batch_binary, glb]
+        )
+
+    def to_glb(self):
+        """
+        Encode the glTF as a binary glTF (GLB).
+        """
+        gltf = dict(self.gltf)
+        if self.gltf_binary:
+            gltf["buffers"] = [{"byteLength": len(self.gltf_binary)}]
+        chunks = [(b"JSON", _encode_json(gltf, 4))]
+        if self.gltf_binary:
+            chunks.append((b"BIN\x00", _pad_bytes(self.gltf_binary, 4)))
+        length = self.GLB_HEADER + sum(
+            self.CHUNK_HEADER + len(chunk) for _, chunk in chunks
+        )
+        parts = [struct.pack("<4s2I", b"glTF", 2, length)]
+        for chunk_type, chunk in chunks:
+            parts.append(struct.pack("<I4s", len(chunk), chunk_type))
+            parts.append(chunk)
+        return b"".join(parts)
+
+    def save(self, path):
+        """
+        Save the model as a b3dm file.
+        """
+        with open(path, "wb") as f:
+            f.write(self.to_bytes())
+
+
+def _copy_json(items):
+    # Deep copy a list of glTF JSON objects
+    return json.loads(json.dumps(items))
+
+
+def _offset_textures(value, offset):
+    # Offset the texture indices of textureInfo objects in a material
+    if isinstance(value, dict):
+        for key, item in value.items():
+            if key.endswith("Texture") and isinstance(item, dict) and "index" in item:
+                item["index"] += offset
+            _offset_textures(item, offset)
+    elif isinstance(value, list):
+        for item in value:
+            _offset_textures(item, offset)
+
+
+def _read_json(data):
+    data = bytes(data).rstrip(b" \x00")
+    return json.loads(data) if data else {}
+
+
+def _encode_json(value, alignment, start=0):
+    # Encode JSON padded with spaces, so that the data after it is aligned
+    data = json.dumps(value, separators=(",", ":")).encode("utf-8")
+    padding = -(start + len(data)) % alignment
+    return data + b" " * padding
+
+
+def _pad_bytes(data, alignment):
+    return bytes(data) + b"\x00" * (-len(data) % alignment)
+
+
+def _pad_to(data, alignment):
+    # Pad a bytearray in place with zeros, and return its new length
+    data.extend(b"\x00" * (-len(data) % alignment))
+    return len(data)
@@ -1,51 +1,133 @@
 import numpy as np
 import open3d as o3d
 from shapely.geometry import Polygon
-from shapely import get_coordinates
+from shapely import get_coordinates, force_3d
+from geopandas import GeoSeries
 import json
 
+# WGS 84 ellipsoid parameters, used to convert between EPSG:4978 and EPSG:4979
+WGS84_A = 6378137.0
+WGS84_F = 1 / 298.257223563
+WGS84_B = WGS84_A * (1 - WGS84_F)
+WGS84_E2 = WGS84_F * (2 - WGS84_F)
+
+
+def geodetic_to_ecef(lon, lat, height):
+    """
+    Convert WGS 84 geodetic coordinates (EPSG:4979) to earth-centered,
+    earth-fixed coordinates (EPSG:4978).
+
+    Parameters
+    ----------
+    lon, lat : float or numpy.ndarray
+        Longitudes and latitudes in radians.
+    height : float or numpy.ndarray
+        Heights in meters above (or below) the WGS 84 ellipsoid.
+
+    Returns
+    -------
+    points : numpy.ndarray
+        An array of x, y, z coordinates in meters, with shape (..., 3).
+    """
+    lon, lat, height = np.broadcast_arrays(
+        *[np.asarray(v, dtype=float) for v in (lon, lat, height)]
+    )
+    n = WGS84_A / np.sqrt(1 - WGS84_E2 * np.sin(lat) ** 2)
+    x = (n + height) * np.cos(lat) * np.cos(lon)
+    y = (n + height) * np.cos(lat) * np.sin(lon)
+    z = (n * (1 - WGS84_E2) + height) * np.sin(lat)
+    return np.stack([x, y, z], axis=-1)
+
+
+def ecef_to_geodetic(points):
+    """
+    Convert earth-centered, earth-fixed coordinates (EPSG:4978) to WGS 84
+    geodetic coordinates (EPSG:4979) using Bowring's method.
+
+    Parameters
+    ----------
+    points : numpy.ndarray
+        An array of x, y, z coordinates in meters, with shape (..., 3).
+
+    Returns
+    -------
+    coords : numpy.ndarray
+        An array of longitude and latitude in radians and height in meters,
+        with shape (..., 3).
+    """
+    points = np.asarray(points, dtype=float)
+    x, y, z = points[..., 0], points[..., 1], points[..., 2]
+    ep2 = WGS84_E2 / (1 - WGS84_E2)
+    p = np.hypot(x, y)
+    theta = np.arctan2(z * WGS84_A, p * WGS84_B)
+    lon = np.arctan2(y, x)
+    lat = np.arctan2(
+        z + ep2 * WGS84_B * np.sin(theta) ** 3,
+        p - WGS84_E2 * WGS84_A * np.cos(theta) ** 3,
+    )
+    sin_lat = np.sin(lat)
+    height = (
+        p * np.cos(lat) + z * sin_lat - WGS84_A * np.sqrt(1 - WGS84_E2 * sin_lat**2)
+    )
+    return np.stack([lon, lat, height], axis=-1)
+
 
 class BoundingVolume(object):
 
+    # The types of bounding volume, as named by their JSON keys
+    TYPES = ["box", "region", "sphere"]
+
+    # The number of samples along each axis used to convert between types
+    SAMPLES = 5
+
     def __init__(self, values=None):
         """
-        Initialize a BoundingVolumeBox or a BoundingVolumeRegion.
+        Initialize a BoundingVolumeBox, BoundingVolumeRegion, or
+        BoundingVolumeSphere.
 
         Parameters
         ----------
         values : list or dict
-            A list or dict of 6 or 12 numbers representing the bounding volume
-            as described in the Cesium3DTileset specification. A list of 6
+            A list or dict of 4, 6, or 12 numbers representing the bounding
+            volume as described in the Cesium3DTileset specification. A list
+            of 4 numbers will create a BoundingVolumeSphere, a list of 6
             numbers will create a BoundingVolumeRegion, while a list of 12
             numbers will create a BoundingVolumeBox. Values may alternatively
-            be a dict a single item that has either the 'box' or 'region' key
-            mapped to the list of 6 or 12 numbers. Finally, values can also be
+            be a dict a single item that has either the 'box', 'region', or
+            'sphere' key mapped to the list of numbers. Finally, values can also be
             passed as a dict of west, south, east, north, min_height, and
             max_height keys, with values in degrees (EPSG:4978) and meters.
         """
         # Check that values is a list or array
         if not isinstance(values, (list, np.ndarray, dict)):
             raise ValueError(
-                "BoundingVolume values must be a list of 6 or 12 numbers, or a"
-                " dict of west, east, south, and north degrees"
+                "BoundingVolume values must be a list of 4, 6 or 12 numbers, or"
+                " a dict of west, east, south, and north degrees"
             )
         if isinstance(values, dict):
             box_vals = values.get("box")
             region_vals = values.get("region")
+            sphere_vals = values.get("sphere")
             if box_vals is not None:
                 values = box_vals
             elif region_vals is not None:
                 values = region_vals
+            elif sphere_vals is not None:
+                values = sphere_vals
         if self.is_degree_dict(values) or len(values) == 6:
             self.__class__ = BoundingVolumeRegion
             self.__init__(values)
         elif len(values) == 12:
             self.__class__ = BoundingVolumeBox
             self.__init__(values)
+        elif len(values) == 4:
+            self.__class__ = BoundingVolumeSphere
+            self.__init__(values)
         else:
             raise ValueError(
                 "BoundingVolume values must be a list of 12 numbers "
-                "(to create a box) or 6 numbers (to create a region)"
+                "(to create a box), 6 numbers (to create a region), or 4 "
+                "numbers (to create a sphere)"
             )
 
     @staticmethod
@@ -62,25 +144,132 @@ class BoundingVolume(object):
             return BoundingVolumeBox.from_points(points)
         elif type == "region":
             return BoundingVolumeRegion.from_points(points)
+        elif type == "sphere":
+            return BoundingVolumeSphere.from_points(points)
 
     @classmethod
     def from_gdf(cls, gdf, type="box"):
+        if type == "tightest":
+            return cls.from_ecef_points(cls.ecef_points_from_gdf(gdf), type)
         if type == "box":
             return BoundingVolumeBox.from_gdf(gdf)
         elif type == "region":
             return BoundingVolumeRegion.from_gdf(gdf)
+        elif type == "sphere":
+            return BoundingVolumeSphere.from_gdf(gdf)
 
     @classmethod
     def from_z_polygons(cls, polys, type="box"):
         """
-        Create a BoundingVolumeBox or BoundingVolumeRegion given
-        a list of Z POLYGONS
+        Create a BoundingVolumeBox, BoundingVolumeRegion, or
+        BoundingVolumeSphere given a list of Z POLYGONS in EPSG:4978. Set type
+        to "tightest" to keep whichever of the three has the smallest volume.
         """
         points = get_coordinates(polys, include_z=True)
+        return cls.from_ecef_points(points, type)
+
+    @classmethod
+    def from_ecef_points(cls, points, type="box"):
+        """
+        Create a bounding volume of any type from 3D points in EPSG:4978.
+
+        Parameters
+        ----------
+        points : list of lists or numpy.ndarray
+            A list or array of 3D points in EPSG:4978, each point of length 3.
+        type : "box", "region", "sphere", or "tightest"
+            The type of bounding volume to create. If "tightest", a box, a
+            region, and a sphere are computed and the one with the smallest
+            volume is returned.
+        """
+        points = np.asarray(points, dtype=float)
+        if type == "tightest":
+            candidates = [cls.from_ecef_points(points, t) for t in cls.TYPES]
+            return cls.tightest(candidates)
         if type == "box":
             return BoundingVolumeBox.from_points(points)
         elif type == "region":
-            return BoundingVolumeRegion.from_points(points)
+            coords = ecef_to_geodetic(points)
+            coords[:, 0:2] = np.rad2deg(coords[:, 0:2])
+            return BoundingVolumeRegion.from_points(coords)
+        elif type == "sphere":
+            return BoundingVolumeSphere.from_points(points)
+        raise ValueError(f"type must be one of {cls.TYPES + ['tightest']}")
+
+    @staticmethod
+    def ecef_points_from_gdf(gdf):
+        """
+        Get every coordinate of a GeoPandas GeoDataFrame as 3D points in
+        EPSG:4978. Geometries without z values are placed at a height of zero.
+        """
+
+        # Check that the CRS is not None
+        if gdf.crs is None:
+            raise ValueError("GeoDataFrame must have a CRS")
+
+        geoms = GeoSeries(force_3d(np.asarray(gdf.geometry.array)), crs=gdf.crs)
+        geoms = geoms[geoms.notna() & ~geoms.is_empty]
+        if len(geoms) == 0:
+            raise ValueError("GeoDataFrame has no non-empty geometries")
+
+        # check that the EPSG is correct
+        if geoms.crs.to_epsg() != BoundingVolumeBox.CESIUM_EPSG:
+            geoms = geoms.to_crs(epsg=BoundingVolumeBox.CESIUM_EPSG)
+
+        return get_coordinates(np.asarray(geoms.array), include_z=True)
+
+    @staticmethod
+    def tightest(volumes, min_extent=1.0):
+        """
+        Get the bounding volume with the smallest volume from a list of
+        candidates that enclose the same content.
+
+        Parameters
+        ----------
+        volumes : list of BoundingVolume
+            The candidate bounding volumes.
+        min_extent : float
+            The minimum extent, in meters, used for each dimension when
+            comparing volumes. This prevents flat content from making every
+            candidate's volume zero.
+        """
+        return min(volumes, key=lambda v: v.volume(min_extent))
+
+    def convert(self, type):
+        """
+        Convert this bounding volume to another type of bounding volume that
+        encloses it. Returns this object if it is already of that type.
+
+        Parameters
+        ----------
+        type : "box", "region", or "sphere"
+            The type of bounding volume to convert to.
+        """
+        if type == "box":
+            return self.to_box()
+        elif type == "region":
+            return self.to_region()
+        elif type == "sphere":
+            return self.to_sphere()
+        raise ValueError(f"type must be one of {self.TYPES}")
+
+    def to_box(self):
+        """
+        Get an oriented bounding box that encloses this bounding volume.
+        """
+        return BoundingVolumeBox.from_points(self.sample_points())
+
+    def to_region(self):
+        """
+        Get a bounding volume region that encloses this bounding volume.
+        """
+        return BoundingVolume.from_ecef_points(self.sample_points(), "region")
+
+    def to_sphere(self):
+        """
+        Get a bounding sphere that encloses this bounding volume.
+        """
+        return BoundingVolumeSphere.from_points(self.sample_points())
 
     @classmethod
     def from_json(cls, json_data):
@@ -88,13 +277,16 @@ class BoundingVolume(object):
         Parse a dict created from JSON into a BoundingVolume object. The source
         JSON should have the format: {'box': [x, y, z, ...x_axis array...,
         ...y_axis array..., ...z_axis array...]} OR {'region': [west, south,
-        east, north, minimum height, maximum height]}
+        east, north, minimum height, maximum height]} OR {'sphere': [x, y, z,
+        radius]}
         """
         if not isinstance(json_data, dict):
             raise ValueError("json_data must be a dictionary")
-        values = json_data.get("box") or json_data.get("region")
+        values = (
+            json_data.get("box") or json_data.get("region") or json_data.get("sphere")
+        )
         if not values:
-            raise ValueError("json_data must have a box or region key")
+            raise ValueError("json_data must have a box, region, or sphere key")
         return cls(values)
 
     def to_json(self):
@@ -102,23 +294,25 @@ class BoundingVolume(object):
 
     def to_dict(self):
         """
-        Convert the box to a dict of 6 or 12 numbers.
+        Convert the box to a dict of 4, 6 or 12 numbers.
 
         Returns
         -------
         box : dict
-            A 6 or 12 element dict of numbers representing the bounding volume.
+            A 4, 6 or 12 element dict of numbers representing the bounding
+            volume.
         """
         return {self.JSON_KEY: self.to_list()}
 
     def to_list(self):
         """
-        Convert the box to list of 6 or 12 numbers.
+        Convert the box to list of 4, 6 or 12 numbers.
 
         Returns
         -------
         box : list
-            A 6 or 12 element list of numbers representing the bounding volume.
+            A 4, 6 or 12 element list of numbers representing the bounding
+            volume.
         """
         return self.to_array().tolist()
 
@@ -219,7 +413,7 @@ class BoundingVolumeBox(BoundingVolume):
                 ]
                 return Polygon(coords)
 
-        gdf["geometry"] = gdf["geometry"].apply(_ensure_z)
+            gdf["geometry"] = gdf["geometry"].apply(_ensure_z)
 
         # Check that the CRS is not None
         if gdf.crs is None:
@@ -291,9 +485,10 @@ class BoundingVolumeBox(BoundingVolume):
 
         Parameters
         ----------
-        other : BoundingVolumeBox or list
+        other : BoundingVolume or list
             The box to add to this box, represented as an instance of a
-            BoundingVolumeBox or as a 12 element list.
+            BoundingVolumeBox or as a 12 element list. Other types of bounding
+            volume are first converted to a box.
         """
         other = self.__check_list_create_box(other)
 
@@ -326,6 +521,35 @@ class BoundingVolumeBox(BoundingVolume):
         self.yAxis = new_box.yAxis
         self.zAxis = new_box.zAxis
 
+    def volume(self, min_extent=0):
+        """
+        Compute the volume of the box in cubic meters.
+
+        Parameters
+        ----------
+        min_extent : float
+            The minimum length, in meters, to use for each side of the box.
+        """
+        lengths = 2 * np.linalg.norm([self.xAxis, self.yAxis, self.zAxis], axis=1)
+        return float(np.prod(np.maximum(lengths, min_extent)))
+
+    def sample_points(self):
+        """
+        Get a grid of points spanning the box, including its corners, in
+        EPSG:4978. Used to convert the box to other bounding volume types.
+        """
+        steps = np.linspace(-1, 1, self.SAMPLES)
+        grid = np.stack(np.meshgrid(steps, steps, steps), axis=-1).reshape(-1, 3)
+        axes = np.array([self.xAxis, self.yAxis, self.zAxis], dtype=float)
+        return np.array(self.center, dtype=float) + grid.dot(axes)
+
+    def to_box(self):
+        return self
+
+    def to_sphere(self):
+        # A sphere that encloses the corners of a box encloses the whole box
+        return BoundingVolumeSphere.from_points(self.get_corners())
+
     def to_array(self):
         """
         Convert the box to a 12 element array.
@@ -339,10 +563,10 @@ class BoundingVolumeBox(BoundingVolume):
 
     @staticmethod
     def __check_list_create_box(list_or_box):
-        if isinstance(list_or_box, list):
-            list_or_box = BoundingVolumeBox(list_or_box)
-        assert isinstance(list_or_box, BoundingVolumeBox)
-        return list_or_box
+        if isinstance(list_or_box, (list, dict)):
+            list_or_box = BoundingVolume(list_or_box)
+        assert isinstance(list_or_box, BoundingVolume)
+        return list_or_box.to_box()
 
 
 class BoundingVolumeRegion(BoundingVolume):
@@ -552,9 +776,10 @@ class BoundingVolumeRegion(BoundingVolume):
 
         Parameters
         ----------
-        other : BoundingVolumeRegion or list
+        other : BoundingVolume or list
             The region to add to this region, represented as an instance of a
-            BoundingVolumeRegion or as list of 6 numbers.
+            BoundingVolumeRegion or as list of 6 numbers. Other types of
+            bounding volume are first converted to a region.
         inplace : bool
             If True, add the region to this region in-place. If False, return a new
             region.
@@ -603,6 +828,44 @@ class BoundingVolumeRegion(BoundingVolume):
         self.min_height = new_bv.min_height
         self.max_height = new_bv.max_height
 
+    def volume(self, min_extent=0):
+        """
+        Compute the approximate volume of the region in cubic meters, treating
+        it as a box with the region's width, length, and height at its center.
+
+        Parameters
+        ----------
+        min_extent : float
+            The minimum length, in meters, to use for each side of the region.
+        """
+        radius = WGS84_A + (self.min_height + self.max_height) / 2.0
+        mid_lat = (self.south + self.north) / 2.0
+        lengths = [
+            radius * np.cos(mid_lat) * (self.east - self.west),
+            radius * (self.north - self.south),
+            self.max_height - self.min_height,
+        ]
+        return float(np.prod(np.maximum(lengths, min_extent)))
+
+    def sample_points(self):
+        """
+        Get a grid of points spanning the region in EPSG:4978. The points on
+        the top of the region are raised to account for the curvature of the
+        ellipsoid between samples. Used to convert the region to other
+        bounding volume types.
+        """
+        lons = np.linspace(self.west, self.east, self.SAMPLES)
+        lats = np.linspace(self.south, self.north, self.SAMPLES)
+        # The distance the ellipsoid rises above the chord between samples
+        step = max(lons[1] - lons[0], lats[1] - lats[0])
+        sagitta = (WGS84_A + self.max_height) * (1 - np.cos(step / 2.0))
+        heights = [self.min_height, self.max_height + sagitta]
+        lon, lat, height = np.meshgrid(lons, lats, heights)
+        return geodetic_to_ecef(lon, lat, height).reshape(-1, 3)
+
+    def to_region(self):
+        return self
+
     def to_array(self):
         """
         Convert the region to a 6 element array.
@@ -625,7 +888,235 @@ class BoundingVolumeRegion(BoundingVolume):
 
     @staticmethod
     def __check_list_create_region(list_or_region):
-        if isinstance(list_or_region, list):
-            list_or_region = BoundingVolumeRegion(list_or_region)
-        assert isinstance(list_or_region, BoundingVolumeRegion)
-        return list_or_region
+        if isinstance(list_or_region, (list, dict)):
+            list_or_region = BoundingVolume(list_or_region)
+        assert isinstance(list_or_region, BoundingVolume)
+        return list_or_region.to_region()
+
+
+class BoundingVolumeSphere(BoundingVolume):
+    """
+    A bounding sphere to use in a Cesium3DTileset. The boundingVolume.sphere
+    property is an array of four numbers that define the x, y, and z
+    coordinates of the center of the sphere and its radius, in meters
+    (EPSG:4978). Spheres are the cheapest bounding volume to construct and
+    for clients to cull against, but are usually looser than boxes.
+    """
+
+    CESIUM_EPSG = 4978
+    JSON_KEY = "sphere"
+
+    # The maximum number of passes used to grow the sphere in from_points
+    MAX_GROW_PASSES = 64
+
+    def __init__(self, values):
+        """
+        Initialize the sphere with a list of 4 numbers.
+
+        Parameters
+        ----------
+        values : list
+            A list of [x, y, z, radius], where x, y, and z are the center of
+            the sphere in EPSG:4978, and radius is in meters.
+        """
+
+        # Check that list is a list
+        assert isinstance(values, list)
+        # Check that array is a 4 element array
+        assert len(values) == 4
+        self.center = values[0:3]
+        self.radius = values[3]
+
+    @classmethod
+    def from_points(cls, points):
+        """
+        Compute an approximate minimal bounding sphere for a set of 3D points
+        using Ritter's algorithm. Runs in linear time in the number of points.
+
+        Parameters
+        ----------
+        points : list of lists or numpy.ndarray
+            A list or array of 3D points in EPSG:4978, each point of length 3.
+        """
+        # Check that list is a list or numpy array
+        if isinstance(points, list):
+            points = np.array(points)
+        if not isinstance(points, np.ndarray):
+            raise ValueError("points must be a list or numpy array")
+
+        # Check that points are 3D
+        assert len(points[0]) == 3
+        points = points.astype(float)
+
+        # Start with a sphere spanning two points that are far apart
+        start = points[0]
+        a = points[np.argmax(np.sum((points - start) ** 2, axis=1))]
+        b = points[np.argmax(np.sum((points - a) ** 2, axis=1))]
+        center = (a + b) / 2.0
+        radius = np.linalg.norm(b - a) / 2.0
+
+        # Grow the sphere towards the farthest point outside of it until all
+        # points are enclosed
+        for _ in range(cls.MAX_GROW_PASSES):
+            dists = np.linalg.norm(points - center, axis=1)
+            i = np.argmax(dists)
+            if dists[i] <= radius:
+                break
+            new_radius = (radius + dists[i]) / 2.0
+            center = center + (dists[i] - new_radius) / dists[i] * (points[i] - center)
+            radius = new_radius
+        radius = max(radius, np.linalg.norm(points - center, axis=1).max())
+
+        return cls(np.concatenate([center, [radius]]).tolist())
+
+    @classmethod
+    def from_spheres(cls, centers, radii):
+        """
+        Compute an approximate minimal sphere enclosing a set of spheres.
+
+        Parameters
+        ----------
+        centers : numpy.ndarray
+            An (N, 3) array of sphere centers in EPSG:4978.
+        radii : numpy.ndarray
+            An array of N sphere radii, in meters.
+        """
+        centers = np.asarray(centers, dtype=float).reshape(-1, 3)
+        radii = np.asarray(radii, dtype=float).reshape(-1)
+
+        # Start with the largest sphere, then grow towards the sphere that
+        # extends farthest outside of it
+        i = np.argmax(radii)
+        center = centers[i]
+        radius = radii[i]
+        for _ in range(cls.MAX_GROW_PASSES):
+            dists = np.linalg.norm(centers - center, axis=1)
+            reach = dists + radii
+            i = np.argmax(reach)
+            if reach[i] <= radius:
+                break
+            new_radius = (radius + reach[i]) / 2.0
+            if dists[i] > 0:
+                center = center + (new_radius - radius) / dists[i] * (
+                    centers[i] - center
+                )
+            radius = new_radius
+        radius = max(radius, (np.linalg.norm(centers - center, axis=1) + radii).max())
+
+        return cls(np.concatenate([center, [radius]]).tolist())
+
+    @classmethod
+    def from_gdf(cls, gdf):
+        """
+        Create a bounding sphere from a GeoPandas GeoDataFrame. All
+        coordinates of all geometries are used. Geometries without z values
+        are placed at a height of zero.
+        """
+        return cls.from_points(cls.ecef_points_from_gdf(gdf))
+
+    def get_corners(self):
+        """
+        Compute the 8 corner vertices of the axis-aligned box that encloses
+        the sphere.
+
+        Returns
+        -------
+        corners : numpy.ndarray
+            An array of 8 3D points, each point of length 3.
+        """
+        signs = np.array([[i, j, k] for i in (-1, 1) for j in (-1, 1) for k in (-1, 1)])
+        return np.array(self.center) + signs * self.radius
+
+    def add(self, other, inplace=False):
+        """
+        Add a sphere to this sphere.
+
+        Parameters
+        ----------
+        other : BoundingVolume or list
+            The sphere to add to this sphere, represented as an instance of a
+            BoundingVolumeSphere or as a 4 element list. Other types of
+            bounding volume are first converted to a sphere.
+        inplace : bool
+            If True, add the sphere to this sphere in-place. If False, return a
+            new sphere.
+        """
+        other = self.__check_list_create_sphere(other)
+
+        center = np.array(self.center, dtype=float)
+        other_center = np.array(other.center, dtype=float)
+        dist = np.linalg.norm(other_center - center)
+
+        if dist + other.radius <= self.radius:
+            new_values = self.to_list()
+        elif dist + self.radius <= other.radius:
+            new_values = other.to_list()
+        else:
+            radius = (dist + self.radius + other.radius) / 2.0
+            center = center + (radius - self.radius) / dist * (other_center - center)
+            new_values = np.concatenate([center, [radius]]).tolist()
+
+        if inplace:
+            self.update(new_values)
+        else:
+            return BoundingVolumeSphere(new_values)
+
+    def update(self, new_sphere):
+        """
+        Update the sphere with a new sphere. This will update the center and
+        radius of the sphere.
+
+        Parameters
+        ----------
+        new_sphere : BoundingVolumeSphere or list
+            The sphere to update this sphere with, represented as an instance of
+            a BoundingVolumeSphere or as a 4 element list.
+        """
+        new_sphere = self.__check_list_create_sphere(new_sphere)
+
+        self.center = new_sphere.center
+        self.radius = new_sphere.radius
+
+    def volume(self, min_extent=0):
+        """
+        Compute the volume of the sphere in cubic meters.
+
+        Parameters
+        ----------
+        min_extent : float
+            The minimum diameter, in meters, to use for the sphere.
+        """
+        radius = max(self.radius, min_extent / 2.0)
+        return float(4.0 / 3.0 * np.pi * radius**3)
+
+    def sample_points(self):
+        """
+        Get a grid of points spanning the box that encloses the sphere, in
+        EPSG:4978. Used to convert the sphere to other bounding volume types.
+        """
+        return self.to_box().sample_points()
+
+    def to_box(self):
+        r = self.radius
+        return BoundingVolumeBox(list(self.center) + [r, 0, 0, 0, r, 0, 0, 0, r])
+
+    def to_sphere(self):
+        return self
+
+    def to_array(self):
+        """
+        Convert the sphere to a 4 element array.
+
+        Returns
+        -------
+        sphere : numpy.ndarray
+            A 4 element array representing the sphere.
+        """
+        return np.concatenate([self.center, [self.radius]])
+
+    @staticmethod
+    def __check_list_create_sphere(list_or_sphere):
+        if isinstance(list_or_sphere, (list, dict)):
+            list_or_sphere = BoundingVolume(list_or_sphere)
+        assert isinstance(list_or_sphere, BoundingVolume)
+        return list_or_sphere.to_sphere()
@@ -0,0 +1,643 @@
+import numpy as np
+import shapely
+from geopandas import GeoSeries
+from .BoundingVolume import (
+    BoundingVolume,
+    BoundingVolumeBox,
+    BoundingVolumeRegion,
+    BoundingVolumeSphere,
+)
+
+
+class BoundingVolumeArray(object):
+    """
+    A collection of bounding volumes of a single type stored as one 2D array,
+    with one row per volume. Rows hold the same values that the matching
+    BoundingVolume class serializes to JSON (12 numbers for a box, 6 numbers
+    for a region, 4 numbers for a sphere), so that volumes for many features
+    or tiles can be computed, combined, and tested at once without creating a
+    Python object per volume.
+
+    Attributes
+    ----------
+    values : numpy.ndarray
+        An (N, width) array of bounding volume values.
+    type : "box", "region", or "sphere"
+        The type of every bounding volume in the collection.
+    """
+
+    WIDTHS = {"box": 12, "region": 6, "sphere": 4}
+    CLASSES = {
+        "box": BoundingVolumeBox,
+        "region": BoundingVolumeRegion,
+        "sphere": BoundingVolumeSphere,
+    }
+
+    def __init__(self, values, type="box"):
+        """
+        Initialize the collection from an array of bounding volume values.
+
+        Parameters
+        ----------
+        values : list or numpy.ndarray
+            An (N, 12) array of box values, an (N, 6) array of region values,
+            or an (N, 4) array of sphere values, in the same order as the
+            Cesium3DTileset specification.
+        type : "box", "region", or "sphere"
+            The type of bounding volume each row represents.
+        """
+        if type not in self.WIDTHS:
+            raise ValueError(f"type must be one of {list(self.WIDTHS)}, but is {type}")
+        width = self.WIDTHS[type]
+        values = np.asarray(values, dtype=float)
+        if values.size == 0:
+            values = values.reshape(0, width)
+        if values.ndim == 1:
+            values = values.reshape(1, -1)
+        if values.ndim != 2 or values.shape[1] != width:
+            raise ValueError(
+                f"values for a {type} BoundingVolumeArray must have shape "
+                f"(N, {width}), but have shape {values.shape}"
+            )
+        self.values = values
+        self.type = type
+
+    @classmethod
+    def from_volumes(cls, volumes, type=None):
+        """
+        Create a BoundingVolumeArray from a list of bounding volumes.
+
+        Parameters
+        ----------
+        volumes : list of BoundingVolume, list, or dict
+            The bounding volumes to collect. Lists and dicts are parsed with
+            BoundingVolume.
+        type : "box", "region", "sphere", or None
+            The type of bounding volume to collect. Volumes of other types are
+            converted to this type. If None (default), all volumes must be of
+            the same type.
+        """
+        volumes = [
+            v if isinstance(v, BoundingVolume) else BoundingVolume(v) for v in volumes
+        ]
+        if len(volumes) == 0:
+            raise ValueError("At least one bounding volume is required")
+        if type is not None:
+            volumes = [v.convert(type) for v in volumes]
+        bv_type = volumes[0].JSON_KEY
+        if any(v.JSON_KEY != bv_type for v in volumes):
+            raise ValueError("All bounding volumes must be of the same type")
+        values = np.array([v.to_array() for v in volumes], dtype=float)
+        return cls(values, type=bv_type)
+
+    @classmethod
+    def union_volumes(cls, volumes, type=None):
+        """
+        Combine a list of bounding volumes into one bounding volume.
+
+        Parameters
+        ----------
+        volumes : list of BoundingVolume, list, or dict
+            The bounding volumes to combine.
+        type : "box", "region", "sphere", "tightest", or None
+            The type of the combined bounding volume. If None (default), the
+            type of the first volume is used and volumes of other types are
+            converted to it. If "tightest", the volumes are combined into each
+            type and the one with the smallest volume is returned.
+
+        Returns
+        -------
+        BoundingVolume
+        """
+        if len(volumes) == 0:
+            raise ValueError("At least one bounding volume is required")
+        if type == "tightest":
+            candidates = [cls.union_volumes(volumes, t) for t in BoundingVolume.TYPES]
+            return BoundingVolume.tightest(candidates)
+        first = volumes[0]
+        if not isinstance(first, BoundingVolume):
+            first = BoundingVolume(first)
+        if type is None:
+            type = first.JSON_KEY
+        if len(volumes) == 1:
+            return first.convert(type)
+        return cls.from_volumes(volumes, type=type).union_all()
+
+    @classmethod
+    def from_tiles(cls, tiles, source="root"):
+        """
+        Create a BoundingVolumeArray from the bounding volumes of a list of
+        Tile objects.
+
+        Parameters
+        ----------
+        tiles : list of Tile
+            The tiles to collect bounding volumes from.
+        source : "root" or "content"
+            Whether to use each tile's root bounding volume, or its content
+            bounding volume. When source is "content" and a tile has no content
+            bounding volume, the root bounding volume is used instead.
+        """
+        volumes = []
+        for tile in tiles:
+            bv = None
+            if source == "content" and tile.content is not None:
+                bv = tile.content.boundingVolume
+            if bv is None:
+                bv = tile.boundingVolume
+            volumes.append(bv)
+        return cls.from_volumes(volumes)
+
+    @classmethod
+    def from_points(cls, points, index=None, n=None, type="box"):
+        """
+        Compute one axis-aligned bounding volume per group of points.
+
+        Parameters
+        ----------
+        points : list of lists or numpy.ndarray
+            An (M, 2) or (M, 3) array of points. For a region, x and y are
+            longitude and latitude in degrees (EPSG:4979) and z is the height
+            in meters. For a box or sphere, points are in EPSG:4978 (meters).
+        index : numpy.ndarray
+            An array of length M giving the position of the volume that each
+            point belongs to. If None (default), all points belong to a single
+            volume.
+        n : int
+            The number of volumes to create. Volumes with no points are filled
+            with NaN. Defaults to the largest index plus one.
+        type : "box", "region", or "sphere"
+            The type of bounding volume to create. Boxes are aligned to the
+            EPSG:4978 axes, and spheres enclose those boxes.
+        """
+        points = np.asarray(points, dtype=float)
+        if points.ndim != 2 or points.shape[1] not in (2, 3):
+            raise ValueError("points must be an array of 2 or 3 element points")
+        if points.shape[1] == 2:
+            points = np.column_stack([points, np.zeros(len(points))])
+        # Points without a z value (e.g. from shapely) are set to zero
+        points[:, 2] = np.nan_to_num(points[:, 2], nan=0.0)
+
+        if index is None:
+            index = np.zeros(len(points), dtype=np.intp)
+        index = np.asarray(index, dtype=np.intp)
+        if n is None:
+            n = int(index.max()) + 1 if len(index) else 0
+
+        mins, maxs = cls._grouped_min_max(points, index, n)
+        return cls.from_min_max(mins, maxs, type=type)
+
+    @classmethod
+    def from_min_max(cls, mins, maxs, type="box"):
+        """
+        Create axis-aligned bounding volumes from minimum and maximum corners.
+
+        Parameters
+        ----------
+        mins, maxs : numpy.ndarray
+            (N, 3) arrays of the minimum and maximum x, y, and z of each
+            volume. For a region, x and y are in degrees.
+        type : "box", "region", or "sphere"
+            The type of bounding volume to create.
+        """
+        mins = np.asarray(mins, dtype=float)
+        maxs = np.asarray(maxs, dtype=float)
+        if type == "region":
+            values = np.column_stack(
+                [
+                    np.deg2rad(mins[:, 0:2]),
+                    np.deg2rad(maxs[:, 0:2]),
+                    mins[:, 2],
+                    maxs[:, 2],
+                ]
+            )
+        elif type == "box":
+            center = (mins + maxs) / 2.0
+            half = (maxs - mins) / 2.0
+            values = np.zeros((len(mins), 12))
+            values[:, 0:3] = center
+            values[:, 3] = half[:, 0]
+            values[:, 7] = half[:, 1]
+            values[:, 11] = half[:, 2]
+        elif type == "sphere":
+            center = (mins + maxs) / 2.0
+            radius = np.linalg.norm(maxs - mins, axis=1) / 2.0
+            values = np.column_stack([center, radius])
+        else:
+            raise ValueError(f"type must be one of {list(cls.WIDTHS)}")
+        return cls(values, type=type)
+
+    @classmethod
+    def from_gdf(cls, gdf, type="region"):
+        """
+        Compute one bounding volume per row of a GeoPandas GeoDataFrame. All
+        coordinates of every part and ring of each geometry are used. Rows
+        with empty or missing geometries get a volume filled with NaN, so that
+        row i of the result always matches row i of the GeoDataFrame.
+
+        Parameters
+        ----------
+        gdf : GeoDataFrame or GeoSeries
+            The features to compute bounding volumes for. Must have a CRS.
+            Geometries without z values are placed at a height of zero.
+        type : "box", "region", or "sphere"
+            The type of bounding volume to create. Boxes are aligned to the
+            EPSG:4978 axes, and spheres enclose those boxes.
+        """
+        if gdf.crs is None:
+            raise ValueError("GeoDataFrame must have a CRS")
+        epsg = cls.CLASSES[type].CESIUM_EPSG
+        geoms = shapely.force_3d(np.asarray(gdf.geometry.array))
+        geoms = GeoSeries(geoms, crs=gdf.crs)
+        if geoms.crs.to_epsg() != epsg:
+            geoms = geoms.to_crs(epsg=epsg)
+        points, index = shapely.get_coordinates(
+            np.asarray(geoms.array), include_z=True, return_index=True
+        )
+        return cls.from_points(points, index, n=len(geoms), type=type)
+
+    @classmethod
+    def concatenate(cls, arrays):
+        """
+        Join several BoundingVolumeArrays of the same type into one.
+        """
+        if len(arrays) == 0:
+            raise ValueError("At least one BoundingVolumeArray is required")
+        bv_type = arrays[0].type
+        if any(a.type != bv_type for a in arrays):
+            raise ValueError("All BoundingVolumeArrays must be of the same type")
+        return cls(np.concatenate([a.values for a in arrays]), type=bv_type)
+
+    @staticmethod
+    def _grouped_min_max(points, index, n):
+        """
+        Compute the per-group minimum and maximum of an array of points.
+        """
+        mins = np.full((n, points.shape[1]), np.nan)
+        maxs = np.full((n, points.shape[1]), np.nan)
+        if len(points) == 0:
+            return mins, maxs
+        if np.any(np.diff(index) < 0):
+            order = np.argsort(index, kind="stable")
+            points = points[order]
+            index = index[order]
+        groups, starts = np.unique(index, return_index=True)
+        mins[groups] = np.minimum.reduceat(points, starts, axis=0)
+        maxs[groups] = np.maximum.reduceat(points, starts, axis=0)
+        return mins, maxs
+
+    def __len__(self):
+        return len(self.values)
+
+    def __getitem__(self, key):
+        """
+        Get a single BoundingVolume (for an integer key) or a new
+        BoundingVolumeArray (for a slice, boolean mask, or array of indices).
+        """
+        if isinstance(key, (int, np.integer)):
+            return self.CLASSES[self.type](self.values[key].tolist())
+        return self.__class__(self.values[key], type=self.type)
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def __str__(self):
+        return f"BoundingVolumeArray(type={self.type}, n={len(self)})"
+
+    def __repr__(self):
+        return self.__str__()
+
+    def get_axes(self):
+        """
+        Get the center and the three half-axis vectors of each box.
+
+        Returns
+        -------
+        center, axes : numpy.ndarray
+            An (N, 3) array of centers and an (N, 3, 3) array where
+            axes[i, j] is the j-th half-axis vector of box i.
+        """
+        self.__check_type("box")
+        return self.values[:, 0:3], self.values[:, 3:12].reshape(-1, 3, 3)
+
+    def get_spheres(self):
+        """
+        Get the center and radius of each sphere.
+
+        Returns
+        -------
+        center, radius : numpy.ndarray
+            An (N, 3) array of centers and an array of N radii.
+        """
+        self.__check_type("sphere")
+        return self.values[:, 0:3], self.values[:, 3]
+
+    def get_corners(self):
+        """
+        Compute the 8 corner vertices of every volume.
+
+        Returns
+        -------
+        corners : numpy.ndarray
+            An (N, 8, 3) array of corners. For regions, x and y are in degrees.
+        """
+        signs = np.array(
+            [[i, j, k] for i in (-1, 1) for j in (-1, 1) for k in (-1, 1)],
+            dtype=float,
+        )
+        if self.type == "box":
+            center, axes = self.get_axes()
+            return center[:, None, :] + np.einsum("cj,nja->nca", signs, axes)
+        mins, maxs = self.get_bounds()
+        lower = (signs + 1) / 2
+        return mins[:, None, :] + lower[None, :, :] * (maxs - mins)[:, None, :]
+
+    def get_bounds(self):
+        """
+        Get the minimum and maximum x, y, and z of each volume. For regions,
+        these are the west, south, and minimum height, and the east, north,
+        and maximum height, with x and y in degrees. For boxes and spheres,
+        these are the corners of the axis-aligned envelope of each volume in
+        EPSG:4978.
+
+        Returns
+        -------
+        mins, maxs : numpy.ndarray
+            Two (N, 3) arrays.
+        """
+        if self.type == "region":
+            v = self.values
+            mins = np.column_stack([np.rad2deg(v[:, 0:2]), v[:, 4]])
+            maxs = np.column_stack([np.rad2deg(v[:, 2:4]), v[:, 5]])
+            return mins, maxs
+        if self.type == "sphere":
+            center, radius = self.get_spheres()
+            return center - radius[:, None], center + radius[:, None]
+        center, axes = self.get_axes()
+        extent = np.abs(axes).sum(axis=1)
+        return center - extent, center + extent
+
+    def union_all(self):
+        """
+        Combine every volume in the collection into a single BoundingVolume.
+        Rows filled with NaN are ignored. Boxes are combined by fitting one
+        oriented bounding box to the corners of all boxes.
+
+        Returns
+        -------
+        BoundingVolumeBox, BoundingVolumeRegion, or BoundingVolumeSphere
+        """
+        valid = ~np.isnan(self.values).any(axis=1)
+        if not valid.any():
+            raise ValueError("Cannot combine an empty BoundingVolumeArray")
+        valid = self[valid]
+        if self.type == "box":
+            corners = valid.get_corners().reshape(-1, 3)
+            return BoundingVolumeBox.from_points(corners)
+        if self.type == "sphere":
+            return BoundingVolumeSphere.from_spheres(*valid.get_spheres())
+        mins, maxs = valid.get_bounds()
+        return BoundingVolumeRegion.from_points(
+            np.array([mins.min(axis=0), maxs.max(axis=0)])
+        )
+
+    def union(self, other):
+        """
+        Combine each volume with the matching volume of another collection.
+        Regions and spheres are combined exactly. Boxes are combined into boxes
+        aligned to the EPSG:4978 axes.
+
+        Parameters
+        ----------
+        other : BoundingVolumeArray or BoundingVolume
+            A collection of the same length, or a single bounding volume to
+            add to every volume in this collection.
+
+        Returns
+        -------
+        BoundingVolumeArray
+        """
+        other = self.__check_other(other)
+        if self.type == "sphere":
+            return self.__union_spheres(other)
+        mins, maxs = self.get_bounds()
+        other_mins, other_maxs = other.get_bounds()
+        return self.from_min_max(
+            np.fmin(mins, other_mins), np.fmax(maxs, other_maxs), type=self.type
+        )
+
+    def contains_points(self, points):
+        """
+        Test which points fall inside which volumes.
+
+        Parameters
+        ----------
+        points : numpy.ndarray
+            An (M, 3) array of points, in EPSG:4979 degrees and meters for
+            regions, or EPSG:4978 meters for boxes and spheres.
+
+        Returns
+        -------
+        inside : numpy.ndarray
+            An (N, M) boolean array that is True where point j is in volume i.
+        """
+        points = np.asarray(points, dtype=float).reshape(-1, 3)
+        if self.type == "region":
+            mins, maxs = self.get_bounds()
+            return np.all(
+                (points[None, :, :] >= mins[:, None, :])
+                & (points[None, :, :] <= maxs[:, None, :]),
+                axis=2,
+            )
+        if self.type == "sphere":
+            center, radius = self.get_spheres()
+            dists = np.linalg.norm(points[None, :, :] - center[:, None, :], axis=2)
+            return dists <= radius[:, None]
+        center, axes = self.get_axes()
+        return self._points_in_boxes(center, axes, points[None, :, :])
+
+    @staticmethod
+    def _points_in_boxes(center, axes, points):
+        """
+        Test whether each of K points is inside each of N boxes, given (N, 3)
+        centers, (N, 3, 3) half-axes, and (N, K, 3) or (1, K, 3) points.
+        """
+        offsets = points - center[:, None, :]
+        # A point is in a box when its projection on each half-axis is no
+        # longer than the half-axis itself
+        proj = np.abs(np.einsum("nka,nja->nkj", offsets, axes))
+        sq_len = np.einsum("nja,nja->nj", axes, axes)
+        tol = 1e-9 * np.maximum(sq_len, 1.0)
+        return np.all(proj <= (sq_len + tol)[:, None, :], axis=2)
+
+    def contains(self, other, pairwise=False):
+        """
+        Test whether volumes in this collection fully enclose other volumes.
+
+        Parameters
+        ----------
+        other : BoundingVolumeArray or BoundingVolume
+            The volumes to test, of the same type as this collection.
+        pairwise : bool
+            If False (default), compare each volume with the matching volume
+            in other (or with the single volume in other), returning an array
+            of length N. If True, compare every pair of volumes, returning an
+            (N, M) array.
+
+        Returns
+        -------
+        numpy.ndarray of bool
+        """
+        other = self.__check_other(other, pairwise)
+        if self.type == "region":
+            mins, maxs = self.get_bounds()
+            other_mins, other_maxs = other.get_bounds()
+            if pairwise:
+                mins, maxs = mins[:, None, :], maxs[:, None, :]
+                other_mins, other_maxs = other_mins[None], other_maxs[None]
+            return np.all((mins <= other_mins) & (maxs >= other_maxs), axis=-1)
+        if self.type == "sphere":
+            dists, radius, other_radius = self.__sphere_distances(other, pairwise)
+            return dists + other_radius <= radius
+
+        corners = other.get_corners()
+        if pairwise:
+            inside = self.contains_points(corners.reshape(-1, 3))
+            return inside.reshape(len(self), len(other), 8).all(axis=2)
+        center, axes = self.get_axes()
+        return self._points_in_boxes(center, axes, corners).all(axis=1)
+
+    def intersects(self, other, pairwise=False):
+        """
+        Test whether volumes in this collection overlap other volumes. Boxes
+        are tested against the face axes of both boxes, so a pair of boxes
+        that only touch along an edge may be reported as intersecting.
+
+        Parameters
+        ----------
+        other : BoundingVolumeArray or BoundingVolume
+            The volumes to test, of the same type as this collection.
+        pairwise : bool
+            If False (default), compare each volume with the matching volume
+            in other (or with the single volume in other), returning an array
+            of length N. If True, compare every pair of volumes, returning an
+            (N, M) array.
+
+        Returns
+        -------
+        numpy.ndarray of bool
+        """
+        other = self.__check_other(other, pairwise)
+        if self.type == "region":
+            mins, maxs = self.get_bounds()
+            other_mins, other_maxs = other.get_bounds()
+            if pairwise:
+                mins, maxs = mins[:, None, :], maxs[:, None, :]
+                other_mins, other_maxs = other_mins[None], other_maxs[None]
+            return np.all((mins <= other_maxs) & (maxs >= other_mins), axis=-1)
+        if self.type == "sphere":
+            dists, radius, other_radius = self.__sphere_distances(other, pairwise)
+            return dists <= radius + other_radius
+
+        center, axes = self.get_axes()
+        other_center, other_axes = other.get_axes()
+        if pairwise:
+            center, axes = center[:, None], axes[:, None]
+            other_center, other_axes = other_center[None], other_axes[None]
+        center, other_center = np.broadcast_arrays(center, other_center)
+        axes, other_axes = np.broadcast_arrays(axes, other_axes)
+
+        # Separating axis test along the face normals of both boxes
+        test_axes = np.concatenate([axes, other_axes], axis=-2)
+        lengths = np.linalg.norm(test_axes, axis=-1, keepdims=True)
+        units = np.divide(
+            test_axes, lengths, out=np.zeros_like(test_axes), where=lengths > 0
+        )
+        distance = np.abs(np.einsum("...ka,...a->...k", units, other_center - center))
+        radius = np.abs(np.einsum("...ka,...ja->...kj", units, axes)).sum(axis=-1)
+        other_radius = np.abs(np.einsum("...ka,...ja->...kj", units, other_axes)).sum(
+            axis=-1
+        )
+        return np.all(distance <= radius + other_radius, axis=-1)
+
+    def to_array(self):
+        """
+        Get the (N, width) array of bounding volume values.
+        """
+        return self.values
+
+    def to_list(self):
+        """
+        Convert the collection to a list of lists of 12 or 6 numbers.
+        """
+        return self.values.tolist()
+
+    def to_dict(self):
+        """
+        Convert the collection to a list of dicts, each in the format of
+        BoundingVolume.to_dict, ready to be serialized to JSON.
+        """
+        key = self.CLASSES[self.type].JSON_KEY
+        return [{key: row} for row in self.values.tolist()]
+
+    def to_volumes(self):
+        """
+        Convert the collection to a list of BoundingVolume objects.
+        """
+        cls = self.CLASSES[self.type]
+        return [cls(row) for row in self.values.tolist()]
+
+    def __sphere_distances(self, other, pairwise):
+        center, radius = self.get_spheres()
+        other_center, other_radius = other.get_spheres()
+        if pairwise:
+            center, radius = center[:, None], radius[:, None]
+            other_center, other_radius = other_center[None], other_radius[None]
+        dists = np.linalg.norm(other_center - center, axis=-1)
+        return dists, radius, other_radius
+
+    def __union_spheres(self, other):
+        dists, radius, other_radius = self.__sphere_distances(other, False)
+        center, _ = self.get_spheres()
+        other_center, _ = other.get_spheres()
+        new_radius = np.maximum((dists + radius + other_radius) / 2.0, radius)
+        new_radius = np.maximum(new_radius, other_radius)
+        # Move each center towards the other sphere by the amount the radius
+        # grew, unless one sphere already encloses the other
+        shift = np.divide(
+            new_radius - radius,
+            dists,
+            out=np.zeros_like(dists),
+            where=dists > 0,
+        )
+        new_center = center + shift[:, None] * (other_center - center)
+        encloses_self = dists + radius <= other_radius
+        new_center[encloses_self] = np.broadcast_to(other_center, center.shape)[
+            encloses_self
+        ]
+        return self.__class__(np.column_stack([new_center, new_radius]), "sphere")
+
+    def __check_type(self, bv_type):
+        if self.type != bv_type:
+            raise ValueError(
+                f"This operation requires a {bv_type} BoundingVolumeArray, "
+                f"but this collection is of type {self.type}"
+            )
+
+    def __check_other(self, other, pairwise=False):
+        if isinstance(other, BoundingVolume):
+            other = BoundingVolumeArray.from_volumes([other])
+        if not isinstance(other, BoundingVolumeArray):
+            raise ValueError("other must be a BoundingVolumeArray or BoundingVolume")
+        if other.type != self.type:
+            raise ValueError(
+                f"Cannot compare a {self.type} BoundingVolumeArray with "
+                f"{other.type} volumes"
+            )
+        if not pairwise and len(other) not in (1, len(self)):
+            raise ValueError(
+                "other must contain a single volume or as many volumes as "
+                "this collection"
+            )
+        return other
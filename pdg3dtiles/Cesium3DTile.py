@@ -7,9 +7,13 @@ from py3dtiles.tileset.content import GlTF, B3dm
 from py3dtiles.tileset.batch_table import BatchTable
 from py3dtiles.tilers.b3dm.wkb_utils import TriangleSoup
 import numpy as np
+import pandas as pd
 import os
 import uuid
 import logging
+from .TileStats import TileStats
+from .BoundingVolume import BoundingVolume
+from .BoundingVolumeArray import BoundingVolumeArray
 
 # Initialize logging
 logging.basicConfig(
@@ -22,6 +26,11 @@ class Cesium3DTile:
     CESIUM_EPSG = 4978
     FILE_EXT = ".b3dm"
 
+    # The namespace of the UUIDs that are derived from the features
+    UUID_NAMESPACE = uuid.uuid5(
+        uuid.NAMESPACE_URL, "https://github.com/PermafrostDiscoveryGateway/viz-3dtiles"
+    )
+
     def __init__(self):
         self.geodataframe = GeoDataFrame()
         self.z = 0
@@ -38,9 +47,18 @@ class Cesium3DTile:
         self.min_tileset_z = 0
         self.max_tileset_z = 0
 
+        # The bounding volume of the content, calculated during tesselation
+        # from the reprojected coordinates
+        self.bounding_volume_type = "box"
+        self.bounding_volume = None
+
         # A set of dynamically-generated properties to add to the 3DTile BatchTable.
         # Any properties already set via the original file or Geodataframe will be kept intact.
         self.batch_table_uuid = True
+        # Whether to derive the UUIDs from the geometry, attributes and row of
+        # each feature, instead of generating random ones, so that the same
+        # features always give the same B3DM bytes
+        self.batch_table_uuid_deterministic = False
         self.batch_table_centroid = False
         self.batch_table_area = False
 
@@ -48,6 +66,14 @@ class Cesium3DTile:
         # e.g { centroid_within_tile: True }
         self.filter_by_attributes = {}
 
+        # Timing, memory and size statistics of each stage of creating the tile
+        self.stats = TileStats(self)
+
+        # Whether to free the geometries, glTF and batch table once the B3DM is
+        # saved, keeping only the summary that a tileset needs (see compact)
+        self.compact_after_write = False
+        self.summary = None
+
     def set_save_to_path(self, path):
         """
         The filepath to save the 3DTile. If the path does not exist, it will be created (handled by package py3dtiles)
@@ -86,7 +112,9 @@ class Cesium3DTile:
             "max_width": self.max_width,
             "min_tileset_z": self.min_tileset_z,
             "max_tileset_z": self.max_tileset_z,
+            "bounding_volume": self.bounding_volume,
             "filter_by_attributes": self.filter_by_attributes,
+            "summary": self.summary,
         }
 
     def from_file(self, filepath, crs=None, z=0, drop_staging=False):
@@ -98,25 +126,39 @@ class Cesium3DTile:
         """
         logger.info(f"Processing file: {filepath}")
         try:
+            with self.stats.profile(self.save_as):
+                self._from_file(filepath, crs, z, drop_staging)
+        except Exception as e:
+            logger.error(f"Error reading file {filepath}: {str(e)}")
+            raise
+
+    def _from_file(self, filepath, crs, z, drop_staging):
+        with self.stats.stage("read"):
             gdf: GeoDataFrame = geopandas.read_file(filepath)
 
-            logger.debug(f"Columns before processing: {gdf.columns.tolist()}")
+        logger.debug(f"Columns before processing: {gdf.columns.tolist()}")
 
-            if drop_staging:
-                staging_columns = gdf.filter(like="staging_").columns
-                if len(staging_columns) > 0:
-                    logger.info(f"Dropping staging columns: {staging_columns.tolist()}")
-                    gdf = gdf.drop(columns=staging_columns)
+        if drop_staging:
+            staging_columns = gdf.filter(like="staging_").columns
+            if len(staging_columns) > 0:
+                logger.info(f"Dropping staging columns: {staging_columns.tolist()}")
+                gdf = gdf.drop(columns=staging_columns)
 
-            logger.debug(f"Columns after processing: {gdf.columns.tolist()}")
+        logger.debug(f"Columns after processing: {gdf.columns.tolist()}")
 
-            self.from_geodataframe(gdf, crs, z)
-        except Exception as e:
-            logger.error(f"Error reading file {filepath}: {str(e)}")
-            raise
+        self.from_geodataframe(gdf, crs, z)
 
-    def from_geodataframe(self, gdf, crs=None, z=0):
+    def from_geodataframe(self, gdf, crs=None, z=0, write=True):
+        """
+        Tesselate the polygons of a GeoDataFrame and create the glTF. If write
+        is True (default), the B3DM is also created and saved. Otherwise it
+        can be created later with to_b3dm, e.g. to add it to a Composite.
+        The time and memory of each stage are recorded in stats.
+        """
+        with self.stats.profile(self.save_as):
+            self._from_geodataframe(gdf, crs, z, write)
 
+    def _from_geodataframe(self, gdf, crs, z, write):
         # Set the default z-level that we will set on 2D polygons
         self.z = z
 
@@ -136,15 +178,61 @@ class Cesium3DTile:
         # Filter out polygons as needed
         self.filter_polygons()
 
-        gdf["geometry"] = gdf["geometry"].apply(self.to_multipolygon)
+        with self.stats.stage("to_3d"):
+            gdf["geometry"] = gdf["geometry"].apply(self.to_multipolygon)
 
         # Re-project polygons to the Cesium CRS for tesselation.
         logger.info(f"Reprojecting geometries to EPSG:{self.CESIUM_EPSG}")
-        gdf = gdf.to_crs(epsg=self.CESIUM_EPSG)
+        with self.stats.stage("reproject"):
+            gdf = gdf.to_crs(epsg=self.CESIUM_EPSG)
 
         self.transformed_geometries = gdf.geometry
 
-        self.tesselate()
+        points = self.tesselate()
+        self.fit_bounding_volume(points)
+        self.create_gltf()
+        if write:
+            self.create_b3dm()
+
+    def from_tiles(self, tiles):
+        """
+        Combine Cesium3DTiles that were already tesselated into one B3DM. The
+        geometry buffers of the tiles are reused, so nothing is tesselated
+        again, and their attributes are concatenated into one batch table.
+
+        Parameters
+        ----------
+        tiles : list of Cesium3DTile
+            The tiles to combine. Their GeoDataFrames are converted to the CRS
+            of the first tile.
+        """
+        if any(tile.summary is not None for tile in tiles):
+            raise ValueError("Compacted tiles can not be combined.")
+        tiles = [tile for tile in tiles if len(tile.geometries)]
+        if len(tiles) == 0:
+            raise ValueError("At least one tile with geometries is needed.")
+        logger.info(f"Combining {len(tiles)} tiles")
+
+        crs = tiles[0].geodataframe.crs
+        gdfs = [tile.geodataframe for tile in tiles]
+        gdfs = [gdf.to_crs(crs) if gdf.crs != crs else gdf for gdf in gdfs]
+        self.geodataframe = GeoDataFrame(
+            pd.concat(gdfs, ignore_index=True),
+            geometry=gdfs[0].geometry.name,
+            crs=crs,
+        )
+        self.transformed_geometries = pd.concat(
+            [tile.transformed_geometries for tile in tiles], ignore_index=True
+        )
+        self.geometries = [g for tile in tiles for g in tile.geometries]
+        self.max_width = max(tile.max_width for tile in tiles)
+        self.min_tileset_z = min(tile.min_tileset_z for tile in tiles)
+        self.max_tileset_z = max(tile.max_tileset_z for tile in tiles)
+        self.bounding_volume = self.union_bounding_volumes(
+            tiles, self.bounding_volume_type
+        )
+        self.stats.count_geometries(self.geometries)
+
         self.create_gltf()
         self.create_b3dm()
 
@@ -174,6 +262,7 @@ class Cesium3DTile:
         else:
             raise ValueError("Geometry must be a Polygon or MultiPolygon")
 
+    @TileStats.timed("remove_inf_nan")
     def remove_inf_nan(self):
         """Remove rows with inf or nan values from the geodataframe."""
         original_count = len(self.geodataframe)
@@ -184,6 +273,7 @@ class Cesium3DTile:
         if removed_count > 0:
             logger.info(f"Removed {removed_count} rows with inf/nan values")
 
+    @TileStats.timed("filter")
     def filter_polygons(self):
         # Filter out polygons beyond the maximum
         if self.max_features is not None:
@@ -208,11 +298,13 @@ class Cesium3DTile:
                     f"Could not filter polygons by attribute '{key}': {str(e)}"
                 )
 
+    @TileStats.timed("tesselate")
     def tesselate(self):
         logger.info("Starting tessellation process")
         min_tileset_z = 9e99
         max_tileset_z = -9e99
         max_width = -9e99
+        points = []
 
         for i, geom in enumerate(self.transformed_geometries):
             if i % 100 == 0:  # Log progress every 100 geometries
@@ -229,10 +321,12 @@ class Cesium3DTile:
             normals = ts.get_normal_array()
 
             # Calculate the bounding box First get the z values since shapely
-            # bounds function does not support 3D geom/z values)
-            zs = [z for (x, y, z) in get_coordinates(geom, include_z=True)]
-            minz = min(zs)
-            maxz = max(zs)
+            # bounds function does not support 3D geom/z values). The
+            # coordinates are returned for the bounding volume of the tile.
+            coords = get_coordinates(geom, include_z=True)
+            points.append(coords)
+            minz = coords[:, 2].min()
+            maxz = coords[:, 2].max()
             bounds = multipolygon.bounds
             box_degrees = [[bounds[2], bounds[3], maxz], [bounds[0], bounds[1], minz]]
 
@@ -254,11 +348,31 @@ class Cesium3DTile:
             self.max_tileset_z = max_tileset_z
             self.min_tileset_z = min_tileset_z
 
+        self.stats.count_geometries(self.geometries)
         logger.info(
             f"Tessellation complete. Processed {len(self.geometries)} geometries"
         )
         logger.debug(f"Z range: {min_tileset_z:.2f} to {max_tileset_z:.2f}")
+        return points
+
+    @TileStats.timed("bounding_volume")
+    def fit_bounding_volume(self, points):
+        """
+        Set the bounding volume of the tile from the coordinates of its
+        geometries, as returned by tesselate. This is a separate stage from
+        tesselate, so that the stages never overlap in the stats.
+
+        Parameters
+        ----------
+        points : list of numpy.ndarray
+            The (n, 3) EPSG:4978 coordinates of each geometry.
+        """
+        if points:
+            self.bounding_volume = BoundingVolume.from_ecef_points(
+                np.concatenate(points), self.bounding_volume_type
+            )
 
+    @TileStats.timed("gltf")
     def create_gltf(self):
         logger.info("Creating glTF content")
 
@@ -301,18 +415,27 @@ class Cesium3DTile:
         self.gltf = gltf
         logger.info("glTF creation complete")
 
+    @TileStats.timed("batch_table")
     def create_batch_table(self):
         logger.debug("Creating batch table")
 
         bt = BatchTable()
 
         if self.batch_table_uuid == True:
+            # Features that already have a UUID keep it, so that the batch
+            # table can be created again, e.g. when tiles are combined
             logger.debug("Adding UUID column to batch table")
-            values = []
-            for i in range(0, len(self.geodataframe)):
-                u = uuid.uuid4()
-                values.append(u.urn)
-            self.geodataframe["uuid"] = values
+            if "uuid" not in self.geodataframe:
+                self.geodataframe["uuid"] = None
+            missing = self.geodataframe["uuid"].isna()
+            if self.batch_table_uuid_deterministic:
+                values = self.feature_uuids(self.geodataframe[missing])
+            else:
+                values = []
+                for i in range(0, int(missing.sum())):
+                    u = uuid.uuid4()
+                    values.append(u.urn)
+            self.geodataframe.loc[missing, "uuid"] = values
 
         attributes = self.geodataframe.columns.drop("geometry")
         logger.debug(
@@ -330,17 +453,164 @@ class Cesium3DTile:
 
         return bt
 
+    def feature_uuids(self, gdf):
+        """
+        Derive a UUID (version 5) for each feature of a GeoDataFrame from its
+        geometry, attributes and row index. Duplicated rows get different
+        UUIDs, because their index differs, or, when the index has duplicates
+        too, because the number of times the row was already seen is hashed as
+        well. The same rows in the same order always get the same UUIDs.
+
+        Returns
+        -------
+        list of str
+            The UUIDs, as URNs.
+        """
+        attributes = gdf.drop(columns=[gdf.geometry.name, "uuid"], errors="ignore")
+        names = attributes.astype(str).agg("|".join, axis=1)
+        seen = {}
+        uuids = []
+        for wkb, name, index in zip(gdf.geometry.to_wkb(), names, gdf.index):
+            key = f"{wkb.hex()}|{name}|{index}"
+            count = seen.get(key, 0)
+            seen[key] = count + 1
+            if count:
+                key += f"|{count}"
+            uuids.append(uuid.uuid5(self.UUID_NAMESPACE, key).urn)
+        return uuids
+
     def create_b3dm(self):
         logger.info("Creating B3DM tile")
         # --- Convert to b3dm -----
         # create a b3dm tile_content directly from the glTF.
-        t = B3dm.from_glTF(self.gltf, bt=self.create_batch_table())
+        t = self.get_b3dm()
 
         # to save our tile as a .b3dm file
         output_path = os.path.join(self.save_to, self.get_filename())
         logger.info(f"Saving B3DM tile to: {output_path}")
-        t.save_as(output_path)
+        with self.stats.stage("write"):
+            t.save_as(output_path)
+        self.stats.bytes = os.path.getsize(output_path)
         logger.info("B3DM tile creation complete")
+        if self.compact_after_write:
+            self.compact()
+
+    def get_b3dm(self):
+        """
+        Create the B3DM tile content from the glTF and the batch table.
+        """
+        if self.summary is not None:
+            raise ValueError("The tile was compacted and has no glTF.")
+        bt = self.create_batch_table()
+        with self.stats.stage("b3dm"):
+            return B3dm.from_glTF(self.gltf, bt=bt)
+
+    def to_b3dm(self):
+        """
+        Create the B3DM tile content without saving it.
+
+        Returns
+        -------
+        bytes
+            The B3DM tile.
+        """
+        t = self.get_b3dm()
+        with self.stats.stage("encode"):
+            data = bytes(t.to_array())
+        self.stats.bytes = len(data)
+        return data
 
     def get_filename(self):
         return self.save_as + self.FILE_EXT
+
+    def get_summary(self, bv_type=None):
+        """
+        Summarize the tile: its bounding volume, geometric error, Z range,
+        file name and counts. This is all that a tileset needs to point to the
+        tile. Compacted tiles return the summary they kept.
+
+        Parameters
+        ----------
+        bv_type : "box" or "region" or "sphere" or "tightest"
+            The type of bounding volume to calculate. Default is the tile's
+            bounding_volume_type.
+
+        Returns
+        -------
+        dict
+            The summary, which can be saved as JSON.
+        """
+        if self.summary is not None:
+            return self.summary
+        return {
+            "save_to": self.save_to,
+            "filename": self.get_filename(),
+            "boundingVolume": self.get_bounding_volume(bv_type).to_dict(),
+            "geometricError": self.max_width,
+            "min_z": self.min_tileset_z,
+            "max_z": self.max_tileset_z,
+            "features": self.stats.features,
+            "vertices": self.stats.vertices,
+            "triangles": self.stats.triangles,
+            "bytes": self.stats.bytes,
+        }
+
+    def get_bounding_volume(self, bv_type=None):
+        """
+        Get the bounding volume of the tile content. The bounding volume that
+        was calculated during tesselation is reused when it has the requested
+        type, otherwise it is calculated from the transformed geometries.
+
+        Parameters
+        ----------
+        bv_type : "box" or "region" or "sphere" or "tightest"
+            The type of bounding volume. Default is the tile's
+            bounding_volume_type.
+        """
+        bv_type = bv_type or self.bounding_volume_type
+        if self.bounding_volume is not None and bv_type == self.bounding_volume_type:
+            return self.bounding_volume
+        return BoundingVolume.from_z_polygons(self.transformed_geometries, bv_type)
+
+    @staticmethod
+    def union_bounding_volumes(tiles, bv_type="box"):
+        """
+        Get one bounding volume that encloses the content of several tiles,
+        from the bounding volumes of the tiles.
+
+        Parameters
+        ----------
+        tiles : list of Cesium3DTile
+            The tesselated tiles.
+        bv_type : "box" or "region" or "sphere" or "tightest"
+            The type of the bounding volume. Default is "box".
+        """
+        volumes = [tile.get_bounding_volume(bv_type) for tile in tiles]
+        return BoundingVolumeArray.union_volumes(volumes, bv_type)
+
+    def compact(self, bv_type=None):
+        """
+        Keep only the summary of the tile (see get_summary), and free the
+        GeoDataFrame, the transformed and tesselated geometries, the glTF and
+        the batch table. Compacted tiles can still be added to a tileset with
+        Tileset.from_Cesium3DTiles, but no longer create a B3DM. Set
+        compact_after_write to compact tiles as soon as their B3DM is saved.
+
+        Parameters
+        ----------
+        bv_type : "box" or "region" or "sphere" or "tightest"
+            The type of bounding volume to keep. Default is the tile's
+            bounding_volume_type.
+
+        Returns
+        -------
+        dict
+            The summary.
+        """
+        self.summary = self.get_summary(bv_type)
+        self.geodataframe = GeoDataFrame()
+        self.transformed_geometries = None
+        self.geometries = []
+        self.gltf = None
+        self.batch_table = None
+        return self.summary
@@ -1,8 +1,73 @@
+import copy
+import io
 import json
+import threading
+from contextlib import contextmanager
 from .BoundingVolume import BoundingVolume
+from .BoundingVolumeArray import BoundingVolumeArray
+from .TilesetWriter import TilesetWriter
 from .Cesium3DTile import Cesium3DTile
 import os
 
+# Tracks, per thread, whether validation is currently deferred
+_validation_state = threading.local()
+
+
+@contextmanager
+def deferred_validation():
+    """
+    A context manager that skips validation when Tile and Content objects are
+    created. Use it when building or loading large trees, then validate the
+    whole tree once with validate_tree().
+
+    Example
+    -------
+    >>> with deferred_validation():
+    ...     tileset = Tileset(root=root_dict)
+    >>> tileset.validate_tree()
+    """
+    depth = getattr(_validation_state, "depth", 0)
+    _validation_state.depth = depth + 1
+    try:
+        yield
+    finally:
+        _validation_state.depth = depth
+
+
+def validation_deferred():
+    """
+    Check whether validation is currently deferred in this thread.
+    """
+    return getattr(_validation_state, "depth", 0) > 0
+
+
+@contextmanager
+def lazy_loading(validate=True):
+    """
+    A context manager that keeps the children of Tile objects created from
+    dicts as raw JSON until they are accessed. See LazyChildren.
+
+    Parameters
+    ----------
+    validate : bool
+        Whether each child tile should be validated when it is loaded. Default
+        is True.
+    """
+    previous = getattr(_validation_state, "lazy", None)
+    _validation_state.lazy = {"validate": validate}
+    try:
+        yield
+    finally:
+        _validation_state.lazy = previous
+
+
+def loading_lazily():
+    """
+    Get the options of the lazy_loading context in this thread, or None if
+    children are loaded eagerly.
+    """
+    return getattr(_validation_state, "lazy", None)
+
 
 class Base:
     """
@@ -26,45 +91,93 @@ class Base:
     def __init__(self):
         pass
 
+    # Attributes that are not part of the schema and are not validated
+    ignored_keys = ["file_path"]
+
     def validate(self):
         """
         Validate this object. Raises a ValueError if the object is invalid.
         """
 
         cls_name = self.__class__.__name__
+        attrs = self.__dict__
 
         # check that all required keys are present
         for key in self.required_keys:
-            if key not in self.__dict__:
+            if key not in attrs:
                 raise ValueError(
                     f"The following required key is missing: {key} "
                     f"for class {cls_name}"
                 )
 
         # check that the types are correct
-        for key, value in self.__dict__.items():
-            if key in self.type_definitions:
-                if value is not None:
-                    # check that the value is one of the required types
-                    req_types = self.type_definitions[key]
-                    if not isinstance(req_types, list):
-                        req_types = [req_types]
-                    if not any([isinstance(value, req_type) for req_type in req_types]):
-                        raise ValueError(
-                            f"{key} in the {cls_name} class must be of type "
-                            f"type {req_types}, but is type {type(value)}"
-                        )
+        type_tuples = self.get_type_tuples()
+        for key, value in attrs.items():
+            req_types = type_tuples.get(key)
+            if req_types is not None:
+                # check that the value is one of the required types
+                if value is not None and not isinstance(value, req_types):
+                    raise ValueError(
+                        f"{key} in the {cls_name} class must be of type "
+                        f"type {list(req_types)}, but is type {type(value)}"
+                    )
             # check that there are no extra/invalid keys
-            else:
+            elif key not in self.ignored_keys and not key.startswith("_"):
                 raise ValueError(f"{key} is not a valid key for class {cls_name}")
 
-    def copy(self):
+    def validate_tree(self):
+        """
+        Validate this object and every object nested in it, visiting each
+        object once. Raises a ValueError if any object is invalid.
+        """
+        self.validate()
+
+    @classmethod
+    def get_type_tuples(cls):
+        """
+        Get the type_definitions of this class with every value as a tuple of
+        types, so that each value can be checked with a single isinstance call.
+        The tuples are computed once per class.
         """
-        Return a copy of the tileset.
+        type_tuples = cls.__dict__.get("_type_tuples")
+        if type_tuples is None:
+            type_tuples = {
+                key: tuple(types) if isinstance(types, list) else (types,)
+                for key, types in cls.type_definitions.items()
+            }
+            cls._type_tuples = type_tuples
+        return type_tuples
+
+    def copy(self, subtree=True):
         """
-        json_str = json.dumps(self.to_dict())
-        json_data = json.loads(json_str)
-        return self.from_json(json_data)
+        Return a copy of the object. Nested objects are copied directly,
+        without serializing to JSON or validating again. Bounding volumes are
+        shallow copies that share their values with the original: updating a
+        bounding volume replaces its values rather than changing them in
+        place, so the two stay independent.
+
+        Parameters
+        ----------
+        subtree : bool
+            Whether to copy the child tiles of any tiles in the object. If
+            False, copied tiles have no children. Default is True.
+        """
+        new = self.__class__.__new__(self.__class__)
+        for key, value in self.__dict__.items():
+            if key.startswith("_") or key in self.ignored_keys:
+                continue
+            new.__dict__[key] = self._copy_value(key, value, subtree)
+        return new
+
+    @staticmethod
+    def _copy_value(key, value, subtree):
+        if isinstance(value, Base):
+            return value.copy(subtree)
+        if isinstance(value, BoundingVolume):
+            return copy.copy(value)
+        if isinstance(value, (dict, list)):
+            return copy.deepcopy(value)
+        return value
 
     @staticmethod
     def parse_json(data=None):
@@ -83,25 +196,51 @@ class Base:
         return data
 
     @classmethod
-    def from_json(cls, data):
+    def from_json(cls, data, validate=True, lazy=False):
         """
-        Parse a JSON object into a Base object.
+        Parse a JSON object into a Base object. Validation is deferred while
+        the object and its nested objects are created.
 
         Parameters
         ----------
         data : dict
             A dict read in from a JSON file.
+        validate : bool
+            Whether to validate the object once it is created, with a single
+            pass over the tree. Default is True.
+        lazy : bool
+            If True, child tiles are kept as dicts until they are accessed,
+            and are then created (and validated, if validate is True) one
+            level at a time. Default is False.
         """
         data = cls.parse_json(data)
-        return cls(**data)
+        with deferred_validation():
+            if lazy:
+                with lazy_loading(validate):
+                    obj = cls(**data)
+            else:
+                obj = cls(**data)
+        if validate:
+            obj.validate_tree()
+        return obj
 
     @classmethod
-    def from_file(cls, path):
+    def from_file(cls, path, validate=True, lazy=False):
         """
         Read a JSON file into a Base object.
+
+        Parameters
+        ----------
+        path : str
+            Path to a JSON file.
+        validate : bool
+            Whether to validate the object once it is read. Default is True.
+        lazy : bool
+            Whether to create child tiles only when they are accessed. See
+            from_json. Default is False.
         """
         with open(path) as f:
-            tileset = cls.from_json(json.load(f))
+            tileset = cls.from_json(json.load(f), validate=validate, lazy=lazy)
             tileset.file_path = path
             return tileset
 
@@ -118,10 +257,20 @@ class Base:
         # return json.dumps(self.to_dict(), indent=2)
         return self.to_dict()
 
-    def to_dict(self):
-        d = self.__dict__.copy()
+    def to_dict(self, exclude=None):
+        """
+        Convert this object to a dict.
+
+        Parameters
+        ----------
+        exclude : list of str
+            Attributes to leave out of the dict (optional).
+        """
+        d = {k: v for k, v in self.__dict__.items() if not k.startswith("_")}
         if "file_path" in d:
             del d["file_path"]
+        for key in exclude or []:
+            d.pop(key, None)
         none_keys = []
         for key, value in d.items():
             # if the value has a to_dict method, call it
@@ -135,24 +284,50 @@ class Base:
 
         return d
 
-    def to_file(self, path, minify=True):
+    def to_file(self, path, minify=True, precision=None, json_backend="json"):
         """
-        Write this object to a JSON file.
+        Write this object to a JSON file. The JSON is streamed to the file
+        one tile at a time.
 
         Parameters
         ----------
         path: str
             Path to a JSON file.
+        minify: bool
+            Whether to minify the JSON. Default is True.
+        precision: int
+            The number of decimal places to keep for bounding volumes and
+            geometric errors (optional). See TilesetWriter for details.
+        json_backend: "json" or "orjson" or "auto"
+            The JSON library to use when writing minified JSON. Default is the
+            standard library. "auto" uses orjson when it is installed.
+        """
+        writer = TilesetWriter(
+            precision=precision, backend=json_backend, indent=None if minify else 2
+        )
+        writer.write(self, path)
+        self.file_path = path
+
+    def to_bytes(self, minify=True, precision=None, json_backend="json"):
         """
-        separators = (",", ": ")
-        indent = 2
-        if minify:
-            separators = (",", ":")
-            indent = None
+        Encode this object as JSON, as it would be written by to_file, e.g. to
+        write it later with a WriteBehindQueue.
+
+        Parameters
+        ----------
+        See to_file.
 
-        with open(path, "w") as f:
-            json.dump(self.to_dict(), f, separators=separators, indent=indent)
-            self.file_path = path
+        Returns
+        -------
+        bytes
+            The UTF-8 encoded JSON.
+        """
+        writer = TilesetWriter(
+            precision=precision, backend=json_backend, indent=None if minify else 2
+        )
+        buffer = io.BytesIO()
+        writer.write(self, buffer)
+        return buffer.getvalue()
 
 
 class Asset(Base):
@@ -248,7 +423,8 @@ class Content(Base):
         self.extensions = extensions
         self.extras = extras
 
-        self.validate()
+        if not validation_deferred():
+            self.validate()
 
     @classmethod
     def from_b3dm(cls, b3dm):
@@ -263,6 +439,72 @@ class Content(Base):
         pass
 
 
+class LazyChildren(list):
+    """
+    A list of child tiles that are kept as the dicts read from JSON until
+    they are accessed. Indexing or iterating over the list creates the Tile
+    objects that are reached, and replaces the dicts with them, so each child
+    is only created once. The children of a loaded tile are also lazy, so a
+    subtree is only loaded one level at a time, as it is traversed.
+
+    Attributes
+    ----------
+    validate : bool
+        Whether each child is validated when it is loaded.
+    """
+
+    def __init__(self, children=(), validate=True):
+        super().__init__(children)
+        self.validate = validate
+        for child in list.__iter__(self):
+            if not isinstance(child, (dict, Tile)):
+                raise ValueError("children must be a list of Tile objects or dicts")
+
+    def _load(self, i):
+        child = list.__getitem__(self, i)
+        if isinstance(child, dict):
+            with deferred_validation(), lazy_loading(self.validate):
+                child = Tile(**child)
+            if self.validate:
+                child.validate(recursive=False)
+            list.__setitem__(self, i, child)
+        return child
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self._load(j) for j in range(*i.indices(len(self)))]
+        return self._load(i)
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self._load(i)
+
+    def __reversed__(self):
+        for i in reversed(range(len(self))):
+            yield self._load(i)
+
+    def pop(self, i=-1):
+        child = self._load(i)
+        list.pop(self, i)
+        return child
+
+    def copy(self):
+        return LazyChildren(list.__iter__(self), self.validate)
+
+    def is_loaded(self, i):
+        """
+        Check whether the child at index i has been created as a Tile.
+        """
+        return isinstance(list.__getitem__(self, i), Tile)
+
+    def loaded(self):
+        """
+        Get the children that have been created as Tile objects so far,
+        without loading any others.
+        """
+        return [child for child in list.__iter__(self) if isinstance(child, Tile)]
+
+
 class Tile(Base):
 
     required_keys = ["boundingVolume", "geometricError"]
@@ -371,15 +613,21 @@ class Tile(Base):
             if not isinstance(viewerRequestVolume, BoundingVolume):
                 raise ValueError("viewerRequestVolume must be a BoundingVolume object")
 
-        if children:
+        lazy = loading_lazily()
+        if children and lazy is not None and not isinstance(children, LazyChildren):
+            children = LazyChildren(children, validate=lazy["validate"])
+        if children and not isinstance(children, LazyChildren):
             if not isinstance(children, list):
                 raise ValueError("children must be a list")
-            for i in range(len(children)):
-                child = children[i]
-                if isinstance(child, dict):
-                    children[i] = Tile(**child)
-                if not isinstance(children[i], Tile):
-                    raise ValueError("children must be a list of Tile objects")
+            # Children are validated once below, as part of this tile, rather
+            # than again as each nested child is created
+            with deferred_validation():
+                for i in range(len(children)):
+                    child = children[i]
+                    if isinstance(child, dict):
+                        children[i] = Tile(**child)
+                    if not isinstance(children[i], Tile):
+                        raise ValueError("children must be a list of Tile objects")
 
         self.boundingVolume = boundingVolume
         self.viewerRequestVolume = viewerRequestVolume
@@ -391,11 +639,18 @@ class Tile(Base):
         self.extensions = extensions
         self.extras = extras
 
-        self.validate()
+        if not validation_deferred():
+            self.validate()
 
-    def validate(self):
+    def validate(self, recursive=True):
         """
         Validate the tile.
+
+        Parameters
+        ----------
+        recursive : bool
+            Whether to also validate all of the tile's descendants. Default is
+            True.
         """
         super().validate()
         if self.refine not in self.refine_opts:
@@ -416,26 +671,162 @@ class Tile(Base):
         # TODO: ensure that root tile BoundingVolume completely encloses the
         # content BoundingVolume
 
-        # Validate children
+        # Validate children. Children that have not been loaded yet are
+        # validated when they are loaded.
         if self.children:
-            for child in self.children:
+            for child in self.loaded_children():
                 if not isinstance(child, Tile):
                     raise ValueError("children must be a list of Tile objects")
-                child.validate()
+                if recursive:
+                    child.validate()
+
+    def validate_tree(self):
+        """
+        Validate this tile and all of its descendants, visiting each tile once.
+        Unlike validate(), this does not recurse, so it is safe for very deep
+        trees.
+        """
+        stack = [self]
+        while stack:
+            tile = stack.pop()
+            tile.validate(recursive=False)
+            if tile.children:
+                stack.extend(tile.loaded_children())
+
+    def copy(self, subtree=True):
+        """
+        Return a copy of the tile. See Base.copy.
+
+        Parameters
+        ----------
+        subtree : bool
+            Whether to copy the tile's descendants. If False, the copy has no
+            children. Default is True.
+        """
+        new = self._copy_tile()
+        if not subtree:
+            return new
+        # Copy the subtree iteratively, so that deep trees are safe to copy
+        stack = [(self, new)]
+        while stack:
+            tile, new_tile = stack.pop()
+            if tile.children is None:
+                continue
+            if isinstance(tile.children, LazyChildren):
+                new_children = LazyChildren(validate=tile.children.validate)
+            else:
+                new_children = []
+            for child in list.__iter__(tile.children):
+                if isinstance(child, Tile):
+                    new_child = child._copy_tile()
+                    stack.append((child, new_child))
+                else:
+                    # A child that has not been loaded yet is still a dict
+                    new_child = copy.deepcopy(child)
+                new_children.append(new_child)
+            new_tile.children = new_children
+        return new
+
+    def _copy_tile(self):
+        # Copy only this tile, without its children
+        new = Tile.__new__(Tile)
+        for key, value in self.__dict__.items():
+            if key.startswith("_") or key in self.ignored_keys:
+                continue
+            if key == "children":
+                new.children = None
+            else:
+                new.__dict__[key] = self._copy_value(key, value, False)
+        return new
+
+    def loaded_children(self):
+        """
+        Get the children of this tile that have been created as Tile objects,
+        without loading any lazy children.
+        """
+        if isinstance(self.children, LazyChildren):
+            return self.children.loaded()
+        return self.children or []
+
+    def get_external_tileset(self, base_dir="", validate=True, lazy=True):
+        """
+        Load the external tileset that this tile's content points to. The
+        tileset is read once and then cached on the tile.
+
+        Parameters
+        ----------
+        base_dir : str
+            The directory of the tileset JSON that contains this tile. Content
+            URIs are relative to this directory.
+        validate : bool
+            Whether to validate the external tileset. Default is True.
+        lazy : bool
+            Whether to load the children of the external tileset lazily.
+            Default is True.
 
-    def to_dict(self):
+        Returns
+        -------
+        Tileset or None
+            The external tileset, or None if the tile's content is not a
+            tileset JSON file.
+        """
+        uri = self.content.uri if self.content else None
+        if not uri or not uri.lower().endswith(".json"):
+            return None
+        path = os.path.normpath(os.path.join(base_dir, uri))
+        tileset = getattr(self, "_external_tileset", None)
+        if tileset is None or tileset.file_path != path:
+            tileset = Tileset.from_file(path, validate=validate, lazy=lazy)
+            self._external_tileset = tileset
+        return tileset
+
+    def iter_tiles(self, follow_external=False, base_dir=""):
+        """
+        Iterate over this tile and its descendants depth-first, visiting each
+        tile before its children. Lazy children are loaded as they are
+        reached, so stopping the iteration early leaves the rest of the tree
+        unloaded.
+
+        Parameters
+        ----------
+        follow_external : bool
+            If True, when a tile's content is an external tileset JSON file,
+            the external tileset is loaded lazily and its root is visited after
+            the tile's own children. Default is False.
+        base_dir : str
+            The directory of the tileset JSON that contains this tile, used to
+            resolve external tileset URIs.
+        """
+        stack = [(self, base_dir)]
+        while stack:
+            tile, tile_dir = stack.pop()
+            yield tile
+            if follow_external:
+                external = tile.get_external_tileset(tile_dir)
+                if external is not None:
+                    stack.append((external.root, os.path.dirname(external.file_path)))
+            if tile.children:
+                stack.extend((child, tile_dir) for child in reversed(tile.children))
+
+    def to_dict(self, exclude=None):
         """
         Convert the tile to a JSON object.
+
+        Parameters
+        ----------
+        exclude : list of str
+            Attributes to leave out of the dict (optional). Exclude
+            "children" to convert only this tile.
         """
-        data = super().to_dict()
-        if self.children:
+        data = super().to_dict(exclude)
+        if self.children and "children" in data:
             data["children"] = [child.to_dict() for child in self.children]
         # If the refine value is default, remove it
-        if data["refine"] and data["refine"] == self.refine_opts[0]:
+        if data.get("refine") and data["refine"] == self.refine_opts[0]:
             del data["refine"]
         return data
 
-    def add_children(self, children, bv_method=None, bv_source="content"):
+    def add_children(self, children, bv_method=None, bv_source="content", bv_type=None):
         """
         Add children to the tile and optionally update the tile's root bounding
         volume. The content bounding volume is not updated.
@@ -449,9 +840,9 @@ class Tile(Base):
             are added. If None (default), the bounding volume is not changed.
             If "update", the children bounding volumes are added to the tile's
             bounding volume. If "replace", the children's combined bounding
-            volumes replace the tile's current bounding volume. Note that
-            bounding volumes must all be of the same type to be added (i.e.,
-            all must be either 'box' or 'region').
+            volumes replace the tile's current bounding volume. Bounding
+            volumes of different types are converted to a common type before
+            they are added.
         bv_source: "root" or "content"
             When updating the current tile's root bounding volume (when
             bv_method is set to "update" or "replace"), should this method add
@@ -461,11 +852,16 @@ class Tile(Base):
             volume, and will add it to the tile's root bounding volume if they
             exist. If a child has no content bounding volume, then the root
             bounding volume will be added instead.
+        bv_type: None or "box" or "region" or "sphere" or "tightest"
+            The type of the updated bounding volume. If None (default), the
+            type of the first bounding volume added is used. If "tightest",
+            the combined volume is computed as a box, a region, and a sphere,
+            and the one with the smallest volume is kept.
         """
 
-        new_bv = None
-        if bv_method == "update":
-            new_bv = self.boundingVolume
+        new_bvs = []
+        if bv_method == "update" and self.boundingVolume is not None:
+            new_bvs.append(self.boundingVolume)
 
         if not isinstance(children, list):
             raise ValueError("children must be a list")
@@ -484,17 +880,16 @@ class Tile(Base):
                 if bv_source == "root" or child_bv is None:
                     child_bv = child.boundingVolume
                 if child_bv:
-                    if new_bv is None:
-                        new_bv = child_bv
-                    else:
-                        new_bv = new_bv.add(child_bv)
+                    new_bvs.append(child_bv)
 
         if self.children is None:
             self.children = []
         self.children.extend(children)
 
-        if new_bv is not None:
-            self.boundingVolume = new_bv
+        # Combine all of the bounding volumes at once rather than adding them
+        # one at a time, which would refit the volume for every child
+        if len(new_bvs) > 0:
+            self.boundingVolume = BoundingVolumeArray.union_volumes(new_bvs, bv_type)
 
     def add_content(self, content):
         """
@@ -585,7 +980,83 @@ class Tileset(Base):
         self.extensionsUsed = extensionsUsed
         self.extensionsRequired = extensionsRequired
 
-    def add_children(self, children, bv_method=None, bv_source="content"):
+    def validate_tree(self):
+        """
+        Validate the tileset, its asset, and every tile in the tree, visiting
+        each tile once.
+        """
+        self.validate()
+        self.asset.validate()
+        self.root.validate_tree()
+
+    def to_file(
+        self,
+        path,
+        minify=True,
+        precision=None,
+        json_backend="json",
+        max_bytes=None,
+        max_nodes=None,
+        max_depth=None,
+    ):
+        """
+        Write the tileset to a JSON file, optionally split into external
+        tilesets.
+
+        Parameters
+        ----------
+        path: str
+            Path to a JSON file.
+        minify: bool
+            Whether to minify the JSON. Default is True.
+        precision: int
+            The number of decimal places to keep for bounding volumes and
+            geometric errors (optional). See TilesetWriter for details.
+        json_backend: "json" or "orjson" or "auto"
+            The JSON library to use when writing minified JSON. Default is the
+            standard library. "auto" uses orjson when it is installed.
+        max_bytes: int
+            If set, subtrees are moved into external tileset files, written
+            next to path, so that each file's minified JSON is at most about
+            this many bytes. Each moved subtree is replaced by a tile whose
+            content points to the new file, so clients can load the tree one
+            file at a time.
+        max_nodes: int
+            If set, subtrees are moved into external tileset files so that
+            each file has at most this many tiles.
+        max_depth: int
+            If set, subtrees are moved into external tileset files so that
+            each file has at most this many levels below its root.
+        """
+        if max_bytes is None and max_nodes is None and max_depth is None:
+            return super().to_file(path, minify, precision, json_backend)
+        writer = TilesetWriter(precision=precision, backend=json_backend)
+        writer.write_sharded(
+            self,
+            path,
+            max_bytes=max_bytes,
+            max_nodes=max_nodes,
+            max_depth=max_depth,
+            indent=None if minify else 2,
+        )
+        self.file_path = path
+
+    def iter_tiles(self, follow_external=False):
+        """
+        Iterate over the tiles of the tileset depth-first, visiting each tile
+        before its children. See Tile.iter_tiles.
+
+        Parameters
+        ----------
+        follow_external : bool
+            Whether to also visit the tiles of external tilesets that tile
+            contents point to. URIs are resolved relative to the tileset's
+            file_path. Default is False.
+        """
+        base_dir = os.path.dirname(getattr(self, "file_path", None) or "")
+        return self.root.iter_tiles(follow_external, base_dir)
+
+    def add_children(self, children, bv_method=None, bv_source="content", bv_type=None):
         """
         Add children to the root of the tileset.
 
@@ -598,9 +1069,8 @@ class Tileset(Base):
             If None, the bounding volume is not changed. If "update", the
             children bounding volumes are added to the tileset's bounding volume.
             If "replace", the children's combined bounding volumes replace the
-            tileset's current bounding volume. Note that bounding volumes must all
-            be of the same type to be added (i.e., all must be either 'box' or
-            'region').
+            tileset's current bounding volume. Bounding volumes of different
+            types are converted to a common type before they are added.
         bv_source: "root" or "content"
             When updating the current tile's root bounding volume, should this
             method add the children's root bounding volumes, or the children's
@@ -609,9 +1079,13 @@ class Tileset(Base):
             volumes in the children, and will add those to the tile's root
             bounding volume. If a child has no content bounding volume, then
             the root bounding volume will be added instead.
+        bv_type: None or "box" or "region" or "sphere" or "tightest"
+            The type of the updated bounding volume. If None (default), the
+            type of the first bounding volume added is used. If "tightest",
+            the type with the smallest volume is used.
         """
         # The root is a Tile object
-        self.root.add_children(children, bv_method, bv_source)
+        self.root.add_children(children, bv_method, bv_source, bv_type)
 
     def add_content(self, content, bv=None):
         """
@@ -626,7 +1100,7 @@ class Tileset(Base):
         self.root.add_content(content, bv)
 
     @classmethod
-    def from_Cesium3DTiles(cls, tiles, file_path="tileset.json"):
+    def from_Cesium3DTiles(cls, tiles, file_path="tileset.json", bv_type="box"):
         """
         Create a Tileset object from a list of 1 or more Cesium3DTiles objects,
         and write it to a file.
@@ -641,6 +1115,11 @@ class Tileset(Base):
             If the save_to paths are absolute, then the file_path must be absolute.
             This is because the file_path is compared to the tile.save_to paths
             to create a relative path from the tileset JSON.
+        bv_type : "box" or "region" or "sphere" or "tightest"
+            The type of bounding volume to compute for each tile. If
+            "tightest", the type with the smallest volume is used for each
+            tile. The bounding volumes of compacted tiles are converted to
+            this type if they have another type.
 
         Returns
         -------
@@ -657,13 +1136,16 @@ class Tileset(Base):
         tile_objs = []
 
         for t in tiles:
-            ge = +t.max_width
-            tile_bv = BoundingVolume.from_z_polygons(t.transformed_geometries)
-            uri = os.path.join(t.save_to, t.get_filename())
+            summary = t.get_summary(bv_type)
+            ge = +summary["geometricError"]
+            tile_bv = BoundingVolume(summary["boundingVolume"])
+            if bv_type != "tightest" and tile_bv.JSON_KEY != bv_type:
+                tile_bv = tile_bv.convert(bv_type)
+            uri = os.path.join(summary["save_to"], summary["filename"])
             uri = os.path.relpath(uri, os.path.dirname(file_path))
             tile_obj = Tile(
                 boundingVolume=tile_bv,
-                geometricError=t.max_width,
+                geometricError=summary["geometricError"],
                 content=Content(uri=uri),
             )
             tile_objs.append(tile_obj)
@@ -672,7 +1154,9 @@ class Tileset(Base):
             root = tile_objs[0]
         else:
             root = Tile(geometricError=ge)
-            root.add_children(tile_objs, bv_method="replace", bv_source="root")
+            root.add_children(
+                tile_objs, bv_method="replace", bv_source="root", bv_type=bv_type
+            )
 
         ts = cls(geometricError=ge, root=root)
 
@@ -0,0 +1,389 @@
+import json
+import numpy as np
+from .BoundingVolume import BoundingVolume
+from .BoundingVolumeArray import BoundingVolumeArray
+from .Cesium3DTileset import Tileset, Tile
+from .TilesetWriter import TilesetWriter
+
+
+class CompactTileset:
+    """
+    A memory-efficient representation of a Cesium 3D tileset tree. Instead of
+    one Tile object (plus BoundingVolume and Content objects) per tile, the
+    fields of every tile are stored in NumPy arrays indexed by tile number.
+    Tiles are numbered in depth-first (pre-order) order, so the root is tile
+    0 and every tile's parent has a smaller number than the tile itself.
+
+    Attributes
+    ----------
+    parent : numpy.ndarray of int32
+        The number of each tile's parent tile, or -1 for the root.
+    geometric_error : numpy.ndarray of float64
+        The geometricError of each tile.
+    refine : numpy.ndarray of int8
+        The index of each tile's refine value in Tile.refine_opts.
+    content : numpy.ndarray of int32
+        The index of each tile's content URI in uris, or -1 if the tile has no
+        content.
+    uris : list of str
+        The content URIs of the tiles.
+    bv_type : numpy.ndarray of int8
+        The index of the type of each tile's bounding volume in TYPES.
+    bv : numpy.ndarray of float64
+        An (N, 12) array of bounding volume values. Regions use the first 6
+        columns and spheres the first 4, with the rest set to NaN.
+    content_bv_type : numpy.ndarray of int8
+        Like bv_type, for the content bounding volumes, or -1 if a tile has
+        no content bounding volume.
+    content_bv : numpy.ndarray of float64 or None
+        Like bv, for the content bounding volumes. None if no tile has a
+        content bounding volume.
+    other_fields : dict
+        Any other fields of a tile (e.g. transform, extras, or content
+        extensions), as JSON dicts keyed by tile number. Content fields are
+        stored under a "content" key.
+    tileset_fields : dict
+        The top-level fields of the tileset other than root (asset,
+        geometricError, etc.) as a JSON dict.
+    """
+
+    TYPES = BoundingVolume.TYPES
+    WIDTH = 12
+
+    # The tile fields that are stored in arrays
+    ARRAY_FIELDS = ["boundingVolume", "geometricError", "refine", "content"]
+
+    def __init__(self):
+        self.parent = np.zeros(0, dtype=np.int32)
+        self.geometric_error = np.zeros(0, dtype=np.float64)
+        self.refine = np.zeros(0, dtype=np.int8)
+        self.content = np.zeros(0, dtype=np.int32)
+        self.uris = []
+        self.bv_type = np.zeros(0, dtype=np.int8)
+        self.bv = np.zeros((0, self.WIDTH), dtype=np.float64)
+        self.content_bv_type = np.zeros(0, dtype=np.int8)
+        self.content_bv = None
+        self.other_fields = {}
+        self.tileset_fields = {"asset": {"version": "1.0"}, "geometricError": 0}
+        self._child_offsets = None
+        self._child_index = None
+
+    @classmethod
+    def from_json(cls, data):
+        """
+        Create a CompactTileset from a tileset dict read from JSON, without
+        creating Tile objects.
+
+        Parameters
+        ----------
+        data : dict
+            A dict read in from a tileset JSON file.
+        """
+        tileset_fields = {k: v for k, v in data.items() if k != "root"}
+        return cls._from_nodes(data["root"], tileset_fields, lambda node: node)
+
+    @classmethod
+    def from_file(cls, path):
+        """
+        Read a tileset JSON file into a CompactTileset, without creating Tile
+        objects.
+        """
+        with open(path) as f:
+            return cls.from_json(json.load(f))
+
+    @classmethod
+    def from_tileset(cls, tileset):
+        """
+        Create a CompactTileset from a Tileset object.
+        """
+        tileset_fields = tileset.to_dict(exclude=["root"])
+
+        def get_fields(tile):
+            fields = tile.to_dict(exclude=["children"])
+            fields["children"] = tile.children
+            return fields
+
+        return cls._from_nodes(tileset.root, tileset_fields, get_fields)
+
+    @classmethod
+    def _from_nodes(cls, root, tileset_fields, get_fields):
+        """
+        Fill the arrays by walking a tree of tiles depth-first. get_fields
+        returns the JSON dict of a tile, where "children" may hold either
+        dicts or Tile objects.
+        """
+        parents = []
+        errors = []
+        refines = []
+        contents = []
+        uris = []
+        uri_index = {}
+        bv_types = []
+        bvs = []
+        content_bv_types = []
+        content_bvs = {}
+        other_fields = {}
+
+        refine_opts = Tile.refine_opts
+        stack = [(root, -1)]
+        while stack:
+            node, parent = stack.pop()
+            i = len(parents)
+            fields = get_fields(node)
+
+            parents.append(parent)
+            errors.append(fields.get("geometricError", 0))
+            refines.append(refine_opts.index(fields.get("refine") or refine_opts[0]))
+
+            bv_type, values = cls._split_bv(fields["boundingVolume"])
+            bv_types.append(bv_type)
+            bvs.append(values)
+
+            content = fields.get("content")
+            content_index = -1
+            content_bv_type = -1
+            if content is not None:
+                uri = content.get("uri")
+                content_index = uri_index.get(uri)
+                if content_index is None:
+                    content_index = len(uris)
+                    uri_index[uri] = content_index
+                    uris.append(uri)
+                if content.get("boundingVolume"):
+                    content_bv_type, values = cls._split_bv(content["boundingVolume"])
+                    content_bvs[i] = values
+                content_other = {
+                    k: v
+                    for k, v in content.items()
+                    if k not in ("uri", "boundingVolume")
+                }
+                if content_other:
+                    other_fields.setdefault(i, {})["content"] = content_other
+            contents.append(content_index)
+            content_bv_types.append(content_bv_type)
+
+            other = {
+                k: v
+                for k, v in fields.items()
+                if k not in cls.ARRAY_FIELDS and k != "children" and v is not None
+            }
+            if other:
+                other_fields.setdefault(i, {}).update(other)
+
+            # Push children in reverse so that they are numbered in order
+            for child in reversed(fields.get("children") or []):
+                stack.append((child, i))
+
+        compact = cls()
+        compact.parent = np.array(parents, dtype=np.int32)
+        compact.geometric_error = np.array(errors, dtype=np.float64)
+        compact.refine = np.array(refines, dtype=np.int8)
+        compact.content = np.array(contents, dtype=np.int32)
+        compact.uris = uris
+        compact.bv_type = np.array(bv_types, dtype=np.int8)
+        compact.bv = np.array(bvs, dtype=np.float64).reshape(-1, cls.WIDTH)
+        compact.content_bv_type = np.array(content_bv_types, dtype=np.int8)
+        if content_bvs:
+            compact.content_bv = np.full((len(parents), cls.WIDTH), np.nan)
+            for i, values in content_bvs.items():
+                compact.content_bv[i] = values
+        compact.other_fields = other_fields
+        compact.tileset_fields = tileset_fields
+        return compact
+
+    @classmethod
+    def _split_bv(cls, bv):
+        """
+        Get the type index and padded values of a bounding volume dict or
+        object.
+        """
+        if isinstance(bv, BoundingVolume):
+            bv = bv.to_dict()
+        for type_index, key in enumerate(cls.TYPES):
+            if key in bv:
+                values = list(bv[key])
+                return type_index, values + [np.nan] * (cls.WIDTH - len(values))
+        raise ValueError("boundingVolume must have a box, region, or sphere key")
+
+    def __len__(self):
+        return len(self.parent)
+
+    def __str__(self):
+        return f"CompactTileset(tiles={len(self)}, uris={len(self.uris)})"
+
+    def __repr__(self):
+        return self.__str__()
+
+    def _build_children(self):
+        # Index the children of every tile, in order, as a compressed array:
+        # the children of tile i are _child_index[offsets[i]:offsets[i + 1]]
+        children = np.nonzero(self.parent >= 0)[0]
+        order = np.argsort(self.parent[children], kind="stable")
+        self._child_index = children[order].astype(np.int32)
+        counts = np.bincount(self.parent[children], minlength=len(self))
+        self._child_offsets = np.concatenate([[0], np.cumsum(counts)])
+
+    def children(self, i):
+        """
+        Get the numbers of the children of tile i, in order.
+        """
+        if self._child_index is None:
+            self._build_children()
+        return self._child_index[self._child_offsets[i] : self._child_offsets[i + 1]]
+
+    def num_children(self):
+        """
+        Get the number of children of every tile.
+        """
+        return np.bincount(self.parent[self.parent >= 0], minlength=len(self))
+
+    def leaves(self):
+        """
+        Get the numbers of the tiles that have no children.
+        """
+        return np.nonzero(self.num_children() == 0)[0]
+
+    def depth(self):
+        """
+        Get the depth of every tile, where the root has a depth of 0.
+        """
+        depth = np.zeros(len(self), dtype=np.int32)
+        has_parent = self.parent >= 0
+        # Each pass fixes one more level of the tree
+        while True:
+            new_depth = depth.copy()
+            new_depth[has_parent] = depth[self.parent[has_parent]] + 1
+            if np.array_equal(new_depth, depth):
+                return depth
+            depth = new_depth
+
+    def get_uri(self, i):
+        """
+        Get the content URI of tile i, or None if it has no content.
+        """
+        index = self.content[i]
+        return self.uris[index] if index >= 0 else None
+
+    def get_bounding_volume(self, i, content=False):
+        """
+        Get the bounding volume of tile i as a BoundingVolume object.
+
+        Parameters
+        ----------
+        i : int
+            The tile number.
+        content : bool
+            If True, get the content bounding volume instead, which may be None.
+        """
+        bv_type = self.content_bv_type[i] if content else self.bv_type[i]
+        if bv_type < 0:
+            return None
+        values = self.content_bv[i] if content else self.bv[i]
+        type_name = self.TYPES[bv_type]
+        width = BoundingVolumeArray.WIDTHS[type_name]
+        return BoundingVolume({type_name: values[:width].tolist()})
+
+    def bounding_volumes(self, type="region"):
+        """
+        Get the bounding volumes of all tiles of one type.
+
+        Parameters
+        ----------
+        type : "box", "region", or "sphere"
+            The type of bounding volume to get.
+
+        Returns
+        -------
+        tiles, volumes : numpy.ndarray, BoundingVolumeArray
+            The numbers of the tiles with that type of bounding volume, and
+            their bounding volumes.
+        """
+        tiles = np.nonzero(self.bv_type == self.TYPES.index(type))[0]
+        width = BoundingVolumeArray.WIDTHS[type]
+        return tiles, BoundingVolumeArray(self.bv[tiles, :width], type=type)
+
+    def tile_dict(self, i):
+        """
+        Get the JSON dict of tile i, without its children.
+        """
+        d = {"boundingVolume": self.get_bounding_volume(i).to_dict()}
+        d["geometricError"] = self.geometric_error[i].item()
+        refine = Tile.refine_opts[self.refine[i]]
+        if refine != Tile.refine_opts[0]:
+            d["refine"] = refine
+        other = self.other_fields.get(i, {})
+        if self.content[i] >= 0:
+            content = {}
+            content_bv = self.get_bounding_volume(i, content=True)
+            if content_bv is not None:
+                content["boundingVolume"] = content_bv.to_dict()
+            content["uri"] = self.get_uri(i)
+            content.update(other.get("content", {}))
+            d["content"] = content
+        for key, value in other.items():
+            if key != "content":
+                d[key] = value
+        return d
+
+    def to_dict(self):
+        """
+        Convert the tree to a tileset dict, ready to be serialized to JSON.
+        """
+        nodes = [self.tile_dict(i) for i in range(len(self))]
+        for i in range(1, len(self)):
+            nodes[self.parent[i]].setdefault("children", []).append(nodes[i])
+        d = dict(self.tileset_fields)
+        d["root"] = nodes[0]
+        return d
+
+    def to_tileset(self, validate=True):
+        """
+        Convert the tree to a Tileset object.
+
+        Parameters
+        ----------
+        validate : bool
+            Whether to validate the tileset once it is created. Default is
+            True.
+        """
+        return Tileset.from_json(self.to_dict(), validate=validate)
+
+    def to_file(self, path, precision=None, json_backend="json"):
+        """
+        Write the tree to a minified tileset JSON file, one tile at a time.
+
+        Parameters
+        ----------
+        path : str
+            Path to a JSON file.
+        precision : int
+            The number of decimal places to keep for bounding volumes and
+            geometric errors (optional). See TilesetWriter for details.
+        json_backend : "json" or "orjson" or "auto"
+            The JSON library to use. See TilesetWriter for details.
+        """
+        writer = TilesetWriter(precision=precision, backend=json_backend)
+        if self._child_index is None:
+            self._build_children()
+
+        with open(path, "wb") as f:
+            fields = writer.round_node(dict(self.tileset_fields))
+            f.write(b"{")
+            for key, value in fields.items():
+                f.write(writer.encode(key) + b":" + writer.encode(value) + b",")
+            f.write(b'"root":')
+            self._write_tile(0, writer, f)
+            f.write(b"}")
+
+    def _write_tile(self, i, writer, f):
+        data = writer.encode(writer.round_node(self.tile_dict(i)))
+        children = self.children(i)
+        if len(children) == 0:
+            f.write(data)
+            return
+        f.write(data[:-1] + b',"children":[')
+        for n, child in enumerate(children):
+            if n > 0:
+                f.write(b",")
+            self._write_tile(child, writer, f)
+        f.write(b"]}")
@@ -0,0 +1,109 @@
+import struct
+from .BatchedModel import BatchedModel
+
+
+class Composite:
+    """
+    A Composite (cmpt) tile content, which packs several inner tile contents
+    (b3dm, i3dm, pnts, or other composites) into one file, so that a viewer
+    can load them with one request. The inner tiles are kept as they are,
+    each with its own feature table and batch table.
+
+    Attributes
+    ----------
+    tiles : list of bytes
+        The inner tile contents, in order.
+    """
+
+    HEADER = 16
+    VERSION = 1
+    FILE_EXT = ".cmpt"
+
+    # The magic of the tile formats that can be inner tiles
+    INNER_MAGICS = [b"b3dm", b"i3dm", b"pnts", b"cmpt"]
+
+    def __init__(self, tiles=None):
+        self.tiles = []
+        for tile in tiles or []:
+            self.add(tile)
+
+    def add(self, tile):
+        """
+        Add an inner tile.
+
+        Parameters
+        ----------
+        tile : bytes or BatchedModel or Composite
+            The inner tile content.
+        """
+        if isinstance(tile, (BatchedModel, Composite)):
+            tile = tile.to_bytes()
+        tile = bytes(tile)
+        if tile[:4] not in self.INNER_MAGICS:
+            raise ValueError(
+                f"Inner tiles must be one of {self.INNER_MAGICS}, not {tile[:4]}"
+            )
+        self.tiles.append(tile)
+
+    @classmethod
+    def from_files(cls, paths):
+        """
+        Create a composite from inner tile files, e.g. b3dm files.
+        """
+        tiles = []
+        for path in paths:
+            with open(path, "rb") as f:
+                tiles.append(f.read())
+        return cls(tiles)
+
+    @classmethod
+    def from_file(cls, path):
+        """
+        Read a cmpt file.
+        """
+        with open(path, "rb") as f:
+            return cls.from_bytes(f.read())
+
+    @classmethod
+    def from_bytes(cls, data):
+        """
+        Read a composite tile content from bytes.
+        """
+        data = bytes(data)
+        if len(data) < cls.HEADER or data[:4] != b"cmpt":
+            raise ValueError("The data is not a cmpt tile.")
+        _, _, byte_length, tiles_length = struct.unpack("<4s3I", data[: cls.HEADER])
+        tiles = []
+        offset = cls.HEADER
+        for _ in range(tiles_length):
+            (length,) = struct.unpack("<I", data[offset + 8 : offset + 12])
+            tiles.append(data[offset : offset + length])
+            offset += length
+        return cls(tiles)
+
+    def __len__(self):
+        return len(self.tiles)
+
+    def to_bytes(self):
+        """
+        Encode the composite as a cmpt tile. Each inner tile is padded to a
+        multiple of 8 bytes, and its byteLength is updated to include the
+        padding.
+        """
+        parts = []
+        for tile in self.tiles:
+            padding = -len(tile) % 8
+            if padding:
+                length = struct.pack("<I", len(tile) + padding)
+                tile = tile[:8] + length + tile[12:] + b"\x00" * padding
+            parts.append(tile)
+        byte_length = self.HEADER + sum(len(part) for part in parts)
+        header = struct.pack("<4s3I", b"cmpt", self.VERSION, byte_length, len(parts))
+        return b"".join([header] + parts)
+
+    def save(self, path):
+        """
+        Save the composite as a cmpt file.
+        """
+        with open(path, "wb") as f:
+            f.write(self.to_bytes())
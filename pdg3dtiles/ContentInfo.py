@@ -0,0 +1,213 @@
+import io
+import os
+import json
+import struct
+
+
+class ContentInfo:
+    """
+    Sizes and geometry counts of a tile content file (b3dm, glb, or cmpt),
+    read from the file headers and the glTF JSON chunk. The binary geometry
+    is never read, so large files can be summarized quickly.
+
+    Attributes
+    ----------
+    format : str
+        The content format: "b3dm", "glb", "cmpt", "json" (an external
+        tileset), or "unknown".
+    byte_length : int
+        The size of the content in bytes.
+    triangles : int
+        The number of triangles in the glTF meshes.
+    vertices : int
+        The number of vertices in the glTF meshes.
+    batch_length : int
+        The number of features (batches) in the content.
+    feature_table_bytes : int
+        The size of the feature table(s), JSON and binary.
+    batch_table_bytes : int
+        The size of the batch table(s), JSON and binary.
+    gltf_bytes : int
+        The size of the embedded glTF (GLB) data.
+    tiles : int
+        The number of tiles in a composite (cmpt) content, or 1.
+    exists : bool
+        False if the content file could not be found.
+    """
+
+    # Sizes of the binary headers, in bytes
+    B3DM_HEADER = 28
+    CMPT_HEADER = 16
+    GLB_HEADER = 12
+    CHUNK_HEADER = 8
+
+    # glTF primitive modes that draw triangles
+    TRIANGLES = 4
+    TRIANGLE_STRIP = 5
+    TRIANGLE_FAN = 6
+
+    def __init__(self, format="unknown", byte_length=0, exists=True):
+        self.format = format
+        self.byte_length = byte_length
+        self.triangles = 0
+        self.vertices = 0
+        self.batch_length = 0
+        self.feature_table_bytes = 0
+        self.batch_table_bytes = 0
+        self.gltf_bytes = 0
+        self.tiles = 1
+        self.exists = exists
+
+    @classmethod
+    def from_file(cls, path):
+        """
+        Read the headers of a content file.
+
+        Parameters
+        ----------
+        path : str
+            The path to a b3dm, glb, cmpt, or tileset JSON file.
+
+        Returns
+        -------
+        ContentInfo
+            The content info. If the file does not exist, exists is False and
+            all sizes are 0.
+        """
+        if not os.path.isfile(path):
+            return cls(exists=False)
+        size = os.path.getsize(path)
+        with open(path, "rb") as f:
+            magic = f.read(4)
+            if magic in (b"b3dm", b"glTF", b"cmpt"):
+                info = cls._read(f, 0, size)
+            else:
+                info = cls("json" if path.lower().endswith(".json") else "unknown")
+        info.byte_length = size
+        return info
+
+    @classmethod
+    def from_bytes(cls, data):
+        """
+        Read the headers of content that is already in memory.
+        """
+        info = cls._read(io.BytesIO(data), 0, len(data))
+        info.byte_length = len(data)
+        return info
+
+    @classmethod
+    def _read(cls, f, offset, length):
+        """
+        Read the content that starts at offset in file f.
+        """
+        f.seek(offset)
+        magic = f.read(4)
+        if magic == b"b3dm":
+            return cls._read_b3dm(f, offset, length)
+        if magic == b"glTF":
+            info = cls("glb", length)
+            cls._read_glb(f, offset, info)
+            return info
+        if magic == b"cmpt":
+            return cls._read_cmpt(f, offset, length)
+        return cls("unknown", length)
+
+    @classmethod
+    def _read_b3dm(cls, f, offset, length):
+        f.seek(offset)
+        header = struct.unpack("<4s6I", f.read(cls.B3DM_HEADER))
+        byte_length, ft_json, ft_bin, bt_json, bt_bin = header[2:7]
+        info = cls("b3dm", byte_length)
+        info.feature_table_bytes = ft_json + ft_bin
+        info.batch_table_bytes = bt_json + bt_bin
+        if ft_json:
+            feature_table = json.loads(f.read(ft_json).rstrip(b" \x00") or b"{}")
+            info.batch_length = int(feature_table.get("BATCH_LENGTH", 0))
+        glb_offset = offset + cls.B3DM_HEADER + ft_json + ft_bin + bt_json + bt_bin
+        if glb_offset < offset + byte_length:
+            cls._read_glb(f, glb_offset, info)
+        return info
+
+    @classmethod
+    def _read_cmpt(cls, f, offset, length):
+        f.seek(offset)
+        _, _, byte_length, tiles_length = struct.unpack(
+            "<4s3I", f.read(cls.CMPT_HEADER)
+        )
+        info = cls("cmpt", byte_length)
+        info.tiles = 0
+        inner_offset = offset + cls.CMPT_HEADER
+        for _ in range(tiles_length):
+            f.seek(inner_offset + 8)
+            (inner_length,) = struct.unpack("<I", f.read(4))
+            inner = cls._read(f, inner_offset, inner_length)
+            info.add(inner)
+            inner_offset += inner_length
+        return info
+
+    @classmethod
+    def _read_glb(cls, f, offset, info):
+        """
+        Add the counts from the GLB at offset in file f to info.
+        """
+        f.seek(offset + 8)
+        (glb_length,) = struct.unpack("<I", f.read(4))
+        info.gltf_bytes += glb_length
+        chunk_length, chunk_type = struct.unpack("<I4s", f.read(cls.CHUNK_HEADER))
+        if chunk_type != b"JSON":
+            return
+        gltf = json.loads(f.read(chunk_length).rstrip(b" \x00"))
+        triangles, vertices = cls.count_gltf(gltf)
+        info.triangles += triangles
+        info.vertices += vertices
+
+    @classmethod
+    def count_gltf(cls, gltf):
+        """
+        Count the triangles and vertices of the meshes in a glTF JSON dict.
+
+        Returns
+        -------
+        triangles, vertices : int
+        """
+        accessors = gltf.get("accessors", [])
+        triangles = 0
+        vertices = 0
+        for mesh in gltf.get("meshes", []):
+            for primitive in mesh.get("primitives", []):
+                position = primitive.get("attributes", {}).get("POSITION")
+                n_vertices = accessors[position]["count"] if position is not None else 0
+                indices = primitive.get("indices")
+                n = accessors[indices]["count"] if indices is not None else n_vertices
+                mode = primitive.get("mode", cls.TRIANGLES)
+                if mode == cls.TRIANGLES:
+                    triangles += n // 3
+                elif mode in (cls.TRIANGLE_STRIP, cls.TRIANGLE_FAN):
+                    triangles += max(n - 2, 0)
+                vertices += n_vertices
+        return triangles, vertices
+
+    def add(self, other):
+        """
+        Add the counts and sizes of the tiles of another ContentInfo, e.g. an
+        inner tile of a composite.
+        """
+        self.triangles += other.triangles
+        self.vertices += other.vertices
+        self.batch_length += other.batch_length
+        self.feature_table_bytes += other.feature_table_bytes
+        self.batch_table_bytes += other.batch_table_bytes
+        self.gltf_bytes += other.gltf_bytes
+        self.tiles += other.tiles
+
+    def to_dict(self):
+        """
+        Convert the content info to a dict.
+        """
+        return dict(self.__dict__)
+
+    def __str__(self):
+        return f"ContentInfo({self.to_dict()})"
+
+    def __repr__(self):
+        return self.__str__()
@@ -0,0 +1,336 @@
+import os
+import json
+import time
+import bisect
+import threading
+from contextlib import contextmanager
+
+
+class Metrics:
+    """
+    Counters and histograms about tileset builds, e.g. the number of tiles
+    built, features, bytes written, the time of each stage, and errors.
+    Builders such as leaf_tile_from_gdf and parent_tile_from_children_json
+    report to a Metrics object when one is passed as their metrics parameter.
+
+    Metrics are written either as JSON lines, one line per event, appended to
+    a file that is kept open; or as a Prometheus text file (for the node
+    exporter's textfile collector) holding the current totals, which is
+    replaced atomically. The updates made while recording one tile are
+    batched, so the file is written once per batch rather than once per
+    update, and interval limits how often a Prometheus file is written at
+    all. Call close (or use the Metrics as a context manager) at the end to
+    write the last updates. When several processes build tiles, give each one
+    its own Prometheus file, e.g. with the process ID in the name. Metrics can
+    be updated from several threads of one process.
+
+    Attributes
+    ----------
+    path : str
+        The file to write the metrics to, or None to only keep them in memory.
+    format : "jsonl" or "prometheus"
+        The output format.
+    prefix : str
+        The prefix of the metric names.
+    labels : dict
+        Labels added to every metric, e.g. a job name.
+    interval : float
+        The minimum time between two writes of a Prometheus file, in seconds.
+    counters : dict
+        The value of each counter, keyed by (name, labels).
+    histograms : dict
+        The bucket counts, sum and count of each histogram, keyed by (name,
+        labels).
+    """
+
+    FORMATS = ["jsonl", "prometheus"]
+
+    # The type and help text of each metric
+    METRICS = {
+        "tiles_built_total": ("counter", "Number of tiles built."),
+        "features_total": ("counter", "Number of features in the tiles built."),
+        "vertices_total": ("counter", "Number of vertices in the tiles built."),
+        "bytes_written_total": ("counter", "Bytes of tile files written."),
+        "errors_total": ("counter", "Number of tiles that failed to build."),
+        "stage_seconds": ("histogram", "Time of each stage of building a tile."),
+        "build_seconds": ("histogram", "Time to build a tile."),
+    }
+
+    # Histogram bucket upper bounds, in seconds
+    BUCKETS = [0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 10, 30, 60, 300]
+
+    def __init__(
+        self, path=None, format=None, prefix="pdg3dtiles", labels=None, interval=0
+    ):
+        """
+        Parameters
+        ----------
+        path : str
+            The file to write the metrics to (optional).
+        format : "jsonl" or "prometheus"
+            The output format. By default, "prometheus" is used for paths that
+            end with ".prom" and "jsonl" for other paths.
+        prefix : str
+            The prefix of the metric names. Default is "pdg3dtiles".
+        labels : dict
+            Labels to add to every metric (optional).
+        interval : float
+            The minimum time between two writes of a Prometheus file, in
+            seconds. Updates in between are written by the next write after
+            the interval, or by flush or close. Default is 0, to write after
+            every batch of updates.
+        """
+        if format is None:
+            format = "prometheus" if path and path.endswith(".prom") else "jsonl"
+        if format not in self.FORMATS:
+            raise ValueError(f"format must be one of {self.FORMATS}, not {format}")
+        self.path = path
+        self.format = format
+        self.prefix = prefix
+        self.labels = dict(labels or {})
+        self.interval = interval
+        self.counters = {}
+        self.histograms = {}
+        self._lock = threading.RLock()
+        self._depth = 0
+        self._dirty = False
+        self._last_write = 0.0
+        self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    @contextmanager
+    def batch(self):
+        """
+        Write the updates made in the context once, at its end, instead of
+        after each update. Batches can be nested.
+        """
+        with self._lock:
+            self._depth += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._depth -= 1
+                if self._depth == 0:
+                    self._flush_pending()
+
+    def _key(self, name, labels):
+        if name not in self.METRICS:
+            raise ValueError(f"Unknown metric: {name}")
+        labels = {**self.labels, **labels}
+        return name, tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+    def inc(self, name, value=1, **labels):
+        """
+        Add a value to a counter.
+        """
+        key = self._key(name, labels)
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+            self._emit("counter", key, value)
+
+    def observe(self, name, value, **labels):
+        """
+        Add an observation, e.g. a time in seconds, to a histogram.
+        """
+        key = self._key(name, labels)
+        index = bisect.bisect_left(self.BUCKETS, value)
+        with self._lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                buckets = [0] * len(self.BUCKETS)
+                histogram = {"buckets": buckets, "sum": 0.0, "count": 0}
+                self.histograms[key] = histogram
+            if index < len(self.BUCKETS):
+                histogram["buckets"][index] += 1
+            histogram["sum"] += value
+            histogram["count"] += 1
+            self._emit("histogram", key, value)
+
+    @contextmanager
+    def timer(self, name, **labels):
+        """
+        Observe the time that the code in the context takes.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    @contextmanager
+    def build(self, kind):
+        """
+        Measure building one tile: observe its time in build_seconds when it
+        succeeds, or count it in errors_total when it raises an exception. The
+        exception is raised again.
+
+        Parameters
+        ----------
+        kind : str
+            The kind of tile, e.g. "leaf" or "parent".
+        """
+        start = time.perf_counter()
+        with self.batch():
+            try:
+                yield
+            except Exception as e:
+                self.record_error(kind, e)
+                raise
+            self.observe("build_seconds", time.perf_counter() - start, kind=kind)
+
+    def record_tile(self, kind="leaf", paths=(), tiles=()):
+        """
+        Record a tile that was built: count the tile and the size of its
+        files, and the features, vertices, and time of each stage of the
+        Cesium3DTiles in its content.
+
+        Parameters
+        ----------
+        kind : str
+            The kind of tile, e.g. "leaf" or "parent".
+        paths : list of str
+            The files that were written for the tile.
+        tiles : list of Cesium3DTile
+            The Cesium3DTiles of the tile content, with their stats (optional).
+        """
+        with self.batch():
+            self.inc("tiles_built_total", kind=kind)
+            for tile in tiles:
+                stats = tile.stats
+                self.inc("features_total", stats.features, kind=kind)
+                self.inc("vertices_total", stats.vertices, kind=kind)
+                for stage, record in stats.stages.items():
+                    self.observe("stage_seconds", record["wall"], stage=stage)
+            self.record_files(paths, kind)
+
+    def record_files(self, paths, kind):
+        """
+        Add the size of files that were written to bytes_written_total.
+        """
+        size = sum(os.path.getsize(path) for path in paths if os.path.exists(path))
+        self.inc("bytes_written_total", size, kind=kind)
+
+    def record_error(self, kind, error):
+        """
+        Count a tile that failed to build, by the type of the error.
+        """
+        self.inc("errors_total", kind=kind, error=type(error).__name__)
+
+    def _emit(self, type, key, value):
+        # Called with the lock held
+        if not self.path:
+            return
+        if self.format == "jsonl":
+            name, labels = key
+            event = {
+                "time": time.time(),
+                "type": type,
+                "name": f"{self.prefix}_{name}",
+                "value": value,
+                "labels": dict(labels),
+            }
+            if self._file is None:
+                self._file = open(self.path, "a")
+            self._file.write(json.dumps(event) + "\n")
+        self._dirty = True
+        if self._depth == 0:
+            self._flush_pending()
+
+    def _flush_pending(self, force=False):
+        # Write the updates that were not written yet. Called with the lock
+        # held.
+        if not self._dirty:
+            return
+        if self.format == "jsonl":
+            self._file.flush()
+            self._dirty = False
+        elif force or time.monotonic() - self._last_write >= self.interval:
+            self.write()
+
+    def flush(self):
+        """
+        Write the updates that were not written yet, e.g. because of the
+        interval.
+        """
+        with self._lock:
+            self._flush_pending(force=True)
+
+    def close(self):
+        """
+        Write the last updates, and close the JSON lines file.
+        """
+        with self._lock:
+            self._flush_pending(force=True)
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def write(self, path=None):
+        """
+        Write the current totals as a Prometheus text file. The file is
+        replaced atomically, so a collector never reads a partial file.
+
+        Parameters
+        ----------
+        path : str
+            The file to write to. Default is the path of this Metrics.
+        """
+        path = path or self.path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with self._lock:
+            with open(temp_path, "w") as f:
+                f.write(self.to_prometheus())
+            os.replace(temp_path, path)
+            if path == self.path:
+                self._dirty = False
+                self._last_write = time.monotonic()
+
+    def to_prometheus(self):
+        """
+        Format the current totals in the Prometheus text exposition format.
+        """
+        lines = []
+        for name, (type, help) in self.METRICS.items():
+            values = self.counters if type == "counter" else self.histograms
+            keys = sorted(key for key in values if key[0] == name)
+            if not keys:
+                continue
+            full_name = f"{self.prefix}_{name}"
+            lines.append(f"# HELP {full_name} {help}")
+            lines.append(f"# TYPE {full_name} {type}")
+            for key in keys:
+                labels = key[1]
+                if type == "counter":
+                    lines.append(f"{full_name}{_labels(labels)} {values[key]}")
+                    continue
+                histogram = values[key]
+                total = 0
+                for bound, count in zip(self.BUCKETS, histogram["buckets"]):
+                    total += count
+                    le = _labels(labels + (("le", str(bound)),))
+                    lines.append(f"{full_name}_bucket{le} {total}")
+                le = _labels(labels + (("le", "+Inf"),))
+                lines.append(f"{full_name}_bucket{le} {histogram['count']}")
+                lines.append(f"{full_name}_sum{_labels(labels)} {histogram['sum']}")
+                lines.append(f"{full_name}_count{_labels(labels)} {histogram['count']}")
+        return "\n".join(lines) + "\n"
+
+
+def _labels(labels):
+    # Format labels as {key="value",...}
+    if not labels:
+        return ""
+    escaped = [
+        (k, v.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for k, v in labels
+    ]
+    return "{" + ",".join(f'{k}="{v}"' for k, v in escaped) + "}"
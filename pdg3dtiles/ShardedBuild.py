@@ -0,0 +1,408 @@
+import os
+import json
+import hashlib
+import numpy as np
+import geopandas
+from concurrent.futures import ProcessPoolExecutor
+from .BoundingVolume import BoundingVolume, BoundingVolumeRegion, ecef_to_geodetic
+from .TileMatrix import TileMatrix
+from .TreeGenerator import (
+    leaf_tile_from_gdf,
+    parent_tile_from_summaries,
+    tile_summary,
+)
+
+
+class ShardedBuild:
+    """
+    Build a tileset in shards that run independently, e.g. in separate pods
+    or processes, and merge them into one tree afterwards.
+
+    Each leaf input (a vector file, or a partition of a GeoDataFrame) has a
+    key, and belongs to the shard given by the MD5 hash of its key, so every
+    worker selects the same inputs for the same shard index and count without
+    coordinating. A shard builds the leaf tiles of its inputs, and writes a
+    manifest with the summary of each leaf (see tile_summary) to
+    <dir>/manifests/. Shards never write parent tiles. Once every shard is
+    done, merge builds all the parent levels from the manifests, without
+    reading the leaf JSON files. Leaves are grouped into parents by where
+    they are, not by their keys, so parents hold tiles that are close
+    together.
+
+        # In each of the 4 workers
+        ShardedBuild(out, shard_index, 4).build(paths, base_dir=data)
+        # Once all 4 are done
+        ShardedBuild.merge(out)
+
+    Attributes
+    ----------
+    dir : str
+        The directory of the tileset. Leaf tiles are saved under it, at the
+        path of their key.
+    shard_index : int
+        The index of this shard, from 0 to shard_count - 1.
+    shard_count : int
+        The number of shards.
+    """
+
+    MANIFEST_DIR = "manifests"
+
+    def __init__(self, dir, shard_index=0, shard_count=1):
+        if shard_count < 1 or not 0 <= shard_index < shard_count:
+            raise ValueError(
+                "shard_index must be from 0 to shard_count - 1, but is "
+                f"{shard_index} of {shard_count}"
+            )
+        self.dir = dir
+        self.shard_index = shard_index
+        self.shard_count = shard_count
+
+    @staticmethod
+    def shard_of(key, shard_count):
+        """
+        Get the index of the shard that a key belongs to. The MD5 hash is used
+        instead of hash() so that the result is the same in every process.
+        """
+        digest = hashlib.md5(str(key).encode("utf-8")).hexdigest()
+        return int(digest, 16) % shard_count
+
+    def owns(self, key):
+        """
+        Check whether a key belongs to this shard.
+        """
+        return self.shard_of(key, self.shard_count) == self.shard_index
+
+    def select(self, keys):
+        """
+        Get the keys that belong to this shard, sorted.
+        """
+        return sorted(key for key in keys if self.owns(key))
+
+    @classmethod
+    def manifest_path(cls, dir, shard_index, shard_count):
+        """
+        Get the path of the manifest of a shard.
+        """
+        name = f"shard-{shard_index:05d}-of-{shard_count:05d}.json"
+        return os.path.join(dir, cls.MANIFEST_DIR, name)
+
+    def build(self, inputs, partition_by=None, base_dir=None, **kwargs):
+        """
+        Build the leaf tiles of the inputs that belong to this shard, and
+        write the manifest of the shard.
+
+        Parameters
+        ----------
+        inputs : list of str or GeoDataFrame
+            The paths of vector files to build one leaf tile from each, or a
+            GeoDataFrame to split into leaf tiles with partition_by.
+        partition_by : str or list of str
+            When inputs is a GeoDataFrame, the column(s) whose values are the
+            keys of the leaf tiles.
+        base_dir : str
+            When inputs are paths, the key of each file is its path relative to
+            base_dir, without extension, e.g. "12/345/678" for
+            <base_dir>/12/345/678.gpkg. If None, the file name is the key.
+        **kwargs
+            Passed to leaf_tile_from_gdf, e.g. boundingVolumeType or z.
+
+        Returns
+        -------
+        dict
+            The manifest of the shard.
+        """
+        entries = []
+        if isinstance(inputs, geopandas.GeoDataFrame):
+            if partition_by is None:
+                raise ValueError("partition_by is needed to split a GeoDataFrame.")
+            groups = dict(
+                (self._partition_key(key), gdf)
+                for key, gdf in inputs.groupby(partition_by, sort=False)
+            )
+            for key in self.select(groups):
+                entries.append(self._build_leaf(key, groups[key].copy(), kwargs))
+        else:
+            keys = {self._file_key(path, base_dir): path for path in inputs}
+            if len(keys) != len(inputs):
+                raise ValueError("The inputs must have unique keys.")
+            for key in self.select(keys):
+                gdf = geopandas.read_file(keys[key])
+                entries.append(self._build_leaf(key, gdf, kwargs))
+        return self.write_manifest(entries)
+
+    @staticmethod
+    def _partition_key(value):
+        if isinstance(value, tuple):
+            return "/".join(str(v) for v in value)
+        return str(value)
+
+    @staticmethod
+    def _file_key(path, base_dir):
+        if base_dir is not None:
+            path = os.path.relpath(path, base_dir)
+        else:
+            path = os.path.basename(path)
+        return os.path.splitext(path)[0].replace(os.sep, "/")
+
+    def _build_leaf(self, key, gdf, kwargs):
+        # Build the leaf tile of one key, and get its manifest entry
+        leaf_dir = os.path.join(self.dir, os.path.dirname(key))
+        os.makedirs(leaf_dir, exist_ok=True)
+        filename = os.path.basename(key)
+        _, tileset = leaf_tile_from_gdf(gdf, dir=leaf_dir, filename=filename, **kwargs)
+        return {
+            "key": key,
+            "path": key + ".json",
+            "summary": tile_summary(tileset),
+        }
+
+    def write_manifest(self, entries):
+        """
+        Write the manifest of this shard. The file is replaced atomically, so
+        merge never reads a partial manifest.
+
+        Parameters
+        ----------
+        entries : list of dict
+            The key, the path relative to dir, and the summary of each leaf
+            tile.
+        """
+        manifest = {
+            "shard_index": self.shard_index,
+            "shard_count": self.shard_count,
+            "tiles": entries,
+        }
+        path = self.manifest_path(self.dir, self.shard_index, self.shard_count)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = path + ".tmp"
+        with open(temp_path, "w") as f:
+            json.dump(manifest, f)
+        os.replace(temp_path, path)
+        return manifest
+
+    @classmethod
+    def read_manifests(cls, dir, shard_count=None):
+        """
+        Read the manifests of every shard, and check that none is missing.
+
+        Parameters
+        ----------
+        dir : str
+            The directory of the tileset.
+        shard_count : int
+            The number of shards. If None, it is read from the manifests.
+
+        Returns
+        -------
+        list of dict
+            The entries of every leaf tile, sorted by key.
+        """
+        manifest_dir = os.path.join(dir, cls.MANIFEST_DIR)
+        names = os.listdir(manifest_dir) if os.path.isdir(manifest_dir) else []
+        manifests = []
+        for name in sorted(names):
+            if name.startswith("shard-") and name.endswith(".json"):
+                with open(os.path.join(manifest_dir, name)) as f:
+                    manifests.append(json.load(f))
+        if shard_count is None:
+            if len(manifests) == 0:
+                raise ValueError(f"There are no manifests in {manifest_dir}")
+            shard_count = manifests[0]["shard_count"]
+        manifests = [m for m in manifests if m["shard_count"] == shard_count]
+        missing = set(range(shard_count)) - {m["shard_index"] for m in manifests}
+        if missing:
+            raise ValueError(
+                f"The manifests of shards {sorted(missing)} of {shard_count} "
+                "are missing."
+            )
+        entries = [entry for m in manifests for entry in m["tiles"]]
+        return sorted(entries, key=lambda entry: entry["key"])
+
+    @classmethod
+    def merge(
+        cls,
+        dir,
+        filename="tileset",
+        fanout=8,
+        shard_count=None,
+        minify_json=True,
+        boundingVolumeType=None,
+        metrics=None,
+    ):
+        """
+        Build the parent levels of the tree from the manifests of the shards.
+        Leaf tiles are sorted along a Z-order curve through their z/x/y keys
+        or the centers of their bounding volumes (see spatial_order), and
+        grouped fanout at a time, level by level, until one root tile is left.
+        Each group is a run of the curve, so the tiles of a parent are close
+        together.
+
+        Parameters
+        ----------
+        dir : str
+            The directory of the tileset.
+        filename : str
+            The name of the root tileset JSON, without extension. Parent tiles
+            are saved as <filename>_<level>_<index>.json. Default is
+            "tileset".
+        fanout : int
+            The maximum number of children of each parent tile. Default is 8.
+        shard_count : int
+            The number of shards (optional). See read_manifests.
+        minify_json : bool
+            Whether to minify the JSON files. Default is True.
+        boundingVolumeType : None or "box" or "region" or "sphere" or "tightest"
+            See parent_tile_from_children_json.
+        metrics : Metrics
+            A Metrics object to report the parent tiles to (optional).
+
+        Returns
+        -------
+        Tileset
+            The root tileset.
+        """
+        if fanout < 2:
+            raise ValueError("fanout must be at least 2")
+        entries = cls.read_manifests(dir, shard_count)
+        if len(entries) == 0:
+            raise ValueError("The shards did not build any leaf tiles.")
+        order = cls.spatial_order(
+            [entry["summary"] for entry in entries],
+            [entry["key"] for entry in entries],
+        )
+        level = [
+            (entries[i]["summary"], os.path.join(dir, entries[i]["path"]))
+            for i in order
+        ]
+        depth = 0
+        while True:
+            groups = [level[i : i + fanout] for i in range(0, len(level), fanout)]
+            next_level = []
+            for i, group in enumerate(groups):
+                name = filename if len(groups) == 1 else f"{filename}_{depth}_{i}"
+                tileset = parent_tile_from_summaries(
+                    [summary for summary, _ in group],
+                    [path for _, path in group],
+                    dir=dir,
+                    filename=name,
+                    minify_json=minify_json,
+                    boundingVolumeType=boundingVolumeType,
+                    metrics=metrics,
+                )
+                next_level.append((tile_summary(tileset), tileset.file_path))
+            if len(groups) == 1:
+                return tileset
+            level = next_level
+            depth += 1
+
+    @staticmethod
+    def spatial_order(summaries, keys=None, bits=16):
+        """
+        Get the order of tiles along a Z-order (Morton) curve. When every key
+        ends with z/x/y (see TileMatrix.parse_path), the curve goes through
+        the tile indices, scaled to the deepest level, so that runs of 4^k
+        tiles of a full grid are the quadrants of the tile matrix. Otherwise
+        it goes through the longitudes and latitudes of the centers of the
+        bounding volumes, scaled to a square grid of 2^bits by 2^bits cells
+        over the extent of all the tiles. Tiles with the same code keep their
+        order.
+
+        Parameters
+        ----------
+        summaries : list of dict
+            The summaries of the tiles (see tile_summary).
+        keys : list of str
+            The keys of the tiles (optional).
+        bits : int
+            The number of bits of each cell index for bounding volume
+            centers. Default is 16.
+
+        Returns
+        -------
+        list of int
+            The indices of the summaries, in curve order.
+        """
+        if len(summaries) == 0:
+            return []
+        tiles = _tile_indices(keys) if keys is not None else None
+        if tiles is not None:
+            max_z = tiles[:, 0].max()
+            cells = tiles[:, 1:] << (max_z - tiles[:, 0])[:, None]
+            bits = int(max_z) + 1
+        else:
+            centers = np.array(
+                [
+                    _center(BoundingVolume(s["root"]["boundingVolume"]))
+                    for s in summaries
+                ]
+            )
+            low = centers.min(axis=0)
+            span = max((centers.max(axis=0) - low).max(), 1e-12)
+            cells = ((centers - low) / span * (2**bits - 1)).astype(np.uint64)
+        cells = cells.astype(np.uint64)
+        codes = np.zeros(len(cells), dtype=np.uint64)
+        for bit in range(bits):
+            for axis in range(2):
+                value = (cells[:, axis] >> np.uint64(bit)) & np.uint64(1)
+                codes |= value << np.uint64(2 * bit + (1 - axis))
+        return np.argsort(codes, kind="stable").tolist()
+
+    @classmethod
+    def run_local(
+        cls,
+        inputs,
+        dir,
+        shard_count,
+        processes=None,
+        partition_by=None,
+        base_dir=None,
+        filename="tileset",
+        fanout=8,
+        **kwargs,
+    ):
+        """
+        Build every shard in a pool of local processes, then merge them. This
+        runs the same steps as a build spread over several machines.
+
+        Parameters
+        ----------
+        processes : int
+            The number of processes. Default is shard_count.
+
+        See build and merge for the other parameters.
+
+        Returns
+        -------
+        Tileset
+            The root tileset.
+        """
+        tasks = [
+            (dir, i, shard_count, inputs, partition_by, base_dir, kwargs)
+            for i in range(shard_count)
+        ]
+        with ProcessPoolExecutor(processes or shard_count) as pool:
+            list(pool.map(_build_shard, tasks))
+        return cls.merge(dir, filename=filename, fanout=fanout, shard_count=shard_count)
+
+
+def _tile_indices(keys):
+    # The (z, x, y) of each key as an array, or None if a key is not z/x/y
+    try:
+        return np.array([TileMatrix.parse_path(key) for key in keys], dtype=np.int64)
+    except ValueError:
+        return None
+
+
+def _center(volume):
+    # The longitude and latitude of the center of a bounding volume, in
+    # radians
+    if isinstance(volume, BoundingVolumeRegion):
+        return [(volume.west + volume.east) / 2, (volume.south + volume.north) / 2]
+    return ecef_to_geodetic(volume.to_array()[0:3])[0:2].tolist()
+
+
+def _build_shard(args):
+    # Build one shard in a worker process
+    dir, shard_index, shard_count, inputs, partition_by, base_dir, kwargs = args
+    shard = ShardedBuild(dir, shard_index, shard_count)
+    shard.build(inputs, partition_by=partition_by, base_dir=base_dir, **kwargs)
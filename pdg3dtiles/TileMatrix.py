@@ -0,0 +1,316 @@
+import os
+import math
+from .BoundingVolume import BoundingVolume, BoundingVolumeRegion
+from .TreeGenerator import parent_tile_from_summaries
+
+
+class TileMatrix:
+    """
+    A tile matrix set: a pyramid of regular grids of tiles in longitude and
+    latitude, where each tile at level z is split into 2 x 2 tiles at level
+    z + 1. Tiles are addressed by (z, x, y), with x counted east from the
+    west edge and y counted south from the north edge, as in the z/x/y paths
+    of the OGC WorldCRS84Quad tile matrix set that viz-staging writes.
+
+    Because the extent of every tile is known from (z, x, y), the bounding
+    volume regions and geometric errors of a whole tree can be calculated
+    without reading any geometry or child tileset JSON. See build_pyramid.
+
+    Attributes
+    ----------
+    name : str
+        The name of the tile matrix set.
+    bounds : tuple of float
+        The (west, south, east, north) extent of the set, in degrees.
+    width, height : int
+        The number of columns and rows of tiles at level 0.
+    """
+
+    # Tile matrix sets that can be used by name
+    SETS = {
+        "WorldCRS84Quad": {"bounds": (-180.0, -90.0, 180.0, 90.0), "size": (2, 1)},
+    }
+
+    # The geometric error of a tile is the size of one pixel when the tile is
+    # shown this many pixels wide
+    PIXELS = 256
+
+    # The length of one degree of longitude at the equator of the WGS 84
+    # ellipsoid, in meters
+    METERS_PER_DEGREE = 2 * math.pi * 6378137.0 / 360
+
+    def __init__(self, name="WorldCRS84Quad", bounds=None, width=None, height=None):
+        """
+        Parameters
+        ----------
+        name : str
+            The name of a tile matrix set in SETS, or of a custom set. Default
+            is "WorldCRS84Quad".
+        bounds : tuple of float
+            The (west, south, east, north) extent of a custom set, in degrees.
+        width, height : int
+            The number of columns and rows of tiles at level 0 of a custom set.
+        """
+        known = self.SETS.get(name)
+        if known is None and (bounds is None or width is None or height is None):
+            raise ValueError(
+                f"{name} is not one of {list(self.SETS)}, so bounds, width and "
+                "height are needed."
+            )
+        self.name = name
+        self.bounds = tuple(bounds or known["bounds"])
+        self.width = width or known["size"][0]
+        self.height = height or known["size"][1]
+
+    def matrix_size(self, z):
+        """
+        Get the number of columns and rows of tiles at level z.
+        """
+        return self.width * 2**z, self.height * 2**z
+
+    def tile_bounds(self, z, x, y, margin=0):
+        """
+        Get the (west, south, east, north) extent of a tile, in degrees.
+
+        Parameters
+        ----------
+        z, x, y : int
+            The level, column and row of the tile.
+        margin : float
+            A margin to add on each side, as a fraction of the tile size, e.g.
+            for features that extend past the edge of their tile. Default is
+            0. The extent is clipped to the bounds of the set.
+        """
+        columns, rows = self.matrix_size(z)
+        if not (0 <= x < columns and 0 <= y < rows):
+            raise ValueError(f"Tile {z}/{x}/{y} is outside of {self.name}")
+        west, south, east, north = self.bounds
+        dx, dy = (east - west) / columns, (north - south) / rows
+        return (
+            max(west + (x - margin) * dx, west),
+            max(north - (y + 1 + margin) * dy, south),
+            min(west + (x + 1 + margin) * dx, east),
+            min(north - (y - margin) * dy, north),
+        )
+
+    def region(self, z, x, y, min_height=0, max_height=0, margin=0):
+        """
+        Get the bounding volume region of a tile, from its extent and a height
+        range.
+
+        Parameters
+        ----------
+        z, x, y : int
+            The level, column and row of the tile.
+        min_height, max_height : float
+            The height range of the data, in meters. Default is 0.
+        margin : float
+            See tile_bounds.
+
+        Returns
+        -------
+        BoundingVolumeRegion
+        """
+        west, south, east, north = self.tile_bounds(z, x, y, margin)
+        return BoundingVolumeRegion(
+            BoundingVolumeRegion.values_list_from_degrees(
+                west, south, east, north, min_height, max_height
+            )
+        )
+
+    def geometric_error(self, z):
+        """
+        Get the geometric error of the tiles at level z: the size in meters of
+        one pixel of a tile shown PIXELS wide, at the equator.
+        """
+        columns, _ = self.matrix_size(z)
+        west, _, east, _ = self.bounds
+        return (east - west) / columns * self.METERS_PER_DEGREE / self.PIXELS
+
+    @staticmethod
+    def parent(z, x, y):
+        """
+        Get the (z, x, y) of the parent of a tile.
+        """
+        if z <= 0:
+            raise ValueError("Tiles at level 0 have no parent")
+        return z - 1, x // 2, y // 2
+
+    @staticmethod
+    def children(z, x, y):
+        """
+        Get the (z, x, y) of the four children of a tile.
+        """
+        return [(z + 1, 2 * x + dx, 2 * y + dy) for dy in range(2) for dx in range(2)]
+
+    @staticmethod
+    def parse_path(path):
+        """
+        Get the (z, x, y) of a tile from a path that ends with z/x/y, with
+        any extension, e.g. "WorldCRS84Quad/12/762/455.json".
+        """
+        parts = os.path.normpath(path).split(os.sep)[-3:]
+        if len(parts) == 3:
+            parts[2] = os.path.splitext(parts[2])[0]
+            if all(part.isdigit() for part in parts):
+                return tuple(int(part) for part in parts)
+        raise ValueError(f"{path} does not end with z/x/y")
+
+    def build_pyramid(
+        self,
+        leaves,
+        dir,
+        filename="tileset",
+        min_z=0,
+        min_height=0,
+        max_height=0,
+        margin=0.05,
+        summaries=None,
+        geometricError=None,
+        tilesetVersion=None,
+        minify_json=True,
+        metrics=None,
+        writer=None,
+    ):
+        """
+        Build every parent tile above a set of leaf tiles, and a root tileset.
+        The bounding volume region and geometric error of every tile are
+        calculated from its (z, x, y), so no geometry and no child JSON is
+        read, and the leaf files do not have to be written yet (e.g. when
+        they are queued with a WriteBehindQueue).
+
+        The region of each leaf must contain all of its features, or Cesium
+        will cull features that are on screen. It is the leaf's tile extended
+        by margin on each side, joined with the bounding volume in the leaf's
+        summary when one is given. Staged tiles usually hold whole features
+        that overhang the tile's edges a little, so keep margin larger than
+        the largest overhang, or give the summaries of the leaves. The region
+        of each parent is its own tile extended by margin, joined with the
+        regions of its children.
+
+        Parent tiles are saved as <dir>/<z>/<x>/<y>.json, so that leaves built
+        in the same layout form one tree.
+
+        Parameters
+        ----------
+        leaves : list of str or dict
+            The paths to the leaf tileset JSON files, ending with z/x/y, or a
+            dict of (z, x, y) to path. Leaves may be at different levels.
+        dir : str
+            The directory to save the parent tiles and the root to.
+        filename : str
+            The name of the root tileset JSON, without extension, saved in
+            dir. Default is "tileset".
+        min_z : int
+            The level of the top tiles, which are the children of the root.
+            Default is 0.
+        min_height, max_height : float
+            The height range of the data, in meters. Default is 0.
+        margin : float
+            A margin to add around each tile's region, as a fraction of the
+            tile size. Default is 0.05.
+        summaries : dict
+            The summaries of some or all of the leaves (see tile_summary),
+            keyed by (z, x, y) or by path (optional). The bounding volume of
+            each summary is joined into the region of its leaf, and the rest
+            of the summary is used as the leaf's entry in its parent.
+        geometricError : float or callable
+            The geometric error of every tile, or a function that gets the
+            level z and returns the geometric error of the tiles at that
+            level. Default is geometric_error.
+        tilesetVersion : str
+            An application specific version for the tilesets (optional).
+        minify_json : bool
+            Whether to minify the JSON files. Default is True.
+        metrics : Metrics
+            A Metrics object to report the parent tiles to (optional).
+        writer : WriteBehindQueue
+            A queue to write the JSON files with in the background (optional).
+
+        Returns
+        -------
+        Tileset
+            The root tileset.
+        """
+        if isinstance(leaves, dict):
+            items = leaves.items()
+        else:
+            items = [(self.parse_path(path), path) for path in leaves]
+        if len(items) == 0:
+            raise ValueError("At least one leaf tile is needed.")
+        summaries = summaries or {}
+
+        if geometricError is None:
+            error = self.geometric_error
+        elif callable(geometricError):
+            error = geometricError
+        else:
+            error = lambda z: geometricError  # noqa: E731
+
+        asset = {"version": "1.0"}
+        if tilesetVersion:
+            asset["tilesetVersion"] = tilesetVersion
+
+        def summary(z, region, known=None):
+            # The entry of a tile in its parent, as tile_summary would read it
+            if known is None:
+                known = {
+                    "tileset": {"asset": asset, "geometricError": error(z)},
+                    "root": {"geometricError": error(z)},
+                }
+            root = dict(known["root"], boundingVolume=region.to_dict())
+            return {"tileset": known["tileset"], "root": root}
+
+        # The path, region and summary of the tiles at each level, keyed by
+        # (x, y)
+        levels = {}
+        for (z, x, y), path in items:
+            if z < min_z:
+                raise ValueError(f"Leaf {z}/{x}/{y} is above min_z {min_z}")
+            region = self.region(z, x, y, min_height, max_height, margin)
+            known = summaries.get((z, x, y), summaries.get(path))
+            if known is not None:
+                region = region.add(BoundingVolume(known["root"]["boundingVolume"]))
+            levels.setdefault(z, {})[(x, y)] = (path, summary(z, region, known))
+
+        def build(children, parent_dir, name, z, region):
+            for _, child in children:
+                region = region.add(BoundingVolume(child["root"]["boundingVolume"]))
+            tileset = parent_tile_from_summaries(
+                [child for _, child in children],
+                [path for path, _ in children],
+                dir=parent_dir,
+                filename=name,
+                geometricError=error(z),
+                tilesetVersion=tilesetVersion,
+                boundingVolume=region.to_dict(),
+                minify_json=minify_json,
+                metrics=metrics,
+                writer=writer,
+            )
+            return tileset, region
+
+        for z in range(max(levels), min_z, -1):
+            groups = {}
+            for (x, y), child in sorted(levels.get(z, {}).items()):
+                groups.setdefault((x // 2, y // 2), []).append(child)
+            parents = levels.setdefault(z - 1, {})
+            for (px, py), children in sorted(groups.items()):
+                if (px, py) in parents:
+                    raise ValueError(
+                        f"Tile {z - 1}/{px}/{py} is both a leaf and a parent."
+                    )
+                tileset, region = build(
+                    children,
+                    os.path.join(dir, str(z - 1), str(px)),
+                    str(py),
+                    z - 1,
+                    self.region(z - 1, px, py, min_height, max_height, margin),
+                )
+                parents[(px, py)] = (tileset.file_path, summary(z - 1, region))
+
+        # The root holds the top tiles, with a region around all of them
+        top = [child for _, child in sorted(levels[min_z].items())]
+        region = BoundingVolume(top[0][1]["root"]["boundingVolume"])
+        tileset, _ = build(top, dir, filename, min_z - 1, region)
+        return tileset
@@ -0,0 +1,210 @@
+import os
+import cProfile
+import functools
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+# The peak traced memory of each stage that is being measured, from the
+# outermost to the innermost, saved when a nested stage resets the peak.
+# tracemalloc is global, so this is shared by all TileStats.
+_peaks = []
+
+
+class TileStats:
+    """
+    Timing, memory and size statistics for the stages of creating one
+    Cesium3DTile, e.g. reading, tesselation, glTF and batch table creation,
+    and writing the B3DM.
+
+    Memory tracking (with tracemalloc) and profiling (with cProfile) slow the
+    tile down, so they are off unless enabled. Set them on one tile's stats,
+    or on the TileStats class to enable them for every new tile, e.g. the
+    tiles created by leaf_tile_from_gdf.
+
+    Attributes
+    ----------
+    stages : dict
+        For each stage that ran, a dict with the wall time and CPU time in
+        seconds, the peak memory allocated during the stage in bytes (None if
+        memory is not tracked), and the number of calls. Stages are listed in
+        the order they first ran.
+    features : int
+        The number of features (geometries) in the tile.
+    vertices : int
+        The number of vertices in the tile.
+    triangles : int
+        The number of triangles in the tile.
+    bytes : int
+        The size of the B3DM, in bytes.
+    track_memory : bool
+        Whether to measure the peak memory of each stage. Default is False.
+    profile_dir : str
+        A directory to save a cProfile dump of each tile to, as
+        <save_as>.prof (optional).
+    hooks : list of callable
+        Functions that are called after each stage as hook(tile, stage,
+        record), where record is the dict of stats of that one call.
+    """
+
+    # Defaults for new TileStats
+    track_memory = False
+    profile_dir = None
+    default_hooks = []
+
+    def __init__(self, tile=None):
+        self.tile = tile
+        self.stages = {}
+        self.features = 0
+        self.vertices = 0
+        self.triangles = 0
+        self.bytes = 0
+        self.hooks = list(TileStats.default_hooks)
+        self._profiling = False
+
+    def add_hook(self, hook):
+        """
+        Add a function to call after each stage, as hook(tile, stage, record).
+        """
+        self.hooks.append(hook)
+
+    @contextmanager
+    def stage(self, name):
+        """
+        Measure a stage. Times and memory are added to the stage's totals.
+        Stages can be nested, and the peak memory of an enclosing stage
+        includes the peaks of the stages within it.
+
+        Parameters
+        ----------
+        name : str
+            The name of the stage.
+        """
+        started_tracing = False
+        if self.track_memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                started_tracing = True
+            if _peaks:
+                # Save the peak of the enclosing stage before it is reset
+                _peaks[-1] = max(_peaks[-1], tracemalloc.get_traced_memory()[1])
+            _peaks.append(0)
+            if hasattr(tracemalloc, "reset_peak"):
+                tracemalloc.reset_peak()
+            memory_start = tracemalloc.get_traced_memory()[0]
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            yield
+        finally:
+            record = {
+                "wall": time.perf_counter() - wall_start,
+                "cpu": time.process_time() - cpu_start,
+                "peak_memory": None,
+            }
+            if self.track_memory:
+                peak = max(tracemalloc.get_traced_memory()[1], _peaks.pop())
+                record["peak_memory"] = max(peak - memory_start, 0)
+                if _peaks:
+                    # Fold this peak into the enclosing stage's peak
+                    _peaks[-1] = max(_peaks[-1], peak)
+                if started_tracing:
+                    tracemalloc.stop()
+            self._add(name, record)
+
+    def _add(self, name, record):
+        totals = self.stages.setdefault(
+            name, {"wall": 0.0, "cpu": 0.0, "peak_memory": None, "calls": 0}
+        )
+        totals["wall"] += record["wall"]
+        totals["cpu"] += record["cpu"]
+        totals["calls"] += 1
+        if record["peak_memory"] is not None:
+            totals["peak_memory"] = max(
+                totals["peak_memory"] or 0, record["peak_memory"]
+            )
+        for hook in self.hooks:
+            hook(self.tile, name, record)
+
+    @staticmethod
+    def timed(name):
+        """
+        A decorator for Cesium3DTile methods that measures each call as a
+        stage.
+        """
+
+        def decorator(method):
+            @functools.wraps(method)
+            def wrapper(self, *args, **kwargs):
+                with self.stats.stage(name):
+                    return method(self, *args, **kwargs)
+
+            return wrapper
+
+        return decorator
+
+    @contextmanager
+    def profile(self, name):
+        """
+        Profile the code in the context with cProfile if profile_dir is set,
+        and save the stats to <profile_dir>/<name>.prof. Nested calls are
+        profiled as part of the outer call.
+        """
+        if not self.profile_dir or self._profiling:
+            yield
+            return
+        profiler = cProfile.Profile()
+        self._profiling = True
+        profiler.enable()
+        try:
+            yield
+        finally:
+            profiler.disable()
+            self._profiling = False
+            os.makedirs(self.profile_dir, exist_ok=True)
+            profiler.dump_stats(os.path.join(self.profile_dir, name + ".prof"))
+
+    def count_geometries(self, geometries):
+        """
+        Count the features, vertices and triangles of tesselated geometries.
+        """
+        self.features = len(geometries)
+        self.vertices = sum(len(g["position"]) // 12 for g in geometries)
+        self.triangles = self.vertices // 3
+
+    def total(self, key="wall"):
+        """
+        The total wall ("wall") or CPU ("cpu") time of all stages, in seconds.
+        """
+        return sum(stage[key] for stage in self.stages.values())
+
+    def to_dict(self):
+        """
+        Convert the stats to a dict that can be saved as JSON.
+        """
+        return {
+            "stages": {name: dict(stage) for name, stage in self.stages.items()},
+            "features": self.features,
+            "vertices": self.vertices,
+            "triangles": self.triangles,
+            "bytes": self.bytes,
+            "wall": self.total("wall"),
+            "cpu": self.total("cpu"),
+        }
+
+    def __str__(self):
+        lines = [
+            f"TileStats(features={self.features}, vertices={self.vertices}, "
+            f"triangles={self.triangles}, bytes={self.bytes})"
+        ]
+        for name, stage in self.stages.items():
+            memory = stage["peak_memory"]
+            memory = "" if memory is None else f" {memory / 1e6:.1f} MB"
+            lines.append(
+                f"  {name}: {stage['wall']:.4f} s wall, {stage['cpu']:.4f} s cpu"
+                f"{memory}"
+            )
+        return "\n".join(lines)
+
+    def __repr__(self):
+        return self.__str__()
@@ -0,0 +1,350 @@
+import os
+from collections import deque
+import glob
+import json
+import numpy as np
+import shapely
+from shapely.strtree import STRtree
+from .BoundingVolume import BoundingVolume
+from .BoundingVolumeArray import BoundingVolumeArray
+from .CompactTileset import CompactTileset
+
+
+class TilesetIndex:
+    """
+    A spatial index over the tiles of one or more tileset JSON files. The
+    bounding volume of every tile is converted to a longitude/latitude
+    envelope and stored in an R-tree (shapely's STRtree), so the tiles that
+    intersect an area, or the leaf tiles at a point, can be found without
+    walking every tileset file.
+
+    Tiles are numbered in the order they were indexed. Tileset files are read
+    with CompactTileset, so no Tile objects are created.
+
+    Attributes
+    ----------
+    root_dir : str
+        The directory that file paths and content URIs are relative to.
+    bounds : numpy.ndarray
+        An (N, 4) array of the west, south, east, and north edges of each
+        tile, in degrees.
+    heights : numpy.ndarray
+        An (N, 2) array of the minimum and maximum height of each tile, in
+        meters.
+    geometric_error : numpy.ndarray
+        The geometric error of each tile.
+    parent : numpy.ndarray
+        The number of each tile's parent tile in the same tileset file, or -1
+        for the root tile of a file.
+    leaf : numpy.ndarray
+        True for tiles that have no children and whose content is not an
+        external tileset.
+    file_index : numpy.ndarray
+        The index in files of the tileset file that each tile is in.
+    content : numpy.ndarray
+        The index in uris of each tile's content, or -1 if it has none.
+    files : list of str
+        The tileset JSON files that were indexed, relative to root_dir.
+    uris : list of str
+        Content URIs, resolved to paths relative to root_dir.
+    """
+
+    # Arrays that are saved with save() and read with load()
+    ARRAYS = {
+        "bounds": np.float64,
+        "heights": np.float64,
+        "geometric_error": np.float64,
+        "parent": np.int32,
+        "leaf": bool,
+        "file_index": np.int32,
+        "content": np.int32,
+    }
+
+    def __init__(self, root_dir="", files=None, uris=None, **arrays):
+        """
+        Initialize a TilesetIndex from index arrays. Use from_tileset,
+        from_file, from_directory, or load to create an index.
+
+        Parameters
+        ----------
+        root_dir : str
+            The directory that file paths and content URIs are relative to.
+        files : list of str
+            The indexed tileset files.
+        uris : list of str
+            The content URIs of the tiles.
+        **arrays : numpy.ndarray
+            The index arrays listed in ARRAYS.
+        """
+        self.root_dir = root_dir
+        self.files = list(files or [])
+        self.uris = list(uris or [])
+        for name, dtype in self.ARRAYS.items():
+            shape = {"bounds": (0, 4), "heights": (0, 2)}.get(name, (0,))
+            value = arrays.pop(name, None)
+            if value is None:
+                value = np.zeros(shape, dtype=dtype)
+            setattr(
+                self, name, np.asarray(value, dtype=dtype).reshape((-1,) + shape[1:])
+            )
+        if arrays:
+            raise ValueError(f"Unknown index arrays: {list(arrays)}")
+        self.tree = STRtree(shapely.box(*self.bounds.T))
+
+    @classmethod
+    def from_tileset(cls, tileset, follow_external=True):
+        """
+        Index the tiles of a Tileset object.
+
+        Parameters
+        ----------
+        tileset : Tileset
+            The tileset to index. Its file_path, if set, is used to resolve
+            content URIs.
+        follow_external : bool
+            Whether to also index the external tileset files that tile
+            contents point to. Default is True.
+        """
+        path = getattr(tileset, "file_path", None) or "tileset.json"
+        root_dir = os.path.dirname(path)
+        return cls._from_compact(
+            [(os.path.basename(path), CompactTileset.from_tileset(tileset))],
+            root_dir,
+            follow_external,
+        )
+
+    @classmethod
+    def from_file(cls, path, follow_external=True):
+        """
+        Index the tiles of a tileset JSON file.
+
+        Parameters
+        ----------
+        path : str
+            Path to the tileset JSON file.
+        follow_external : bool
+            Whether to also index the external tileset files that tile
+            contents point to. Default is True.
+        """
+        root_dir = os.path.dirname(path)
+        compact = CompactTileset.from_file(path)
+        return cls._from_compact(
+            [(os.path.basename(path), compact)], root_dir, follow_external
+        )
+
+    @classmethod
+    def from_directory(cls, dir, pattern="**/*.json"):
+        """
+        Index the tiles of every tileset JSON file in a directory.
+
+        Parameters
+        ----------
+        dir : str
+            The directory to search.
+        pattern : str
+            A glob pattern, relative to dir, that matches the tileset files.
+            JSON files that are not tilesets are skipped. Default is all JSON
+            files in dir and its subdirectories.
+        """
+        compacts = []
+        for path in sorted(glob.glob(os.path.join(dir, pattern), recursive=True)):
+            with open(path) as f:
+                data = json.load(f)
+            if not isinstance(data, dict) or "root" not in data:
+                continue
+            compacts.append(
+                (os.path.relpath(path, dir), CompactTileset.from_json(data))
+            )
+        return cls._from_compact(compacts, dir, follow_external=False)
+
+    @classmethod
+    def _from_compact(cls, compacts, root_dir, follow_external):
+        """
+        Build an index from a list of (file, CompactTileset) pairs. When
+        follow_external is True, external tilesets are read and appended to
+        the list as they are found.
+        """
+        columns = {name: [] for name in cls.ARRAYS}
+        files = []
+        uris = []
+        uri_index = {}
+        seen = {file for file, _ in compacts}
+        offset = 0
+
+        queue = deque(compacts)
+        while queue:
+            file, compact = queue.popleft()
+            file_index = len(files)
+            files.append(file)
+            file_dir = os.path.dirname(file)
+
+            # Resolve content URIs relative to the index root
+            content = np.full(len(compact), -1, dtype=np.int32)
+            external = np.zeros(len(compact), dtype=bool)
+            for i in np.nonzero(compact.content >= 0)[0]:
+                uri = os.path.normpath(os.path.join(file_dir, compact.get_uri(i)))
+                if uri not in uri_index:
+                    uri_index[uri] = len(uris)
+                    uris.append(uri)
+                content[i] = uri_index[uri]
+                if uri.lower().endswith(".json"):
+                    external[i] = True
+                    if follow_external and uri not in seen:
+                        seen.add(uri)
+                        path = os.path.join(root_dir, uri)
+                        queue.append((uri, CompactTileset.from_file(path)))
+
+            bounds, heights = cls._region_bounds(compact)
+            parent = compact.parent.astype(np.int32)
+            parent[parent >= 0] += offset
+            columns["bounds"].append(bounds)
+            columns["heights"].append(heights)
+            columns["geometric_error"].append(compact.geometric_error)
+            columns["parent"].append(parent)
+            columns["leaf"].append((compact.num_children() == 0) & ~external)
+            columns["file_index"].append(
+                np.full(len(compact), file_index, dtype=np.int32)
+            )
+            columns["content"].append(content)
+            offset += len(compact)
+
+        arrays = {
+            name: np.concatenate(values) if values else None
+            for name, values in columns.items()
+        }
+        return cls(root_dir, files, uris, **arrays)
+
+    @staticmethod
+    def _region_bounds(compact):
+        """
+        Get the longitude/latitude envelope (in degrees) and the height range
+        of every tile in a CompactTileset.
+        """
+        bounds = np.full((len(compact), 4), np.nan)
+        heights = np.full((len(compact), 2), np.nan)
+        for bv_type in BoundingVolume.TYPES:
+            tiles, volumes = compact.bounding_volumes(bv_type)
+            if len(tiles) == 0:
+                continue
+            if bv_type != "region":
+                volumes = BoundingVolumeArray.from_volumes(
+                    volumes.to_volumes(), type="region"
+                )
+            mins, maxs = volumes.get_bounds()
+            bounds[tiles] = np.column_stack([mins[:, :2], maxs[:, :2]])
+            heights[tiles] = np.column_stack([mins[:, 2], maxs[:, 2]])
+        return bounds, heights
+
+    def __len__(self):
+        return len(self.bounds)
+
+    def __str__(self):
+        return (
+            f"TilesetIndex(tiles={len(self)}, leaves={int(self.leaf.sum())}, "
+            f"files={len(self.files)})"
+        )
+
+    def __repr__(self):
+        return self.__str__()
+
+    def query(self, geometry, leaves_only=False):
+        """
+        Find the tiles that intersect a bounding box or geometry.
+
+        Parameters
+        ----------
+        geometry : tuple or shapely.Geometry
+            A (west, south, east, north) bounding box, or a shapely geometry,
+            in longitude and latitude degrees.
+        leaves_only : bool
+            Whether to return only leaf tiles. Default is False.
+
+        Returns
+        -------
+        numpy.ndarray
+            The numbers of the matching tiles, in increasing order.
+        """
+        if not isinstance(geometry, shapely.Geometry):
+            geometry = shapely.box(*geometry)
+        tiles = np.sort(self.tree.query(geometry, predicate="intersects"))
+        if leaves_only:
+            tiles = tiles[self.leaf[tiles]]
+        return tiles
+
+    def query_uris(self, geometry, leaves_only=False):
+        """
+        Find the content URIs of the tiles that intersect a bounding box or
+        geometry. See query.
+
+        Returns
+        -------
+        list of str
+            Content paths relative to root_dir, in tile order, without
+            duplicates.
+        """
+        tiles = self.query(geometry, leaves_only)
+        content = self.content[tiles]
+        content = content[content >= 0]
+        _, first = np.unique(content, return_index=True)
+        return [self.uris[i] for i in content[np.sort(first)]]
+
+    def leaf_at(self, lon, lat):
+        """
+        Find the leaf tiles that contain a point. A point on the shared edge of
+        two tiles is in both.
+
+        Parameters
+        ----------
+        lon, lat : float
+            The point, in degrees.
+
+        Returns
+        -------
+        numpy.ndarray
+            The numbers of the leaf tiles that contain the point.
+        """
+        return self.query(shapely.Point(lon, lat), leaves_only=True)
+
+    def get_uri(self, i):
+        """
+        Get the content path of tile i relative to root_dir, or None.
+        """
+        index = self.content[i]
+        return self.uris[index] if index >= 0 else None
+
+    def get_file(self, i):
+        """
+        Get the path, relative to root_dir, of the tileset file tile i is in.
+        """
+        return self.files[self.file_index[i]]
+
+    def ancestors(self, i):
+        """
+        Get the numbers of the ancestors of tile i within its tileset file,
+        from its parent up to the root of the file.
+        """
+        ancestors = []
+        i = self.parent[i]
+        while i >= 0:
+            ancestors.append(int(i))
+            i = self.parent[i]
+        return ancestors
+
+    def save(self, path):
+        """
+        Save the index to a .npz file. The R-tree is rebuilt when the index is
+        loaded.
+        """
+        meta = {"root_dir": self.root_dir, "files": self.files, "uris": self.uris}
+        arrays = {name: getattr(self, name) for name in self.ARRAYS}
+        np.savez_compressed(path, meta=np.array(json.dumps(meta)), **arrays)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Load an index saved with save().
+        """
+        with np.load(path) as data:
+            meta = json.loads(str(data["meta"]))
+            arrays = {name: data[name] for name in cls.ARRAYS}
+        return cls(meta["root_dir"], meta["files"], meta["uris"], **arrays)
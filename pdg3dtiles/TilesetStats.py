@@ -0,0 +1,263 @@
+import os
+import json
+import numpy as np
+import pandas as pd
+import shapely
+from .Cesium3DTileset import Tileset
+from .ContentInfo import ContentInfo
+
+
+class TilesetStats:
+    """
+    Statistics about a built tileset: the number of tiles per level, the size
+    of their content, triangle and vertex counts, batch table sizes, the
+    distribution of geometric errors, and how much the bounding volumes of
+    sibling tiles overlap. Content sizes and counts are read from the content
+    file headers with ContentInfo.
+
+    Attributes
+    ----------
+    tiles : pandas.DataFrame
+        One row per tile, in depth-first order.
+    base_dir : str
+        The directory that content URIs are relative to.
+    """
+
+    # Columns of the per-tile table that are summed for each level
+    SUM_COLUMNS = [
+        "byte_length",
+        "triangles",
+        "vertices",
+        "batch_length",
+        "batch_table_bytes",
+    ]
+
+    # Other content size columns of the per-tile table
+    SIZE_COLUMNS = ["feature_table_bytes", "gltf_bytes", "tiles"]
+
+    def __init__(self, tiles, base_dir=""):
+        self.tiles = tiles
+        self.base_dir = base_dir
+
+    @classmethod
+    def from_file(cls, path, follow_external=True):
+        """
+        Compute statistics for a tileset JSON file and the content it
+        references.
+
+        Parameters
+        ----------
+        path : str
+            The path to the tileset JSON file.
+        follow_external : bool
+            Whether to include the tiles of external tilesets. Default is
+            True.
+        """
+        tileset = Tileset.from_file(path, lazy=True)
+        return cls.from_tileset(tileset, os.path.dirname(path), follow_external)
+
+    @classmethod
+    def from_tileset(cls, tileset, base_dir=None, follow_external=True):
+        """
+        Compute statistics for a Tileset object.
+
+        Parameters
+        ----------
+        tileset : Tileset
+            The tileset.
+        base_dir : str
+            The directory that content URIs are relative to. By default, the
+            directory of the tileset's file_path is used.
+        follow_external : bool
+            Whether to include the tiles of external tilesets. Default is
+            True.
+        """
+        if base_dir is None:
+            base_dir = os.path.dirname(getattr(tileset, "file_path", None) or "")
+        rows = []
+        contents = {}
+        stack = [(tileset.root, "", 0, -1)]
+        while stack:
+            tile, tile_dir, level, parent = stack.pop()
+            index = len(rows)
+            row = {
+                "level": level,
+                "parent": parent,
+                "file_dir": tile_dir,
+                "uri": None,
+                "format": None,
+                "exists": None,
+                "geometric_error": tile.geometricError,
+                "bv_type": tile.boundingVolume.JSON_KEY,
+                "children": len(tile.children or []),
+                "overlap": np.nan,
+            }
+            children = [(child, tile_dir) for child in reversed(tile.children or [])]
+            uri = tile.content.uri if tile.content else None
+            if uri:
+                path = os.path.normpath(os.path.join(tile_dir, uri))
+                info = contents.get(path)
+                if info is None:
+                    info = ContentInfo.from_file(os.path.join(base_dir, path))
+                    contents[path] = info
+                row["uri"] = path
+                row.update(info.to_dict())
+                if follow_external and info.format == "json":
+                    external = tile.get_external_tileset(
+                        os.path.join(base_dir, tile_dir)
+                    )
+                    children.append((external.root, os.path.dirname(path)))
+                    row["children"] += 1
+            row["overlap"] = cls.overlap_ratio(tile.children or [])
+            rows.append(row)
+            for child, child_dir in children:
+                stack.append((child, child_dir, level + 1, index))
+
+        tiles = pd.DataFrame(rows)
+        for column in cls.SUM_COLUMNS + cls.SIZE_COLUMNS:
+            if column not in tiles:
+                tiles[column] = 0
+            tiles[column] = tiles[column].fillna(0).astype(np.int64)
+        parent_error = tiles["geometric_error"].reindex(tiles["parent"]).to_numpy()
+        tiles["error_ratio"] = tiles["geometric_error"] / parent_error
+        return cls(tiles, base_dir)
+
+    @staticmethod
+    def overlap_ratio(tiles):
+        """
+        Measure how much the bounding volumes of sibling tiles overlap, as the
+        share of their total area (in longitude and latitude) that is covered
+        by more than one of them. 0 means that no two siblings overlap.
+
+        Parameters
+        ----------
+        tiles : list of Tile
+            The sibling tiles.
+
+        Returns
+        -------
+        float
+            The overlap ratio, or NaN if there are fewer than 2 tiles.
+        """
+        if len(tiles) < 2:
+            return np.nan
+        bounds = np.array(
+            [tile.boundingVolume.convert("region").to_array()[:4] for tile in tiles]
+        )
+        boxes = shapely.box(*np.rad2deg(bounds).T)
+        total = shapely.area(boxes).sum()
+        if total == 0:
+            return np.nan
+        return float(1 - shapely.union_all(boxes).area / total)
+
+    def levels(self):
+        """
+        Summarize the tiles at each level of the tree.
+
+        Returns
+        -------
+        pandas.DataFrame
+            One row per level, with the number of tiles and tiles with
+            content, totals and maximums of the content sizes and counts,
+            the range of geometric errors, and the mean sibling overlap.
+        """
+        tiles = self.tiles
+        grouped = tiles.groupby("level")
+        levels = pd.DataFrame({"tiles": grouped.size()})
+        levels["contents"] = grouped["uri"].count()
+        for column in self.SUM_COLUMNS:
+            levels[column] = grouped[column].sum()
+        levels["max_byte_length"] = grouped["byte_length"].max()
+        levels["max_triangles"] = grouped["triangles"].max()
+        levels["min_geometric_error"] = grouped["geometric_error"].min()
+        levels["max_geometric_error"] = grouped["geometric_error"].max()
+        levels["mean_overlap"] = grouped["overlap"].mean()
+        return levels.reset_index()
+
+    def largest(self, column="byte_length", n=10):
+        """
+        Get the n tiles with the largest value of a column, e.g. the tiles
+        with the biggest content or the most triangles.
+        """
+        return self.tiles.nlargest(n, column)
+
+    def problems(self):
+        """
+        Find tiles that are likely to make a tileset slow to load.
+
+        Returns
+        -------
+        dict
+            Lists of tile numbers (rows of tiles) for: content files that are
+            missing, tiles with a larger geometric error than their parent,
+            and tiles whose children overlap by more than half.
+        """
+        tiles = self.tiles
+        return {
+            "missing_content": tiles.index[tiles["exists"].eq(False)].tolist(),
+            "error_increasing": tiles.index[tiles["error_ratio"] > 1].tolist(),
+            "overlapping_children": tiles.index[tiles["overlap"] > 0.5].tolist(),
+        }
+
+    def to_dict(self, n=10):
+        """
+        Summarize the statistics as a dict that can be saved as JSON.
+
+        Parameters
+        ----------
+        n : int
+            The number of largest tiles to list. Default is 10.
+        """
+        tiles = self.tiles
+        errors = tiles["geometric_error"]
+        quantiles = [0, 0.25, 0.5, 0.75, 1]
+        largest_columns = ["level", "uri", "byte_length", "triangles"]
+        summary = {
+            "tiles": len(tiles),
+            "contents": int(tiles["uri"].count()),
+            "depth": int(tiles["level"].max()) + 1 if len(tiles) else 0,
+        }
+        for column in self.SUM_COLUMNS:
+            summary[column] = int(tiles[column].sum())
+        return {
+            "summary": summary,
+            "geometric_error": {
+                str(q): float(errors.quantile(q)) for q in quantiles if len(errors)
+            },
+            "levels": _records(self.levels()),
+            "largest_content": _records(
+                self.largest("byte_length", n)[largest_columns]
+            ),
+            "most_triangles": _records(self.largest("triangles", n)[largest_columns]),
+            "problems": self.problems(),
+        }
+
+    def to_json(self, path, n=10):
+        """
+        Write the summary from to_dict to a JSON file.
+        """
+        with open(path, "w") as f:
+            json.dump(self.to_dict(n), f, indent=2)
+
+    def to_csv(self, path, table="tiles"):
+        """
+        Write the per-tile table, or the per-level table, to a CSV file.
+
+        Parameters
+        ----------
+        path : str
+            The path to the CSV file.
+        table : "tiles" or "levels"
+            Which table to write. Default is "tiles".
+        """
+        if table == "tiles":
+            self.tiles.to_csv(path, index_label="tile")
+        elif table == "levels":
+            self.levels().to_csv(path, index=False)
+        else:
+            raise ValueError(f"table must be 'tiles' or 'levels', but is {table}")
+
+
+def _records(df):
+    # Convert a DataFrame to a list of dicts of plain Python values
+    return json.loads(df.to_json(orient="records"))
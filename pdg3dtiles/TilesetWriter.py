@@ -0,0 +1,442 @@
+import io
+import os
+import json
+import numpy as np
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class TilesetWriter:
+    """
+    Write Tileset and Tile objects to JSON one tile at a time. Each tile is
+    serialized and written as soon as it is reached, so the dict for the
+    whole tree is never built in memory. Bounding volume values and geometric
+    errors can optionally be rounded to reduce the size of the output.
+
+    Attributes
+    ----------
+    precision : int or None
+        The number of decimal places to keep for values in meters: box and
+        sphere values, region heights, and geometric errors. If None, values
+        are written with full precision.
+    radian_precision : int or None
+        The number of decimal places to keep for region longitudes and
+        latitudes, which are in radians. If None, and precision is set, then
+        precision + 7 is used, which keeps about the same resolution as
+        precision does for values in meters (one meter on the ground is
+        about 1.6e-7 radians).
+    backend : "json" or "orjson"
+        The JSON library used to serialize each tile.
+    indent : int or None
+        The number of spaces to indent each level of the JSON by. If None,
+        the JSON is minified.
+    """
+
+    # The JSON backends that can be used, in order of preference for "auto"
+    BACKENDS = ["orjson", "json"]
+
+    # Keys of Tile and Content objects that hold bounding volumes
+    BV_KEYS = ["boundingVolume", "viewerRequestVolume"]
+
+    # Keys of a tile that are kept when its subtree is moved to an external
+    # tileset. The transform stays on this tile, and is removed from the root
+    # of the external tileset, so that it is only applied once.
+    STUB_KEYS = ["boundingVolume", "geometricError", "refine", "transform"]
+
+    def __init__(
+        self, precision=None, radian_precision=None, backend="json", indent=None
+    ):
+        """
+        Initialize a TilesetWriter.
+
+        Parameters
+        ----------
+        precision : int or None
+            The number of decimal places to keep for values in meters. If None
+            (default), values are not rounded.
+        radian_precision : int or None
+            The number of decimal places to keep for region longitudes and
+            latitudes. If None (default), precision + 7 is used.
+        backend : "json" or "orjson" or "auto"
+            The JSON library to use. "json" (default) uses the standard library
+            and gives the same output as Base.to_file. "orjson" is faster but
+            must be installed. "auto" uses orjson when it is installed, and
+            json otherwise. Indented JSON is always written with json.
+        indent : int or None
+            If set, indent the JSON by this many spaces, with the same layout
+            as json.dump with indent and separators=(",", ": "). If None
+            (default), the JSON is minified.
+        """
+        if radian_precision is None and precision is not None:
+            radian_precision = precision + 7
+        self.precision = precision
+        self.radian_precision = radian_precision
+        self.backend = self.get_backend(backend)
+        self.indent = indent
+        # Maps id(tile) to the URI of the external tileset the tile is moved
+        # to, while writing a sharded tileset
+        self._cuts = {}
+
+    @classmethod
+    def get_backend(cls, backend):
+        """
+        Resolve the name of a JSON backend, checking that it is installed.
+        """
+        if backend == "auto":
+            return "orjson" if orjson is not None else "json"
+        if backend not in cls.BACKENDS:
+            raise ValueError(
+                f"backend must be one of {cls.BACKENDS + ['auto']}, but is {backend}"
+            )
+        if backend == "orjson" and orjson is None:
+            raise ValueError("The orjson backend was requested but is not installed")
+        return backend
+
+    def write(self, obj, path_or_file):
+        """
+        Write a Tileset or Tile to a JSON file.
+
+        Parameters
+        ----------
+        obj : Tileset or Tile
+            The object to write.
+        path_or_file : str or file-like
+            A path to write to, or an open file or buffer. Text and binary
+            files are both supported.
+        """
+        if isinstance(path_or_file, (str, bytes)) or hasattr(
+            path_or_file, "__fspath__"
+        ):
+            with open(path_or_file, "wb") as f:
+                self._write_to(obj, f)
+        else:
+            self._write_to(obj, path_or_file)
+
+    def write_sharded(
+        self, tileset, path, max_bytes=None, max_nodes=None, max_depth=None, indent=None
+    ):
+        """
+        Write a Tileset to a JSON file, moving subtrees into external tileset
+        files so that no file is larger than the given budgets. Each subtree
+        that is moved is replaced by a tile with the same bounding volume,
+        geometric error, and refinement, whose content points to the new
+        file. The new files are written next to path, as <name>_<n>.json.
+
+        Parameters
+        ----------
+        tileset : Tileset
+            The tileset to write.
+        path : str
+            The path of the root tileset JSON file.
+        max_bytes : int
+            The largest size, in bytes, of the minified JSON of each file
+            (optional). A file can only be larger when a single tile and the
+            stubs of its children are larger than this.
+        max_nodes : int
+            The largest number of tiles in each file, counting the tiles that
+            point to external tilesets (optional). A file can only have more
+            tiles when a single tile and the stubs of its children are more.
+        max_depth : int
+            The largest number of levels of tiles with content below the root
+            of each file (optional). The tiles that point to external
+            tilesets can be one level deeper.
+        indent : int
+            If set, indent the JSON by this many spaces instead of minifying
+            it. The budgets are still measured on minified JSON.
+
+        Returns
+        -------
+        list of str
+            The paths of the files that were written, starting with path.
+        """
+        cuts = self.plan_shards(tileset.root, max_bytes, max_nodes, max_depth)
+        stem = os.path.splitext(os.path.basename(path))[0]
+        directory = os.path.dirname(path)
+        self._cuts = {id(tile): f"{stem}_{i}.json" for i, tile in enumerate(cuts)}
+        try:
+            paths = [path]
+            self._write_file(tileset, path, indent)
+            fields = tileset.to_dict(exclude=["root"])
+            for tile in cuts:
+                sub_path = os.path.join(directory, self._cuts[id(tile)])
+                sub_fields = dict(fields, geometricError=tile.geometricError)
+                self._write_file((tileset, sub_fields, tile), sub_path, indent)
+                paths.append(sub_path)
+        finally:
+            self._cuts = {}
+        return paths
+
+    def plan_shards(self, root, max_bytes=None, max_nodes=None, max_depth=None):
+        """
+        Choose the subtrees of a tile tree to move into external tilesets.
+        Subtrees that are deeper than max_depth below the root of their file
+        are moved first. Then, from the leaves up, when a tile's subtree is
+        over max_bytes or max_nodes, its largest children are moved until it
+        fits.
+
+        Returns
+        -------
+        list of Tile
+            The roots of the subtrees to move, in depth-first order.
+        """
+        # List the tiles in depth-first order, with their parents
+        tiles = []
+        parents = []
+        stack = [(root, -1)]
+        while stack:
+            tile, parent = stack.pop()
+            parents.append(parent)
+            tiles.append(tile)
+            index = len(tiles) - 1
+            for child in reversed(tile.children or []):
+                stack.append((child, index))
+
+        n = len(tiles)
+        cut = [False] * n
+        if max_depth is not None:
+            depth = [0] * n
+            for i in range(1, n):
+                parent = parents[i]
+                if depth[parent] >= max_depth:
+                    cut[i] = True
+                else:
+                    depth[i] = depth[parent] + 1
+
+        if max_bytes is not None or max_nodes is not None:
+            nodes = [1] * n
+            sizes = [0] * n
+            if max_bytes is not None:
+                sizes = [len(self._encode_tile(tile)) for tile in tiles]
+            children = [[] for _ in range(n)]
+            for i in range(1, n):
+                children[parents[i]].append(i)
+            for i in reversed(range(n)):
+                kept = [c for c in children[i] if not cut[c]]
+                for c in children[i]:
+                    # A moved child is replaced by a stub tile
+                    if cut[c]:
+                        nodes[i] += 1
+                        sizes[i] += len(self._encode_stub(tiles[c])) + 1
+                    else:
+                        nodes[i] += nodes[c]
+                        sizes[i] += sizes[c] + 1
+                while kept and (
+                    (max_nodes is not None and nodes[i] > max_nodes)
+                    or (max_bytes is not None and sizes[i] > max_bytes)
+                ):
+                    if max_nodes is not None and nodes[i] > max_nodes:
+                        c = max(kept, key=lambda c: nodes[c])
+                    else:
+                        c = max(kept, key=lambda c: sizes[c])
+                    kept.remove(c)
+                    cut[c] = True
+                    nodes[i] -= nodes[c] - 1
+                    sizes[i] -= sizes[c] - len(self._encode_stub(tiles[c]))
+
+        return [tile for tile, is_cut in zip(tiles, cut) if is_cut]
+
+    def _encode_tile(self, tile):
+        return self.encode(self.round_node(tile.to_dict(exclude=["children"])))
+
+    def _stub(self, tile):
+        """
+        The tile that replaces a subtree that was moved to an external tileset.
+        """
+        fields = tile.to_dict(exclude=["children"])
+        stub = {key: fields[key] for key in self.STUB_KEYS if key in fields}
+        stub["content"] = {"uri": self._cuts.get(id(tile), "")}
+        return self.round_node(stub)
+
+    def _encode_stub(self, tile):
+        return self.encode(self._stub(tile))
+
+    def _write_file(self, obj, path, indent):
+        saved, self.indent = self.indent, indent
+        try:
+            with open(path, "wb") as f:
+                self._write_to(obj, f)
+        finally:
+            self.indent = saved
+
+    def dumps(self, obj):
+        """
+        Serialize a Tileset or Tile to a JSON string.
+        """
+        buffer = io.StringIO()
+        self._write_to(obj, buffer)
+        return buffer.getvalue()
+
+    def to_dict(self, obj):
+        """
+        Convert a Tileset or Tile to a dict, with values rounded to this
+        writer's precision. Use this when the whole dict is needed anyway.
+        """
+        d = obj.to_dict()
+        self.round_tree(d)
+        return d
+
+    def round_tree(self, d):
+        """
+        Round the bounding volumes and geometric errors in a dict created
+        from a Tileset or Tile, and all of its descendant tiles, in place.
+        """
+        stack = [d]
+        while stack:
+            node = stack.pop()
+            self.round_node(node)
+            if isinstance(node.get("root"), dict):
+                stack.append(node["root"])
+            stack.extend(node.get("children") or [])
+        return d
+
+    def round_node(self, d):
+        """
+        Round the bounding volumes and geometric error of a single dict
+        created from a Tileset or Tile, in place. Children are not rounded.
+        """
+        if self.precision is None and self.radian_precision is None:
+            return d
+        if self.precision is not None and "geometricError" in d:
+            d["geometricError"] = round(d["geometricError"], self.precision)
+        for key in self.BV_KEYS:
+            if key in d:
+                d[key] = self.round_bounding_volume(d[key])
+        content = d.get("content")
+        if isinstance(content, dict) and "boundingVolume" in content:
+            content["boundingVolume"] = self.round_bounding_volume(
+                content["boundingVolume"]
+            )
+        return d
+
+    def round_bounding_volume(self, bv):
+        """
+        Round the values of a bounding volume dict, e.g. {'box': [...]}.
+        """
+        rounded = {}
+        for key, values in bv.items():
+            if key == "region":
+                values = self._round(values[0:4], self.radian_precision) + self._round(
+                    values[4:6], self.precision
+                )
+            elif key in ("box", "sphere"):
+                values = self._round(values, self.precision)
+            rounded[key] = values
+        return rounded
+
+    @staticmethod
+    def _round(values, precision):
+        if precision is None:
+            return list(values)
+        return [round(float(v), precision) for v in values]
+
+    def encode(self, value):
+        """
+        Serialize a small value (e.g. a tile without its children) to bytes.
+        """
+        if self.backend == "orjson":
+            return orjson.dumps(
+                value, default=self._default, option=orjson.OPT_SERIALIZE_NUMPY
+            )
+        return json.dumps(value, separators=(",", ":"), default=self._default).encode(
+            "utf-8"
+        )
+
+    def _encode_value(self, value, level):
+        # Serialize a value written at a given depth of the output, indented
+        # to that depth when this writer indents
+        if self.indent is None:
+            return self.encode(value)
+        text = json.dumps(
+            value, indent=self.indent, separators=(",", ": "), default=self._default
+        )
+        return text.replace("\n", "\n" + " " * (self.indent * level)).encode("utf-8")
+
+    def _newline(self, level):
+        # The line break and indentation before an item at a given depth
+        if self.indent is None:
+            return b""
+        return b"\n" + b" " * (self.indent * level)
+
+    @staticmethod
+    def _default(value):
+        # Convert numpy values that the JSON libraries can't serialize
+        if isinstance(value, np.generic):
+            return value.item()
+        if isinstance(value, np.ndarray):
+            return value.tolist()
+        raise TypeError(f"Object of type {type(value)} is not JSON serializable")
+
+    def _write_to(self, obj, f):
+        if isinstance(f, io.TextIOBase):
+
+            def write(data):
+                f.write(data.decode("utf-8"))
+
+        else:
+            write = f.write
+        if isinstance(obj, tuple):
+            # A subtree written as an external tileset: (tileset, fields, tile)
+            tileset, fields, tile = obj
+            fields = self.round_node(dict(fields))
+            self._write_object(tileset, fields, {"root": tile}, write)
+        elif hasattr(obj, "root"):
+            self._write_tileset(obj, write)
+        elif hasattr(obj, "children"):
+            self._write_tile(obj, write)
+        else:
+            write(self._encode_value(self.round_node(obj.to_dict()), 0))
+
+    def _write_tileset(self, tileset, write):
+        fields = tileset.to_dict(exclude=["root"])
+        self.round_node(fields)
+        self._write_object(tileset, fields, {"root": tileset.root}, write)
+
+    def _write_tile(self, tile, write, is_root=False, level=0):
+        fields = tile.to_dict(exclude=["children"])
+        if is_root and id(tile) in self._cuts:
+            fields.pop("transform", None)
+        self.round_node(fields)
+        nested = {}
+        if tile.children is not None:
+            nested["children"] = tile.children
+        self._write_object(tile, fields, nested, write, level)
+
+    def _write_object(self, obj, fields, nested, write, level=0):
+        """
+        Write the fields of an object in the order of its attributes, writing
+        nested tiles in place. level is the depth of the object in the output,
+        used to indent it.
+        """
+        colon = b":" if self.indent is None else b": "
+        write(b"{")
+        first = True
+        for key in obj.__dict__:
+            if key not in fields and key not in nested:
+                continue
+            if not first:
+                write(b",")
+            first = False
+            write(self._newline(level + 1) + self.encode(key) + colon)
+            if key == "root":
+                self._write_tile(nested[key], write, is_root=True, level=level + 1)
+            elif key == "children":
+                write(b"[")
+                for i, child in enumerate(nested[key]):
+                    if i > 0:
+                        write(b",")
+                    write(self._newline(level + 2))
+                    if id(child) in self._cuts:
+                        write(self._encode_value(self._stub(child), level + 2))
+                    else:
+                        self._write_tile(child, write, level=level + 2)
+                if nested[key]:
+                    write(self._newline(level + 1))
+                write(b"]")
+            else:
+                write(self._encode_value(fields[key], level + 1))
+        if not first:
+            write(self._newline(level))
+        write(b"}")
@@ -0,0 +1,380 @@
+import os
+import numpy as np
+from .BoundingVolume import BoundingVolumeSphere, geodetic_to_ecef
+from .Cesium3DTileset import Tileset
+from .ContentInfo import ContentInfo
+
+
+class Camera:
+    """
+    A perspective camera in earth-centered, earth-fixed coordinates
+    (EPSG:4978), used to simulate how a tileset is viewed.
+
+    Attributes
+    ----------
+    position : numpy.ndarray
+        The position of the camera.
+    direction : numpy.ndarray
+        The unit vector the camera looks along.
+    up : numpy.ndarray
+        The unit vector that points to the top of the screen.
+    fovy : float
+        The vertical field of view, in degrees.
+    screen_height : int
+        The height of the screen, in pixels.
+    aspect : float
+        The width of the screen divided by its height.
+    near, far : float
+        The distances to the near and far planes of the view frustum, in
+        meters.
+    """
+
+    def __init__(
+        self,
+        position,
+        direction,
+        up,
+        fovy=60,
+        screen_height=1080,
+        aspect=16 / 9,
+        near=1.0,
+        far=5e8,
+    ):
+        direction = np.asarray(direction, dtype=float)
+        direction = direction / np.linalg.norm(direction)
+        up = np.asarray(up, dtype=float)
+        # Make the up vector perpendicular to the direction
+        up = up - up.dot(direction) * direction
+        if np.linalg.norm(up) == 0:
+            raise ValueError("up must not be parallel to direction")
+        self.position = np.asarray(position, dtype=float)
+        self.direction = direction
+        self.up = up / np.linalg.norm(up)
+        self.fovy = fovy
+        self.screen_height = screen_height
+        self.aspect = aspect
+        self.near = near
+        self.far = far
+
+    @classmethod
+    def from_geodetic(cls, lon, lat, height, heading=0, pitch=-90, **kwargs):
+        """
+        Create a camera from a geodetic position and an orientation, the way
+        a Cesium camera is usually set.
+
+        Parameters
+        ----------
+        lon, lat : float
+            The position of the camera, in degrees.
+        height : float
+            The height of the camera above the ellipsoid, in meters.
+        heading : float
+            The compass direction the camera faces, in degrees clockwise from
+            north. Default is 0.
+        pitch : float
+            The angle of the camera above the horizon, in degrees. Default is
+            -90 (looking straight down).
+        **kwargs
+            Other Camera parameters, e.g. fovy or screen_height.
+        """
+        lon, lat = np.radians(lon), np.radians(lat)
+        heading, pitch = np.radians(heading), np.radians(pitch)
+        east = np.array([-np.sin(lon), np.cos(lon), 0])
+        north = np.array(
+            [-np.sin(lat) * np.cos(lon), -np.sin(lat) * np.sin(lon), np.cos(lat)]
+        )
+        normal = np.array(
+            [np.cos(lat) * np.cos(lon), np.cos(lat) * np.sin(lon), np.sin(lat)]
+        )
+        forward = np.sin(heading) * east + np.cos(heading) * north
+        direction = np.cos(pitch) * forward + np.sin(pitch) * normal
+        right = np.cos(heading) * east - np.sin(heading) * north
+        up = np.cross(right, direction)
+        position = geodetic_to_ecef(lon, lat, height)
+        return cls(position, direction, up, **kwargs)
+
+    @classmethod
+    def look_at(cls, position, target, up=None, **kwargs):
+        """
+        Create a camera at a position that looks at a target point.
+
+        Parameters
+        ----------
+        position, target : array-like
+            Points in EPSG:4978.
+        up : array-like
+            The approximate up direction of the screen (optional). By default,
+            the direction away from the center of the earth is used.
+        """
+        position = np.asarray(position, dtype=float)
+        direction = np.asarray(target, dtype=float) - position
+        if up is None:
+            up = position
+        return cls(position, direction, up, **kwargs)
+
+    def get_planes(self):
+        """
+        Get the six planes of the view frustum.
+
+        Returns
+        -------
+        numpy.ndarray
+            A (6, 4) array of planes (a, b, c, d) with normals that point into
+            the frustum, so that a point p is inside when
+            a * x + b * y + c * z + d >= 0 for every plane.
+        """
+        d, up, p = self.direction, self.up, self.position
+        right = np.cross(d, up)
+        half_y = np.radians(self.fovy) / 2
+        half_x = np.arctan(np.tan(half_y) * self.aspect)
+        normals = np.array(
+            [
+                np.cos(half_x) * right + np.sin(half_x) * d,
+                -np.cos(half_x) * right + np.sin(half_x) * d,
+                np.cos(half_y) * up + np.sin(half_y) * d,
+                -np.cos(half_y) * up + np.sin(half_y) * d,
+            ]
+        )
+        planes = np.column_stack([normals, -normals.dot(p)])
+        near = np.append(d, -d.dot(p + self.near * d))
+        far = np.append(-d, d.dot(p + self.far * d))
+        return np.vstack([planes, near, far])
+
+    def get_sse_denominator(self):
+        """
+        Get the factor that converts distance to screen space error for this
+        camera's field of view.
+        """
+        return 2 * np.tan(np.radians(self.fovy) / 2)
+
+
+class TraversalSimulator:
+    """
+    Simulate which tiles of a tileset CesiumJS would request and render from
+    a camera. Tiles are selected with the same screen space error (SSE) rule
+    that CesiumJS uses: a tile is refined when its geometric error, projected
+    onto the screen, is more than maximum_sse pixels. Tiles outside of the
+    view frustum are culled. The sizes and triangle counts of the selected
+    content are read from the content file headers.
+
+    This follows the base CesiumJS traversal, without skipping levels of
+    detail, and assumes that the content of every selected tile has loaded.
+
+    Attributes
+    ----------
+    tileset : Tileset
+        The tileset to traverse.
+    base_dir : str
+        The directory that the tileset's content URIs are relative to.
+    maximum_sse : float
+        The maximum screen space error, in pixels. Default is 16, the CesiumJS
+        default.
+    """
+
+    def __init__(self, tileset, maximum_sse=16, base_dir=None):
+        """
+        Parameters
+        ----------
+        tileset : Tileset or str
+            A Tileset, or the path to a tileset JSON file. Files are read
+            lazily, so only the tiles that are reached are loaded.
+        maximum_sse : float
+            The maximum screen space error, in pixels.
+        base_dir : str
+            The directory that content URIs are relative to. By default, the
+            directory of the tileset file is used.
+        """
+        if isinstance(tileset, str):
+            tileset = Tileset.from_file(tileset, lazy=True)
+        if base_dir is None:
+            base_dir = os.path.dirname(getattr(tileset, "file_path", None) or "")
+        self.tileset = tileset
+        self.base_dir = base_dir
+        self.maximum_sse = maximum_sse
+        self._volumes = {}
+        self._contents = {}
+
+    def simulate(self, camera):
+        """
+        Select the tiles to request and render from one camera.
+
+        Parameters
+        ----------
+        camera : Camera
+            The camera to view the tileset from.
+
+        Returns
+        -------
+        dict
+            A dict with the content URIs that would be requested (including
+            external tileset JSON files) and rendered, their number, the
+            total bytes requested, the triangles rendered, and the number of
+            tiles that were visited and culled. URIs are relative to base_dir.
+        """
+        planes = camera.get_planes()
+        factor = camera.screen_height / camera.get_sse_denominator()
+        result = {
+            "requested": [],
+            "rendered": [],
+            "requests": 0,
+            "rendered_tiles": 0,
+            "bytes": 0,
+            "triangles": 0,
+            "visited": 0,
+            "culled": 0,
+        }
+
+        root = self.tileset.root
+        # The tileset is not shown at all if its own geometric error is small
+        # enough on screen
+        root_distance = self._distance(root.boundingVolume, camera.position)
+        if self._sse(self.tileset.geometricError, root_distance, factor) <= (
+            self.maximum_sse
+        ):
+            return result
+
+        stack = [(root, "", "ADD")]
+        while stack:
+            tile, tile_dir, parent_refine = stack.pop()
+            result["visited"] += 1
+            if not self._visible(tile.boundingVolume, planes):
+                result["culled"] += 1
+                continue
+            if tile.viewerRequestVolume is not None and not self._contains(
+                tile.viewerRequestVolume, camera.position
+            ):
+                result["culled"] += 1
+                continue
+
+            # Refine is only written to JSON when it is not ADD, so ADD means
+            # that the tile inherits its parent's refinement
+            refine = parent_refine if tile.refine == "ADD" else tile.refine
+
+            uri = tile.content.uri if tile.content else None
+            children = [(child, tile_dir) for child in tile.children or []]
+            if uri and uri.lower().endswith(".json"):
+                # External tilesets are always loaded and traversed
+                path = os.path.normpath(os.path.join(tile_dir, uri))
+                self._request(path, result)
+                external = tile.get_external_tileset(
+                    os.path.join(self.base_dir, tile_dir)
+                )
+                external_dir = os.path.dirname(path)
+                children = [(external.root, external_dir)] + children
+                uri = None
+
+            distance = self._distance(tile.boundingVolume, camera.position)
+            refined = bool(children) and (
+                self._sse(tile.geometricError, distance, factor) > self.maximum_sse
+            )
+
+            if uri and (refine == "ADD" or not refined):
+                content_bv = tile.content.boundingVolume
+                if content_bv is None or self._visible(content_bv, planes):
+                    path = os.path.normpath(os.path.join(tile_dir, uri))
+                    info = self._request(path, result)
+                    result["rendered"].append(path)
+                    result["rendered_tiles"] += 1
+                    result["triangles"] += info.triangles
+
+            if refined:
+                for child, child_dir in reversed(children):
+                    stack.append((child, child_dir, refine))
+
+        return result
+
+    def simulate_path(self, cameras):
+        """
+        Simulate a flight along a list of camera positions. Content that was
+        requested for an earlier view is assumed to be cached, so it is not
+        requested again.
+
+        Parameters
+        ----------
+        cameras : list of Camera
+            The cameras, in the order they are visited.
+
+        Returns
+        -------
+        dict
+            A dict with a "views" list, holding the result of simulate for
+            each camera plus the number of new requests and new bytes, and a
+            "total" dict with the number of unique requests, the total bytes
+            requested, and the most triangles rendered in one view.
+        """
+        seen = set()
+        views = []
+        total = {"requests": 0, "bytes": 0, "max_triangles": 0, "max_requests": 0}
+        for camera in cameras:
+            view = self.simulate(camera)
+            new = [path for path in view["requested"] if path not in seen]
+            seen.update(new)
+            view["new_requests"] = len(new)
+            view["new_bytes"] = sum(self._get_content(p).byte_length for p in new)
+            views.append(view)
+            total["requests"] += view["new_requests"]
+            total["bytes"] += view["new_bytes"]
+            total["max_triangles"] = max(total["max_triangles"], view["triangles"])
+            total["max_requests"] = max(total["max_requests"], view["requests"])
+        return {"views": views, "total": total}
+
+    @staticmethod
+    def _sse(geometric_error, distance, factor):
+        # The projected size of the geometric error, in pixels
+        return geometric_error * factor / max(distance, 1e-7)
+
+    def _request(self, path, result):
+        info = self._get_content(path)
+        result["requested"].append(path)
+        result["requests"] += 1
+        result["bytes"] += info.byte_length
+        return info
+
+    def _get_content(self, path):
+        info = self._contents.get(path)
+        if info is None:
+            info = ContentInfo.from_file(os.path.join(self.base_dir, path))
+            self._contents[path] = info
+        return info
+
+    def _get_volume(self, bv):
+        """
+        Get a bounding volume as a sphere (center, radius) or as an oriented
+        box (center, unit axes, half lengths), computed once per volume.
+        """
+        key = id(bv)
+        cached = self._volumes.get(key)
+        if cached is not None and cached[0] is bv:
+            return cached[1]
+        if isinstance(bv, BoundingVolumeSphere):
+            volume = ("sphere", np.array(bv.center, dtype=float), float(bv.radius))
+        else:
+            box = bv.to_box()
+            axes = np.array([box.xAxis, box.yAxis, box.zAxis], dtype=float)
+            # The rows of vt are unit vectors along the box axes, and the
+            # singular values are the half lengths. This also gives a
+            # direction to the zero-length axis of a flat box.
+            _, lengths, units = np.linalg.svd(axes)
+            volume = ("box", np.array(box.center, dtype=float), units, lengths)
+        self._volumes[key] = (bv, volume)
+        return volume
+
+    def _visible(self, bv, planes):
+        volume = self._get_volume(bv)
+        distances = planes[:, 0:3].dot(volume[1]) + planes[:, 3]
+        if volume[0] == "sphere":
+            radius = volume[2]
+        else:
+            radius = np.abs(planes[:, 0:3].dot(volume[2].T)).dot(volume[3])
+        return bool(np.all(distances >= -radius))
+
+    def _distance(self, bv, point):
+        volume = self._get_volume(bv)
+        offset = point - volume[1]
+        if volume[0] == "sphere":
+            return max(np.linalg.norm(offset) - volume[2], 0.0)
+        excess = np.maximum(np.abs(volume[2].dot(offset)) - volume[3], 0)
+        return float(np.linalg.norm(excess))
+
+    def _contains(self, bv, point):
+        return self._distance(bv, point) == 0
@@ -1,7 +1,17 @@
 import os
+import copy
+import glob
+import json
+import hashlib
+from contextlib import nullcontext
 from .BoundingVolume import BoundingVolume
+from .BoundingVolumeArray import BoundingVolumeArray
+from .BatchedModel import BatchedModel
+from .Composite import Composite
 from .Cesium3DTile import Cesium3DTile
-from .Cesium3DTileset import Tileset, Asset, Content
+from .Cesium3DTileset import Tileset, Tile, Asset, Content
+from .ContentInfo import ContentInfo
+from .WriteBehindQueue import WriteBehindQueue
 
 
 def leaf_tile_from_gdf(
@@ -14,6 +24,11 @@ def leaf_tile_from_gdf(
     tilesetVersion=None,
     boundingVolume=None,
     minify_json=True,
+    boundingVolumeType="box",
+    composite_by=None,
+    metrics=None,
+    writer=None,
+    content_addressed=False,
 ):
     """
     Create a leaf tile in a Cesium 3D tileset tree. Convert a GeoDataFrame of
@@ -48,58 +63,487 @@ def leaf_tile_from_gdf(
         either case.
     minify_json : bool
         Whether to minify the JSON file. Default is True.
+    boundingVolumeType : "box" or "region" or "sphere" or "tightest"
+        The type of bounding volume to calculate for the tile content. If
+        "tightest", a box, a region, and a sphere are calculated, and the one
+        with the smallest volume is used. Default is "box".
+    composite_by : str or list of str
+        The column(s) of the GeoDataFrame to split the polygons by (optional).
+        If set, one B3DM is created for each class of polygons, and they are
+        packed into one composite content, saved as <filename>.cmpt, so that
+        they are still loaded with one request.
+    metrics : Metrics
+        A Metrics object to report the tile, its features, the bytes written,
+        the time of each stage, and errors to (optional).
+    writer : WriteBehindQueue
+        A queue to write the files with in the background (optional). The
+        function then returns before the files are written, so flush the
+        writer before the tile is added to a parent tile.
+    content_addressed : bool
+        Whether to name the content file by the SHA-256 hash of its bytes,
+        instead of by filename. Default is False. The content is not written
+        again when a file with its hash already exists, so identical contents
+        are stored once, and a content file never changes once written, so it
+        can be cached as immutable. The JSON is still saved as
+        <filename>.json, with the hashed name as the content URI. The UUIDs
+        of the features are derived from the features, so that rebuilding the
+        same features gives the same bytes.
 
     Returns
     -------
-    tile, tileset : Cesium3DTile, Tileset
-        The Cesium3DTiles and Cesium3DTileset objects
+    tile, tileset : Cesium3DTile or Composite, Tileset
+        The Cesium3DTiles (or the Composite, when composite_by is set) and
+        Cesium3DTileset objects
     """
-    tile = Cesium3DTile()
-    tile.save_to = dir
-    tile.save_as = filename
-    tile.from_geodataframe(gdf, crs=crs, z=z)
-    gdf = tile.geodataframe
-    tile_bounding_volume = BoundingVolume.from_gdf(gdf)
-    tile.get_filename()
+    write = _file_writer(writer, metrics, "leaf", direct=content_addressed)
+    with _measure(metrics, "leaf"):
+        if composite_by is not None:
+            tiles = []
+            for _, group in gdf.groupby(composite_by, sort=True, dropna=False):
+                tile = Cesium3DTile()
+                tile.bounding_volume_type = boundingVolumeType
+                tile.batch_table_uuid_deterministic = content_addressed
+                tile.from_geodataframe(group.copy(), crs=crs, z=z, write=False)
+                tiles.append(tile)
+            tile, tileset = _save_composite_tile(
+                tiles,
+                dir,
+                filename,
+                geometricError,
+                tilesetVersion,
+                boundingVolume,
+                minify_json,
+                boundingVolumeType,
+                write=write,
+                content_addressed=content_addressed,
+            )
+        else:
+            tile = Cesium3DTile()
+            tile.save_to = dir
+            tile.save_as = filename
+            tile.bounding_volume_type = boundingVolumeType
+            tile.batch_table_uuid_deterministic = content_addressed
+            tile.from_geodataframe(gdf, crs=crs, z=z, write=write is None)
+            if write is not None:
+                content_uri = _save_content(
+                    dir, tile.get_filename(), tile.to_b3dm(), write, content_addressed
+                )
+                tile.save_as = os.path.splitext(content_uri)[0]
+            tiles = [tile]
+            tileset = _save_leaf_tileset(
+                dir,
+                filename,
+                tile.get_filename(),
+                tile.get_bounding_volume(),
+                geometricError or tile.max_width,
+                tilesetVersion,
+                boundingVolume,
+                minify_json,
+                write=write,
+            )
+        if metrics is not None:
+            # Record the tile in the same batch of metrics as its build, so
+            # that the metrics are written once per tile. Files written with
+            # a function from _file_writer are counted by it.
+            paths = []
+            if write is None:
+                paths = [os.path.join(dir, tileset.root.content.uri), tileset.file_path]
+            metrics.record_tile("leaf", paths, tiles)
+    return tile, tileset
+
+
+def _measure(metrics, kind):
+    # Measure building a tile with metrics.build, when there are metrics
+    return nullcontext() if metrics is None else metrics.build(kind)
+
+
+def _file_writer(writer, metrics, kind, direct=False):
+    # A function that writes bytes to a file, queued with a WriteBehindQueue
+    # or now when direct is True, and counts them in the metrics once they are
+    # written. None when there is no writer and direct is False, for the
+    # builders to save the files themselves.
+    if writer is None and not direct:
+        return None
+
+    def callback(path, size):
+        if metrics is not None:
+            metrics.inc("bytes_written_total", size, kind=kind)
+
+    if writer is not None:
+        return lambda path, data: writer.write(path, data, callback)
+
+    def write(path, data):
+        WriteBehindQueue.write_file(path, data)
+        callback(path, len(data))
+
+    return write
+
 
+def _save_content(dir, uri, data, write, content_addressed=False):
+    # Write the content of a leaf tile with a function from _file_writer, and
+    # get its URI. Content-addressed files are named by the SHA-256 hash of
+    # their bytes, and are not written again when they already exist.
+    if content_addressed:
+        uri = hashlib.sha256(data).hexdigest() + os.path.splitext(uri)[1]
+        if os.path.exists(os.path.join(dir, uri)):
+            return uri
+    write(os.path.join(dir, uri), data)
+    return uri
+
+
+def _write_tileset(tileset, path, minify_json, write=None):
+    # Save a tileset JSON now, or queue it with a function from _file_writer
+    if write is None:
+        tileset.to_file(path, minify=minify_json)
+    else:
+        write(path, tileset.to_bytes(minify=minify_json))
+        tileset.file_path = path
+
+
+def _save_leaf_tileset(
+    dir,
+    filename,
+    content_uri,
+    content_bounding_volume,
+    geometricError,
+    tilesetVersion=None,
+    boundingVolume=None,
+    minify_json=True,
+    transform=None,
+    write=None,
+):
+    """
+    Create and save the tileset JSON of a leaf tile with one content.
+    """
     # Only set the optional content bounding volume if it differs from the root
     # tile bounding volume
-    root_bounding_volume = tile_bounding_volume
-    content_bounding_volume = None
+    root_bounding_volume = content_bounding_volume
     if boundingVolume:
         root_bounding_volume = BoundingVolume(boundingVolume)
-        content_bounding_volume = tile_bounding_volume
+    else:
+        content_bounding_volume = None
 
     asset = Asset(tilesetVersion=tilesetVersion)
 
-    content = Content(uri=tile.get_filename(), boundingVolume=content_bounding_volume)
+    content = Content(uri=content_uri, boundingVolume=content_bounding_volume)
 
     root_tile_data = {
         "boundingVolume": root_bounding_volume,
-        "geometricError": geometricError or tile.max_width,
+        "geometricError": geometricError,
         "content": content,
     }
+    if transform is not None:
+        root_tile_data["transform"] = transform
     tileset_data = {
         "asset": asset,
-        "geometricError": geometricError or tile.max_width,
+        "geometricError": geometricError,
         "root": root_tile_data,
     }
     tileset = Tileset(**tileset_data)
     json_path = os.path.join(dir, filename + ".json")
-    tileset.to_file(json_path, minify=minify_json)
-    return tile, tileset
+    _write_tileset(tileset, json_path, minify_json, write)
+    return tileset
+
+
+def _save_composite_tile(
+    tiles,
+    dir,
+    filename,
+    geometricError=None,
+    tilesetVersion=None,
+    boundingVolume=None,
+    minify_json=True,
+    boundingVolumeType="box",
+    write=None,
+    content_addressed=False,
+):
+    """
+    Pack the B3DMs of Cesium3DTiles into one composite content, and save it
+    with the tileset JSON of a leaf tile.
+    """
+    tiles = [tile for tile in tiles if len(tile.geometries)]
+    if len(tiles) == 0:
+        raise ValueError("At least one tile with geometries is needed.")
+    composite = Composite([tile.to_b3dm() for tile in tiles])
+    if dir and not os.path.exists(dir):
+        os.makedirs(dir, exist_ok=True)
+    content_uri = filename + Composite.FILE_EXT
+    if write is None:
+        composite.save(os.path.join(dir, content_uri))
+    else:
+        content_uri = _save_content(
+            dir, content_uri, composite.to_bytes(), write, content_addressed
+        )
+
+    content_bounding_volume = Cesium3DTile.union_bounding_volumes(
+        tiles, boundingVolumeType
+    )
+    if geometricError is None:
+        geometricError = max(tile.max_width for tile in tiles)
+    tileset = _save_leaf_tileset(
+        dir,
+        filename,
+        content_uri,
+        content_bounding_volume,
+        geometricError,
+        tilesetVersion,
+        boundingVolume,
+        minify_json,
+        write=write,
+    )
+    return composite, tileset
+
+
+def combine_leaf_tiles(
+    tile_list,
+    dir="",
+    filename="tileset",
+    geometricError=None,
+    tilesetVersion=None,
+    boundingVolume=None,
+    minify_json=True,
+    boundingVolumeType=None,
+    composite=False,
+):
+    """
+    Merge several small leaf tiles into one leaf tile with a single B3DM
+    content, so that fewer, larger files are requested by the viewer. The
+    geometry of the tiles is not tesselated again: Cesium3DTiles are combined
+    from their tesselated geometries, and leaf tilesets are combined by
+    merging their B3DM files (glTF buffers and batch tables) with
+    BatchedModel. With composite=True, the contents are instead packed
+    unchanged into one composite (cmpt) content.
+
+    Parameters
+    ----------
+    tile_list : list of Cesium3DTile, or list of str or Tileset
+        The tiles to combine: Cesium3DTiles that were created from
+        GeoDataFrames, or leaf tilesets (tileset JSON files, or Tilesets that
+        were saved to a file) that each have one B3DM content and no
+        children.
+    dir : str
+        The directory to save both the JSON and B3DM files to.
+    filename : str
+        The base filename for the combined tile, excluding base directory and
+        extension. The JSON and B3DM files will be saved as <filename>.json
+        and <filename>.b3dm. Default is 'tileset'.
+    geometricError : float
+        The geometric error of the tile. If None (default), the max of the
+        geometric errors of the tiles is used.
+    tilesetVersion : str
+        An application specific version for the tileset (optional).
+    boundingVolume : list or dict
+        A root bounding volume for the tile. If None (default), the bounding
+        volume will be the union of the bounding volumes of the tiles, and is
+        also used for the content.
+    minify_json : bool
+        Whether to minify the JSON file. Default is True.
+    boundingVolumeType : None or "box" or "region" or "sphere" or "tightest"
+        The type of the combined bounding volume. For Cesium3DTiles it is
+        calculated from the combined GeoDataFrame, and None means "box". For
+        leaf tilesets it is the union of their content bounding volumes, and
+        None means the type of the first one.
+    composite : bool
+        If True, pack the contents into a composite saved as
+        <filename>.cmpt, keeping their batch tables separate, instead of
+        merging them into one B3DM. Leaf tilesets may then have any content
+        that can be an inner tile of a composite. Default is False.
+
+    Returns
+    -------
+    tile, tileset : Cesium3DTile or BatchedModel or Composite, Tileset
+        The combined content, and the Cesium3DTileset object
+    """
+    if not isinstance(tile_list, (list, tuple)) or len(tile_list) == 0:
+        raise ValueError("tile_list must be a non-empty list of tiles.")
+
+    in_memory = all(isinstance(tile, Cesium3DTile) for tile in tile_list)
+    if in_memory and composite:
+        return _save_composite_tile(
+            tile_list,
+            dir,
+            filename,
+            geometricError,
+            tilesetVersion,
+            boundingVolume,
+            minify_json,
+            boundingVolumeType or "box",
+        )
+    if in_memory:
+        tile = Cesium3DTile()
+        tile.save_to = dir
+        tile.save_as = filename
+        tile.bounding_volume_type = boundingVolumeType or "box"
+        tile.from_tiles(tile_list)
+        content_bounding_volume = tile.get_bounding_volume()
+        if geometricError is None:
+            geometricError = tile.max_width
+        tileset = _save_leaf_tileset(
+            dir,
+            filename,
+            tile.get_filename(),
+            content_bounding_volume,
+            geometricError,
+            tilesetVersion,
+            boundingVolume,
+            minify_json,
+        )
+        return tile, tileset
+
+    content_paths = []
+    bvs = []
+    geo_errors = []
+    transforms = []
+    extensions = _COMPOSITE_EXTS if composite else [Cesium3DTile.FILE_EXT]
+    for leaf in tile_list:
+        if isinstance(leaf, str):
+            leaf = Tileset.from_file(leaf)
+        elif not isinstance(leaf, Tileset) or leaf.file_path is None:
+            raise ValueError(
+                "Tiles must all be Cesium3DTiles, or leaf tilesets that were "
+                "saved to a file."
+            )
+        root = leaf.root
+        uri = root.content.uri if root.content else None
+        if root.children or not uri or not uri.lower().endswith(tuple(extensions)):
+            raise ValueError(
+                f"{leaf.file_path} is not a leaf tile with one "
+                f"{' or '.join(extensions)} content."
+            )
+        content_paths.append(os.path.join(os.path.dirname(leaf.file_path), uri))
+        bvs.append(_source_bounding_volume(root, "content"))
+        geo_errors.append(leaf.geometricError)
+        transforms.append(root.transform)
+    if any(transform != transforms[0] for transform in transforms):
+        raise ValueError("Leaf tiles with different transforms cannot be combined.")
+
+    if composite:
+        model = Composite.from_files(content_paths)
+        content_uri = filename + Composite.FILE_EXT
+    else:
+        model = BatchedModel.merge(
+            [BatchedModel.from_file(path) for path in content_paths]
+        )
+        content_uri = filename + Cesium3DTile.FILE_EXT
+    if dir and not os.path.exists(dir):
+        os.makedirs(dir, exist_ok=True)
+    model.save(os.path.join(dir, content_uri))
+    tileset = _save_leaf_tileset(
+        dir,
+        filename,
+        content_uri,
+        BoundingVolumeArray.union_volumes(bvs, boundingVolumeType),
+        geometricError if geometricError is not None else max(geo_errors),
+        tilesetVersion,
+        boundingVolume,
+        minify_json,
+        transform=transforms[0],
+    )
+    return model, tileset
+
+
+def coalesce_leaf_tiles(
+    children,
+    min_bytes,
+    max_bytes=None,
+    dir=None,
+    minify_json=True,
+    boundingVolumeType=None,
+    composite=False,
+):
+    """
+    Combine sibling leaf tiles whose content is smaller than a threshold, so
+    that a parent tile does not point to many tiny files. Runs of consecutive
+    small siblings are grouped, in the order they are given, until a group
+    has at least min_bytes of content, and each group of more than one tile
+    is merged with combine_leaf_tiles. Use the returned paths as the children
+    of parent_tile_from_children_json.
+
+    Parameters
+    ----------
+    children : list of str
+        The paths to the sibling leaf tileset JSON files. Siblings that are
+        next to each other in the list should be close to each other, e.g.
+        sorted by their position in the tile grid.
+    min_bytes : int
+        Tiles with less content than this, in bytes, are combined.
+    max_bytes : int
+        The maximum size of the content of a combined tile (optional). A
+        group is closed before adding a tile would make it larger.
+    dir : str
+        The directory to save the combined tiles to. By default, each
+        combined tile is saved next to the first tile of its group.
+    minify_json : bool
+        Whether to minify the JSON files. Default is True.
+    boundingVolumeType : None or "box" or "region" or "sphere" or "tightest"
+        The type of the combined bounding volumes. See combine_leaf_tiles.
+    composite : bool
+        If True, pack each group into a composite (cmpt) content instead of
+        merging it into one B3DM. See combine_leaf_tiles. Default is False.
+
+    Returns
+    -------
+    list of str
+        The paths to the new list of children: the tiles that were not
+        combined, and the combined tiles in place of their groups. Combined
+        tiles are named <filename>_combined.json after the first tile of
+        their group. The files of the tiles that were combined are not
+        deleted.
+    """
+    new_children = []
+    group = []
+    group_bytes = 0
+
+    def close_group():
+        if len(group) == 1:
+            new_children.append(group[0])
+        elif group:
+            first = group[0]
+            out_dir = os.path.dirname(first) if dir is None else dir
+            stem = os.path.splitext(os.path.basename(first))[0]
+            _, tileset = combine_leaf_tiles(
+                list(group),
+                dir=out_dir,
+                filename=stem + "_combined",
+                minify_json=minify_json,
+                boundingVolumeType=boundingVolumeType,
+                composite=composite,
+            )
+            new_children.append(tileset.file_path)
+        group.clear()
+
+    extensions = _COMPOSITE_EXTS if composite else [Cesium3DTile.FILE_EXT]
+    for child in children:
+        size = _leaf_content_bytes(child, extensions)
+        if size is None or size >= min_bytes:
+            close_group()
+            new_children.append(child)
+            continue
+        if max_bytes is not None and group and group_bytes + size > max_bytes:
+            close_group()
+        if not group:
+            group_bytes = 0
+        group.append(child)
+        group_bytes += size
+        if group_bytes >= min_bytes:
+            close_group()
+    close_group()
+    return new_children
 
 
-# def combine_leaf_tiles(
-#     tile_list,
-#     dir='',
-#     filename='tileset',
-#     geometricError=None,
-#     tilesetVersion=None,
-#     boundingVolume=None,
-#     minify_json=True
-# ):
-#     pass
+# Extensions of the contents that can be packed into a composite
+_COMPOSITE_EXTS = [".b3dm", ".i3dm", ".pnts", ".cmpt"]
+
+
+def _leaf_content_bytes(path, extensions):
+    # The size of the content of a leaf tileset, or None if the tileset is not
+    # a leaf tile with content of one of the extensions
+    with open(path) as f:
+        root = json.load(f)["root"]
+    uri = (root.get("content") or {}).get("uri")
+    if root.get("children") or not uri or not uri.lower().endswith(tuple(extensions)):
+        return None
+    return ContentInfo.from_file(os.path.join(os.path.dirname(path), uri)).byte_length
 
 
 def parent_tile_from_children_json(
@@ -111,6 +555,9 @@ def parent_tile_from_children_json(
     boundingVolume=None,
     boundingVolumeSource="content",
     minify_json=True,
+    boundingVolumeType=None,
+    metrics=None,
+    writer=None,
 ):
     """
     Create a parent tile in a Cesium 3D tileset tree. The parent tile will
@@ -156,7 +603,18 @@ def parent_tile_from_children_json(
         bounding volume, then the root bounding volume will be added instead.
     minify_json : bool
         Whether to minify the JSON file. Default is True.
-
+    boundingVolumeType : None or "box" or "region" or "sphere" or "tightest"
+        The type of the calculated parent bounding volume. Child bounding
+        volumes of other types are converted to this type. If None (default),
+        the type of the first child bounding volume is used. If "tightest",
+        the type with the smallest volume is used.
+    metrics : Metrics
+        A Metrics object to report the tile, the bytes written, and errors to
+        (optional).
+    writer : WriteBehindQueue
+        A queue to write the JSON file with in the background (optional).
+        Child files that were queued with a writer must be written (e.g. with
+        writer.flush()) before this function is called.
 
     Returns
     -------
@@ -165,63 +623,172 @@ def parent_tile_from_children_json(
 
     """
 
-    if not isinstance(children, (list, tuple)):
-        children = [children]
+    write = _file_writer(writer, metrics, "parent")
+    with _measure(metrics, "parent"):
+        if not isinstance(children, (list, tuple)):
+            children = [children]
 
-    # Check the tileset children
-    child_paths = []
-    if all(isinstance(child, str) for child in children):
-        child_paths = children
-    elif all(isinstance(child, Tileset) for child in children):
-        if any(child.file_path is None for child in children):
-            raise ValueError(
-                "Child tilesets must all be saved to a file before "
-                "being added to a parent tile. This is required because the parent "
-                "tile needs relative paths to the child tileset JSON."
-            )
-        child_paths = [child.file_path for child in children]
-    else:
-        raise ValueError("Children must be a list of paths or Tileset objects.")
-
-    # Check that all the child JSON files exist
-    if any(not os.path.exists(child_path) for child_path in child_paths):
-        raise ValueError("One or more child JSON files does not exist.")
-
-    child_geo_errors = []
-    child_tilesets = []
-    child_root_tiles = []
-    rel_child_paths = []
-
-    for i in range(len(child_paths)):
-        # Read in the relevant parts of the child data
-        cp = child_paths[i]
-        child_tileset = Tileset.from_file(cp)
-        child_root = child_tileset.root
-        rel_path_to_child = os.path.relpath(cp, dir)
-        geometric_error = child_tileset.geometricError
-        child_root.children = None
-        # Append child data parts to lists
-        child_geo_errors.append(geometric_error)
-        child_tilesets.append(child_tileset)
-        child_root_tiles.append(child_root)
-        rel_child_paths.append(rel_path_to_child)
+        # Check the tileset children
+        child_paths = []
+        if all(isinstance(child, str) for child in children):
+            child_paths = children
+        elif all(isinstance(child, Tileset) for child in children):
+            if any(child.file_path is None for child in children):
+                raise ValueError(
+                    "Child tilesets must all be saved to a file before "
+                    "being added to a parent tile. This is required because the parent "
+                    "tile needs relative paths to the child tileset JSON."
+                )
+            child_paths = [child.file_path for child in children]
+        else:
+            raise ValueError("Children must be a list of paths or Tileset objects.")
+
+        # Check that all the child JSON files exist
+        if any(not os.path.exists(child_path) for child_path in child_paths):
+            raise ValueError("One or more child JSON files does not exist.")
+
+        # Only the root of each child is needed
+        summaries = []
+        for child, cp in zip(children, child_paths):
+            summaries.append(tile_summary(child if isinstance(child, Tileset) else cp))
+
+        tileset = _parent_tile_from_summaries(
+            summaries,
+            child_paths,
+            dir,
+            filename,
+            geometricError,
+            tilesetVersion,
+            boundingVolume,
+            boundingVolumeSource,
+            minify_json,
+            boundingVolumeType,
+            write,
+        )
+        if metrics is not None:
+            metrics.record_tile("parent", [] if write else [tileset.file_path])
+    return tileset
+
+
+def tile_summary(tileset):
+    """
+    Summarize the parts of a tileset that are needed to add it as the child of
+    a parent tile: the top-level tileset fields and the root tile, without its
+    children. Summaries are plain dicts, so they can be cached as JSON and
+    reused instead of reading the tileset again.
+
+    Parameters
+    ----------
+    tileset : str or Tileset
+        The path to a tileset JSON file, or a Tileset object.
+
+    Returns
+    -------
+    dict
+        A dict with a "tileset" key holding the top-level tileset fields, and
+        a "root" key holding the root tile without its children.
+    """
+    if isinstance(tileset, str):
+        tileset = Tileset.from_file(tileset, lazy=True)
+    return {
+        "tileset": tileset.to_dict(exclude=["root"]),
+        "root": tileset.root.to_dict(exclude=["children"]),
+    }
+
+
+def parent_tile_from_summaries(
+    summaries,
+    child_paths,
+    dir="",
+    filename="tileset",
+    geometricError=None,
+    tilesetVersion=None,
+    boundingVolume=None,
+    boundingVolumeSource="content",
+    minify_json=True,
+    boundingVolumeType=None,
+    metrics=None,
+    writer=None,
+):
+    """
+    Create a parent tile in a Cesium 3D tileset tree from summaries of the
+    child tilesets, created with tile_summary. This gives the same result as
+    parent_tile_from_children_json, without reading the child JSON files.
+
+    Parameters
+    ----------
+    summaries : list of dict
+        The summaries of the child tilesets.
+    child_paths : list of str
+        The paths to the child tileset JSON files, in the same order as the
+        summaries. Used to create the relative URIs of the child tiles.
+
+    See parent_tile_from_children_json for the other parameters.
+
+    Returns
+    -------
+    tileset : Tileset
+        The Cesium3DTileset object
+    """
+    write = _file_writer(writer, metrics, "parent")
+    with _measure(metrics, "parent"):
+        tileset = _parent_tile_from_summaries(
+            summaries,
+            child_paths,
+            dir,
+            filename,
+            geometricError,
+            tilesetVersion,
+            boundingVolume,
+            boundingVolumeSource,
+            minify_json,
+            boundingVolumeType,
+            write,
+        )
+        if metrics is not None:
+            metrics.record_tile("parent", [] if write else [tileset.file_path])
+    return tileset
+
+
+def _parent_tile_from_summaries(
+    summaries,
+    child_paths,
+    dir,
+    filename,
+    geometricError,
+    tilesetVersion,
+    boundingVolume,
+    boundingVolumeSource,
+    minify_json,
+    boundingVolumeType,
+    write,
+):
+    # Create and save a parent tile. See parent_tile_from_summaries.
+    if len(summaries) == 0 or len(summaries) != len(child_paths):
+        raise ValueError("There must be one summary for each child path.")
 
     # Use the first child's tileset info to create the parent tileset
-    new_tileset = child_tilesets[0].copy()
-    new_tileset.root.content = None
-    new_tileset.root.children = None
+    root = copy.deepcopy(summaries[0]["root"])
+    root.pop("content", None)
+    tileset_data = copy.deepcopy(summaries[0]["tileset"])
+    new_tileset = Tileset.from_json({**tileset_data, "root": root})
+
+    child_root_tiles = [
+        Tile.from_json(copy.deepcopy(summary["root"])) for summary in summaries
+    ]
 
     # Add the children to the parent tileset
     bv_method = "replace" if boundingVolume is None else None
     bv_source = boundingVolumeSource
-    new_tileset.add_children(child_root_tiles, bv_method, bv_source)
+    new_tileset.add_children(
+        child_root_tiles, bv_method, bv_source, bv_type=boundingVolumeType
+    )
 
     # All bv info from children is now in parent. Update the children content
     # to only contain the URI for the child json, relative to the new parent
     # json
-    for i in range(len(child_root_tiles)):
-        child = new_tileset.root.children[i]
-        child.content = Content(uri=rel_child_paths[i])
+    for child, child_path in zip(new_tileset.root.children, child_paths):
+        child.content = Content(uri=os.path.relpath(child_path, dir))
 
     # Update other parameters to the parent tileset
     if boundingVolume:
@@ -233,11 +800,268 @@ def parent_tile_from_children_json(
     if geometricError is not None:
         new_tileset.geometricError = geometricError
     else:
-        new_tileset.geometricError = max(child_geo_errors)
+        new_tileset.geometricError = max(
+            summary["tileset"]["geometricError"] for summary in summaries
+        )
 
     # make output directory if it doesn't exist, then save
     if not os.path.exists(dir):
         os.makedirs(dir, exist_ok=True)
     out_path = os.path.join(dir, filename + ".json")
-    new_tileset.to_file(out_path, minify=minify_json)
+    _write_tileset(new_tileset, out_path, minify_json, write)
     return new_tileset
+
+
+def build_tree_index(dir, pattern="**/*.json"):
+    """
+    Find the parent of every tileset JSON file in a tree of tilesets. A file's
+    parent is the tileset file that has a tile whose content points to it.
+    The index can be saved as JSON and passed to update_parent_tiles, so that
+    the directory only has to be read once.
+
+    Parameters
+    ----------
+    dir : str
+        The directory that contains the tileset tree.
+    pattern : str
+        A glob pattern, relative to dir, that matches the tileset files.
+        Default is all JSON files in dir and its subdirectories.
+
+    Returns
+    -------
+    dict
+        A dict that maps the path of each child tileset file to the path of
+        its parent tileset file.
+    """
+    parents = {}
+    for path in sorted(glob.glob(os.path.join(dir, pattern), recursive=True)):
+        path = os.path.normpath(path)
+        with open(path) as f:
+            data = json.load(f)
+        if not isinstance(data, dict) or "root" not in data:
+            continue
+        stack = [data["root"]]
+        while stack:
+            tile = stack.pop()
+            uri = (tile.get("content") or {}).get("uri")
+            if uri and uri.lower().endswith(".json"):
+                child_path = os.path.normpath(os.path.join(os.path.dirname(path), uri))
+                parents[child_path] = path
+            stack.extend(tile.get("children") or [])
+    return parents
+
+
+def update_parent_tiles(
+    changed,
+    tree_index,
+    summaries=None,
+    boundingVolumeSource="content",
+    boundingVolumeType=None,
+    update_geometric_error=True,
+    minify_json=True,
+):
+    """
+    Update the ancestors of tilesets that have changed, e.g. after some leaf
+    tiles were rebuilt. Only the parents of the changed files, and their
+    ancestors, are rewritten, deepest first. Each rewritten parent gets the
+    same tiles, bounding volumes and geometric errors that
+    parent_tile_from_children_json would give it for the new children, and
+    other fields of the parent are kept:
+
+    - The tiles that point to changed children, at any depth of the parent,
+      are replaced by the root tiles of the children.
+    - The bounding volume of the parent's root, and of any tile above a
+      replaced tile, is recomputed from its children.
+    - The geometric error of the parent tileset is the max of its children's
+      tileset geometric errors, and its root tile has the geometric error of
+      the tile of its first child.
+
+    Geometric errors that were set explicitly, rather than derived from the
+    children (e.g. by TileMatrix.build_pyramid, or with the geometricError
+    parameter of parent_tile_from_children_json), are kept. An error counts
+    as derived when it equals what the rule above gives for the children as
+    they were before the change. The previous summary of a changed file is
+    taken from the summaries cache when it is there. Otherwise, when the
+    entries of its unchanged siblings have the errors of their roots, it is
+    taken from the tile that points to it, assuming that its tileset and root
+    tile have the same geometric error, as the leaf tiles of this module do,
+    and when they do not, the entries are treated as explicit.
+
+    Parameters
+    ----------
+    changed : list of str
+        The paths of the tileset JSON files that changed.
+    tree_index : dict
+        A dict that maps each child tileset path to its parent's path, as
+        created by build_tree_index.
+    summaries : dict
+        A cache of tile summaries, created by tile_summary, keyed by tileset
+        path (optional). The summaries of unchanged siblings are read from
+        the cache, or from their files when they are missing. The cache is
+        updated in place with the summaries of the changed and rewritten
+        files, so it can be saved and passed to the next update.
+    boundingVolumeSource : "root" or "content"
+        Which of each child's bounding volumes to use to compute the parent's
+        bounding volume. See parent_tile_from_children_json.
+    boundingVolumeType : None or "box" or "region" or "sphere" or "tightest"
+        The type of the recomputed parent bounding volumes. See
+        parent_tile_from_children_json.
+    update_geometric_error : bool
+        If True (default), update the derived geometric errors of each
+        rewritten parent as described above. If False, keep every geometric
+        error that the parent has.
+    minify_json : bool
+        Whether to minify the JSON files. Default is True.
+
+    Returns
+    -------
+    list of str
+        The paths of the parent tileset files that were rewritten, in the
+        order they were written.
+    """
+    if summaries is None:
+        summaries = {}
+    tree_index = {
+        os.path.normpath(c): os.path.normpath(p) for c, p in tree_index.items()
+    }
+
+    def depth(path):
+        d = 0
+        while path in tree_index:
+            path = tree_index[path]
+            d += 1
+        return d
+
+    # Re-read the summaries of the changed files only, keeping the summaries
+    # they had before when they are cached
+    previous = {}
+    updated = set()
+    pending = set()
+    for path in changed:
+        path = os.path.normpath(path)
+        if path in summaries:
+            previous[path] = summaries[path]
+        summaries[path] = tile_summary(path)
+        updated.add(path)
+        if path in tree_index:
+            pending.add(tree_index[path])
+
+    rewritten = []
+    while pending:
+        # A parent is only rewritten once all of its changed descendants are
+        parent_path = max(pending, key=depth)
+        pending.remove(parent_path)
+
+        parent = Tileset.from_file(parent_path)
+        previous[parent_path] = tile_summary(parent)
+        parent_dir = os.path.dirname(parent_path)
+
+        # Find the tiles that point to child tilesets, anywhere in the tree,
+        # with the tiles above them
+        references = {}
+        stack = [(parent.root, ())]
+        while stack:
+            tile, above = stack.pop()
+            for i, child in enumerate(tile.children or []):
+                uri = child.content.uri if child.content else None
+                if uri and uri.lower().endswith(".json"):
+                    child_path = os.path.normpath(os.path.join(parent_dir, uri))
+                    references[id(child)] = (child_path, tile, i, above + (tile,))
+                stack.append((child, above + (tile,)))
+
+        found = {child_path for child_path, _, _, _ in references.values()}
+        for path in sorted(updated - found):
+            if tree_index.get(path) == parent_path:
+                raise ValueError(f"No tile in {parent_path} points to {path}")
+
+        # The summaries that the children had before the change, where they
+        # are known
+        olds = {}
+        for child_path, tile, i, above in references.values():
+            if child_path not in summaries:
+                summaries[child_path] = tile_summary(child_path)
+            if child_path not in updated:
+                olds[child_path] = summaries[child_path]
+            elif child_path in previous:
+                olds[child_path] = previous[child_path]
+        # The entries were derived from the children if each entry of a
+        # known child has the error of the child's root tile
+        entries_derived = all(
+            tile.children[i].geometricError == olds[p]["root"]["geometricError"]
+            for p, tile, i, _ in references.values()
+            if p in olds
+        )
+
+        old_errors = {id(tile): tile.geometricError for tile in parent.root.children}
+        old_tileset_errors = []
+        new_tileset_errors = []
+        to_update = {}
+        for child_path, tile, i, above in list(references.values()):
+            entry = tile.children[i]
+            summary = summaries[child_path]
+            old = olds.get(child_path)
+            if old is None and entries_derived:
+                old = {
+                    "tileset": {"geometricError": entry.geometricError},
+                    "root": {"geometricError": entry.geometricError},
+                }
+            if old is not None:
+                old_tileset_errors.append(old["tileset"]["geometricError"])
+            new_tileset_errors.append(summary["tileset"]["geometricError"])
+            if child_path not in updated:
+                continue
+            new_entry = Tile.from_json(copy.deepcopy(summary["root"]))
+            new_entry.content = Content(uri=entry.content.uri)
+            new_entry.children = entry.children
+            derived = (
+                old is not None
+                and entry.geometricError == old["root"]["geometricError"]
+            )
+            if not (update_geometric_error and derived):
+                new_entry.geometricError = entry.geometricError
+            tile.children[i] = new_entry
+            old_errors[id(new_entry)] = old_errors.pop(id(entry), None)
+            for level, tile_above in enumerate(above):
+                to_update[id(tile_above)] = (level, tile_above)
+
+        # Recompute the bounding volumes from the deepest updated tile up
+        for _, tile in sorted(to_update.values(), key=lambda item: -item[0]):
+            bvs = []
+            if tile is not parent.root and tile.content is not None:
+                bvs.append(_source_bounding_volume(tile, "content"))
+            for child in tile.children:
+                # Use the root of each child tileset, as the builder does
+                uri = child.content.uri if child.content else None
+                if uri and uri.lower().endswith(".json"):
+                    child_path = os.path.normpath(os.path.join(parent_dir, uri))
+                    child = Tile.from_json(copy.deepcopy(summaries[child_path]["root"]))
+                bvs.append(_source_bounding_volume(child, boundingVolumeSource))
+            if bvs:
+                tile.boundingVolume = BoundingVolumeArray.union_volumes(
+                    bvs, boundingVolumeType
+                )
+
+        if update_geometric_error and parent.root.children:
+            first = parent.root.children[0]
+            if parent.root.geometricError == old_errors.get(id(first)):
+                parent.root.geometricError = first.geometricError
+            if old_tileset_errors and parent.geometricError == max(old_tileset_errors):
+                parent.geometricError = max(new_tileset_errors)
+
+        parent.to_file(parent_path, minify=minify_json)
+        rewritten.append(parent_path)
+
+        summaries[parent_path] = tile_summary(parent)
+        updated.add(parent_path)
+        if parent_path in tree_index:
+            pending.add(tree_index[parent_path])
+
+    return rewritten
+
+
+def _source_bounding_volume(tile, source):
+    # The bounding volume of a tile that is added to its parent's bounding
+    # volume, following the bv_source rules of Tile.add_children
+    if source == "content" and tile.content and tile.content.boundingVolume:
+        return tile.content.boundingVolume
+    return tile.boundingVolume
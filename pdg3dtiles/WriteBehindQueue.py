@@ -0,0 +1,234 @@
+import os
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+
+
+class WriteBehindQueue:
+    """
+    Write files in background threads, so that tiles can be built while the
+    files of the previous tiles are still being written. This helps most on
+    network file systems, where writing many small files is slow.
+
+    The number of writes that are queued or in progress is bounded by
+    max_pending. When the queue is full, write blocks until a write finishes,
+    and the time spent waiting is counted as back-pressure in blocked_seconds.
+    Errors are kept and raised by the next call to write, flush, or close.
+
+    Use the queue as a context manager, or call close when done, to make sure
+    that every file is written:
+
+        with WriteBehindQueue(workers=8) as writer:
+            for i, gdf in enumerate(gdfs):
+                leaf_tile_from_gdf(gdf, dir=out, filename=f"{i}", writer=writer)
+
+    Attributes
+    ----------
+    workers : int
+        The number of threads that write files.
+    max_pending : int
+        The maximum number of writes that are queued or in progress.
+    files : int
+        The number of files written.
+    bytes : int
+        The number of bytes written.
+    blocked : int
+        The number of calls to write that waited for the queue to have room.
+    blocked_seconds : float
+        The total time that calls to write waited, in seconds.
+    errors : list of (str, Exception)
+        The path and the exception of every write that failed.
+    """
+
+    def __init__(self, workers=4, max_pending=64):
+        """
+        Parameters
+        ----------
+        workers : int
+            The number of threads that write files. Default is 4.
+        max_pending : int
+            The maximum number of writes that are queued or in progress.
+            Default is 64.
+        """
+        if workers < 1 or max_pending < 1:
+            raise ValueError("workers and max_pending must be at least 1")
+        self.workers = workers
+        self.max_pending = max_pending
+        self.files = 0
+        self.bytes = 0
+        self.blocked = 0
+        self.blocked_seconds = 0.0
+        self.errors = []
+        self._executor = ThreadPoolExecutor(
+            workers, thread_name_prefix="pdg3dtiles-write"
+        )
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._lock = threading.Lock()
+        self._futures = set()
+        self._raised = 0
+        self._closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        # Don't hide an exception from the body with a write error
+        if exc_type is None:
+            self.close()
+        else:
+            self._executor.shutdown(wait=True)
+            self._closed = True
+
+    @property
+    def pending(self):
+        """
+        The number of writes that are queued or in progress.
+        """
+        with self._lock:
+            return len(self._futures)
+
+    def write(self, path, data, callback=None):
+        """
+        Queue bytes to be written to a file with write_file.
+
+        Parameters
+        ----------
+        path : str
+            The path of the file.
+        data : bytes or str
+            The content of the file. Strings are encoded as UTF-8.
+        callback : callable
+            A function that is called as callback(path, size) from the writing
+            thread once the file is written (optional).
+
+        Returns
+        -------
+        concurrent.futures.Future
+            A future whose result is the number of bytes written.
+        """
+        if self._closed:
+            raise ValueError("The WriteBehindQueue is closed.")
+        self._raise_errors()
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+
+        if not self._slots.acquire(blocking=False):
+            start = time.perf_counter()
+            self._slots.acquire()
+            with self._lock:
+                self.blocked += 1
+                self.blocked_seconds += time.perf_counter() - start
+
+        future = self._executor.submit(self._write, path, data, callback)
+        with self._lock:
+            self._futures.add(future)
+        future.add_done_callback(self._done)
+        return future
+
+    def write_tileset(self, tileset, path, minify=True, callback=None):
+        """
+        Encode a Tileset (or Tile) as JSON now, and queue it to be written to
+        a file. Changes made to the tileset after this call are not written.
+
+        Parameters
+        ----------
+        tileset : Tileset or Tile
+            The object to write. Its file_path is set to path.
+        path : str
+            The path of the JSON file.
+        minify : bool
+            Whether to minify the JSON. Default is True.
+        callback : callable
+            See write.
+
+        Returns
+        -------
+        concurrent.futures.Future
+            See write.
+        """
+        future = self.write(path, tileset.to_bytes(minify=minify), callback)
+        tileset.file_path = path
+        return future
+
+    def _write(self, path, data, callback):
+        # Errors are kept here, before the future is done, so that flush sees
+        # them as soon as it stops waiting
+        try:
+            self.write_file(path, data)
+        except Exception as e:
+            with self._lock:
+                self.errors.append((path, e))
+            raise
+        with self._lock:
+            self.files += 1
+            self.bytes += len(data)
+        if callback is not None:
+            callback(path, len(data))
+        return len(data)
+
+    @staticmethod
+    def write_file(path, data):
+        """
+        Write bytes to a file now. The bytes are written to a temporary file
+        that then replaces the file, so that readers never see a partial file,
+        even when the same file is written twice at once. The directory of
+        the file is created if it does not exist.
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temp_path, "wb") as f:
+            f.write(data)
+        os.replace(temp_path, path)
+
+    def _done(self, future):
+        with self._lock:
+            self._futures.discard(future)
+        self._slots.release()
+
+    def _raise_errors(self):
+        # Raise the first error that was not raised yet
+        with self._lock:
+            if self._raised >= len(self.errors):
+                return
+            path, error = self.errors[self._raised]
+            self._raised = len(self.errors)
+        raise OSError(f"Failed to write {path}: {error}") from error
+
+    def flush(self):
+        """
+        Wait until every queued file is written. Raises an OSError if a write
+        failed since the last error was raised.
+        """
+        with self._lock:
+            futures = list(self._futures)
+        wait(futures)
+        self._raise_errors()
+
+    def close(self):
+        """
+        Write every queued file and stop the threads.
+        """
+        if self._closed:
+            return
+        try:
+            self.flush()
+        finally:
+            self._executor.shutdown(wait=True)
+            self._closed = True
+
+    def get_stats(self):
+        """
+        Get the number of files and bytes written, the number of pending
+        writes, the back-pressure and the number of errors, as a dict.
+        """
+        with self._lock:
+            return {
+                "files": self.files,
+                "bytes": self.bytes,
+                "pending": len(self._futures),
+                "blocked": self.blocked,
+                "blocked_seconds": self.blocked_seconds,
+                "errors": len(self.errors),
+            }
@@ -1,7 +1,33 @@
 # -*- coding: utf-8 -*-
 from .Cesium3DTile import Cesium3DTile
-from .Cesium3DTileset import Tileset, Asset, Content, Tile
-from .BoundingVolume import BoundingVolume, BoundingVolumeBox, BoundingVolumeRegion
+from .Cesium3DTileset import (
+    Tileset,
+    Asset,
+    Content,
+    Tile,
+    LazyChildren,
+    deferred_validation,
+)
+from .BoundingVolume import (
+    BoundingVolume,
+    BoundingVolumeBox,
+    BoundingVolumeRegion,
+    BoundingVolumeSphere,
+)
+from .BoundingVolumeArray import BoundingVolumeArray
+from .TilesetWriter import TilesetWriter
+from .CompactTileset import CompactTileset
+from .TilesetIndex import TilesetIndex
+from .ContentInfo import ContentInfo
+from .BatchedModel import BatchedModel
+from .Composite import Composite
+from .TileStats import TileStats
+from .Metrics import Metrics
+from .WriteBehindQueue import WriteBehindQueue
+from .ShardedBuild import ShardedBuild
+from .TileMatrix import TileMatrix
+from .TraversalSimulator import TraversalSimulator, Camera
+from .TilesetStats import TilesetStats
 from .TreeGenerator import *
 
 __version__ = "0.0.1"
@@ -27,6 +27,8 @@ for i in range(len(input_paths)):
     tile = Cesium3DTile()
     tile.save_to = output_directory
     tile.save_as = "model_" + str(i)
+    # Only keep what the tileset needs once the B3DM is saved
+    tile.compact_after_write = True
     tile.from_file(input_path)
     tile_parts.append(tile)
 
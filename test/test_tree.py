@@ -1,6 +1,6 @@
 import os
 import geopandas as gpd
-from pdg3dtiles import leaf_tile_from_gdf, parent_tile_from_children_json
+from pdg3dtiles import leaf_tile_from_gdf, tile_summary, TileMatrix
 
 # usage: from ./viz-3dtiles run `python test/test_tree.py`
 
@@ -19,7 +19,8 @@ for root, dirs, files in os.walk(input_geopackage_dir):
             input_paths.append(os.path.join(root, file))
 
 # Make a B3DM and tileset JSON file for each of the geopackage files
-leaf_tiles = []
+leaf_paths = []
+leaf_summaries = {}
 for input_path in input_paths:
     # Get the tile from the geopackage
     gdf = gpd.read_file(input_path)
@@ -30,11 +31,18 @@ for input_path in input_paths:
     base_filename = os.path.basename(input_path).split(".")[0]
     # Get the tile from the geopackage
     tile, tileset = leaf_tile_from_gdf(gdf, dir=output_dir, filename=base_filename)
-    leaf_tiles.append(tileset)
+    leaf_paths.append(tileset.file_path)
+    leaf_summaries[tileset.file_path] = tile_summary(tileset)
 
-# Make a parent tileset JSON file that points to each of the leaf tiles
-parent_tile_from_children_json(
-    children=leaf_tiles,
-    dir=os.path.join(output_directory, "WorldCRS84Quad", "12", "762"),
-    filename="455",
+# Make the parent tileset JSON files of every level above the leaf tiles, down
+# to 12/762/455. The region of each tile is calculated from its z/x/y. Features
+# in the example data overhang their tiles by about 1%, so the regions are
+# extended by a margin of 5% of the tile size, and joined with the bounding
+# volumes of the leaves.
+TileMatrix().build_pyramid(
+    leaf_paths,
+    dir=os.path.join(output_directory, "WorldCRS84Quad"),
+    min_z=12,
+    margin=0.05,
+    summaries=leaf_summaries,
 )
@@ -0,0 +1,11 @@
+import pytest
+
+from .synthetic import GENERATORS
+
+
+@pytest.fixture(params=sorted(GENERATORS))
+def gdf(request):
+    """
+    A small synthetic GeoDataFrame from each generator in synthetic.py.
+    """
+    return GENERATORS[request.param](40, seed=1)
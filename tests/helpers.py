@@ -0,0 +1,89 @@
+"""
+Helpers that build bounding volumes, tilesets and content files for the tests.
+"""
+
+import json
+import os
+import struct
+
+import numpy as np
+import shapely
+
+from pdg3dtiles import BoundingVolumeArray, BoundingVolumeBox, BoundingVolumeRegion
+from pdg3dtiles.BoundingVolume import geodetic_to_ecef
+
+
+def feature_boxes(gdf, min_height=0.0, max_height=25.0):
+    """
+    An oriented bounding box around each feature, extruded between two
+    heights, in EPSG:4978.
+    """
+    boxes = []
+    for geom in gdf.geometry:
+        coords = np.deg2rad(shapely.get_coordinates(geom))
+        points = np.concatenate(
+            [
+                geodetic_to_ecef(coords[:, 0], coords[:, 1], height)
+                for height in (min_height, max_height)
+            ]
+        )
+        boxes.append(BoundingVolumeBox.from_points(points))
+    return BoundingVolumeArray.from_volumes(boxes)
+
+
+def synthetic_tileset(gdf, fanout=4):
+    """
+    A tileset dict with one leaf tile per feature, with a region around the
+    feature, and parent tiles that group fanout tiles at a time until there
+    is one root.
+    """
+    level = []
+    for i, bounds in enumerate(gdf.geometry.bounds.values):
+        region = BoundingVolumeRegion.values_list_from_degrees(*bounds, 0, 10)
+        level.append(
+            {
+                "boundingVolume": {"region": region},
+                "geometricError": 0.0,
+                "content": {"uri": f"tiles/{i}.b3dm"},
+            }
+        )
+    error = 1.0
+    while len(level) > 1:
+        parents = []
+        for start in range(0, len(level), fanout):
+            children = level[start : start + fanout]
+            regions = np.array([c["boundingVolume"]["region"] for c in children])
+            region = np.concatenate([regions[:, :2].min(0), regions[:, 2:4].max(0)])
+            heights = [regions[:, 4].min(), regions[:, 5].max()]
+            parents.append(
+                {
+                    "boundingVolume": {"region": region.tolist() + heights},
+                    "geometricError": error,
+                    "refine": "REPLACE",
+                    "children": children,
+                }
+            )
+        level = parents
+        error *= 2
+    return {"asset": {"version": "1.0"}, "geometricError": error, "root": level[0]}
+
+
+def write_glb(path, triangles):
+    """
+    Write a GLB file with only a JSON chunk, describing one indexed mesh with
+    the given number of triangles, so that its header can be read.
+    """
+    gltf = {
+        "asset": {"version": "2.0"},
+        "accessors": [{"count": 3 * triangles}, {"count": 3 * triangles}],
+        "meshes": [{"primitives": [{"attributes": {"POSITION": 0}, "indices": 1}]}],
+    }
+    chunk = json.dumps(gltf).encode("utf-8")
+    chunk += b" " * (-len(chunk) % 4)
+    length = 12 + 8 + len(chunk)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(struct.pack("<4sII", b"glTF", 2, length))
+        f.write(struct.pack("<I4s", len(chunk), b"JSON"))
+        f.write(chunk)
+    return length
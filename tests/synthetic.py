@@ -0,0 +1,159 @@
+"""
+Deterministic synthetic polygon data for the tests and benchmarks. Every
+generator takes a number of features and a seed, and returns a GeoDataFrame
+in EPSG:4326 with the same polygons and attributes every time it is called
+with the same arguments.
+"""
+
+import numpy as np
+import geopandas
+from shapely.geometry import Polygon, MultiPolygon, box
+
+GEOHASH_BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+
+
+def geohash_bounds(geohash):
+    """
+    Get the (west, south, east, north) bounds of a geohash cell.
+    """
+    west, east, south, north = -180.0, 180.0, -90.0, 90.0
+    is_lon = True
+    for char in geohash:
+        bits = GEOHASH_BASE32.index(char)
+        for shift in range(4, -1, -1):
+            bit = (bits >> shift) & 1
+            if is_lon:
+                mid = (west + east) / 2
+                west, east = (mid, east) if bit else (west, mid)
+            else:
+                mid = (south + north) / 2
+                south, north = (mid, north) if bit else (south, mid)
+            is_lon = not is_lon
+    return west, south, east, north
+
+
+def geohash_grid(n, seed=0, precision=7, origin="b7"):
+    """
+    Square geohash cells, like the grid in test/test_geohashes.py, in the
+    order of their geohashes.
+
+    Parameters
+    ----------
+    n : int
+        The number of cells.
+    seed : int
+        Used to pick the attribute values.
+    precision : int
+        The length of the geohashes. Default is 7 (cells of about 150 m).
+    origin : str
+        The geohash prefix that the cells are in. Default is "b7", in Alaska.
+    """
+    rng = np.random.default_rng(seed)
+    free = precision - len(origin)
+    if n > 32**free:
+        raise ValueError(f"There are only {32 ** free} cells in {origin}")
+    hashes = []
+    for i in range(n):
+        suffix = ""
+        for _ in range(free):
+            suffix = GEOHASH_BASE32[i % 32] + suffix
+            i //= 32
+        hashes.append(origin + suffix)
+    geometry = [box(*geohash_bounds(h)) for h in hashes]
+    data = {
+        "id": hashes,
+        "staging_area": rng.uniform(0, 1e4, n).round(2),
+        "class": rng.integers(0, 5, n),
+    }
+    return geopandas.GeoDataFrame(data, geometry=geometry, crs="EPSG:4326")
+
+
+def lake(rng, x, y, radius, vertices=32, hole=True):
+    """
+    A lake-like polygon: an irregular ring around (x, y), with an island (a
+    hole) in the middle when hole is True.
+    """
+    angles = np.sort(rng.uniform(0, 2 * np.pi, vertices))
+    radii = radius * rng.uniform(0.6, 1.0, vertices)
+    shell = np.column_stack([x + radii * np.cos(angles), y + radii * np.sin(angles)])
+    holes = []
+    if hole:
+        angles = np.linspace(0, 2 * np.pi, 8, endpoint=False)
+        r = radius * 0.2
+        holes.append(np.column_stack([x + r * np.cos(angles), y + r * np.sin(angles)]))
+    return Polygon(shell, holes)
+
+
+def lakes(n, seed=0, vertices=32, bounds=(-150.0, 68.0, -149.0, 69.0)):
+    """
+    Random lake-like polygons with holes, spread over an area.
+
+    Parameters
+    ----------
+    n : int
+        The number of polygons.
+    seed : int
+        The random seed.
+    vertices : int
+        The number of vertices of each outer ring.
+    bounds : tuple
+        The (west, south, east, north) area to place the lakes in.
+    """
+    rng = np.random.default_rng(seed)
+    west, south, east, north = bounds
+    cell = np.sqrt((east - west) * (north - south) / max(n, 1))
+    xs = rng.uniform(west, east, n)
+    ys = rng.uniform(south, north, n)
+    geometry = [
+        lake(rng, x, y, cell * 0.3, vertices, hole=bool(i % 2 == 0))
+        for i, (x, y) in enumerate(zip(xs, ys))
+    ]
+    data = {
+        "id": np.arange(n),
+        "area": rng.uniform(0, 1e5, n).round(1),
+        "class": rng.integers(0, 5, n),
+    }
+    return geopandas.GeoDataFrame(data, geometry=geometry, crs="EPSG:4326")
+
+
+def multipolygons(n, seed=0, parts=3, vertices=16, bounds=(-150.0, 68.0, -149.0, 69.0)):
+    """
+    Random multipolygons, each a cluster of lake-like parts.
+
+    Parameters
+    ----------
+    n : int
+        The number of multipolygons.
+    seed : int
+        The random seed.
+    parts : int
+        The number of polygons in each multipolygon.
+    vertices : int
+        The number of vertices of the outer ring of each part.
+    bounds : tuple
+        The (west, south, east, north) area to place the clusters in.
+    """
+    rng = np.random.default_rng(seed)
+    west, south, east, north = bounds
+    cell = np.sqrt((east - west) * (north - south) / max(n, 1))
+    geometry = []
+    for i in range(n):
+        x, y = rng.uniform(west, east), rng.uniform(south, north)
+        radius = cell * 0.1
+        geometry.append(
+            MultiPolygon(
+                [
+                    lake(rng, x + k * 2.5 * radius, y, radius, vertices, hole=k == 0)
+                    for k in range(parts)
+                ]
+            )
+        )
+    data = {"id": np.arange(n), "class": rng.integers(0, 5, n)}
+    return geopandas.GeoDataFrame(data, geometry=geometry, crs="EPSG:4326")
+
+
+GENERATORS = {
+    "geohash": geohash_grid,
+    "lakes": lakes,
+    "multipolygons": multipolygons,
+}
@@ -0,0 +1,139 @@
+import numpy as np
+import pytest
+import shapely
+
+from pdg3dtiles import BoundingVolumeArray
+from pdg3dtiles.BoundingVolume import geodetic_to_ecef
+from .helpers import feature_boxes
+
+
+def separated(center, axes, other_center, other_axes):
+    # The full separating axis test for two oriented boxes: the face normals
+    # of both boxes and the cross products of their edges
+    candidates = list(axes) + list(other_axes)
+    candidates += [np.cross(a, b) for a in axes for b in other_axes]
+    scale = max(np.abs(axes).max(), np.abs(other_axes).max()) ** 2
+    for axis in candidates:
+        length = np.linalg.norm(axis)
+        if length <= 1e-12 * scale:
+            continue
+        axis = axis / length
+        radius = np.abs(axes @ axis).sum() + np.abs(other_axes @ axis).sum()
+        if abs((other_center - center) @ axis) > radius * (1 + 1e-9):
+            return True
+    return False
+
+
+def face_axis_intersects(center, axes, other_center, other_axes):
+    # The separating axis test of BoundingVolumeArray.intersects, one pair at
+    # a time
+    for axis in np.concatenate([axes, other_axes]):
+        length = np.linalg.norm(axis)
+        if length == 0:
+            continue
+        axis = axis / length
+        radius = np.abs(axes @ axis).sum() + np.abs(other_axes @ axis).sum()
+        if abs((other_center - center) @ axis) > radius:
+            return False
+    return True
+
+
+def shifted(boxes, seed=0):
+    # Copies of the boxes moved along their own axes by 1 to 3 half-widths,
+    # so that some copies overlap their box, some touch it, and some are
+    # separated from it
+    rng = np.random.default_rng(seed)
+    center, axes = boxes.get_axes()
+    factors = rng.uniform(1.0, 3.0, size=(len(boxes), 3))
+    signs = rng.choice([-1, 1], size=(len(boxes), 3))
+    offsets = np.einsum("nj,nja->na", factors * signs, axes)
+    values = boxes.values.copy()
+    values[:, 0:3] = center + offsets
+    return BoundingVolumeArray(values, type="box")
+
+
+def test_intersects_matches_face_axis_test(gdf):
+    boxes = feature_boxes(gdf)
+    others = shifted(boxes)
+    center, axes = boxes.get_axes()
+    other_center, other_axes = others.get_axes()
+    expected = [
+        face_axis_intersects(center[i], axes[i], other_center[i], other_axes[i])
+        for i in range(len(boxes))
+    ]
+    result = boxes.intersects(others)
+    assert result.tolist() == expected
+    # Both outcomes are tested
+    assert 0 < result.sum() < len(result)
+
+
+def test_intersects_never_misses_an_overlap(gdf):
+    boxes = feature_boxes(gdf)
+    result = boxes.intersects(boxes, pairwise=True)
+    center, axes = boxes.get_axes()
+    for i in range(len(boxes)):
+        for j in range(len(boxes)):
+            if not separated(center[i], axes[i], center[j], axes[j]):
+                assert result[i, j]
+
+
+def test_intersects_pairwise_is_symmetric_and_matches_elementwise(gdf):
+    boxes = feature_boxes(gdf)
+    others = shifted(boxes, seed=1)
+    pairwise = boxes.intersects(others, pairwise=True)
+    assert pairwise.shape == (len(boxes), len(others))
+    assert np.array_equal(np.diag(pairwise), boxes.intersects(others))
+    assert np.array_equal(pairwise, others.intersects(boxes, pairwise=True).T)
+
+
+def test_intersects_far_apart():
+    boxes = BoundingVolumeArray.from_min_max([[0, 0, 0]], [[1, 1, 1]])
+    far = BoundingVolumeArray.from_min_max([[5, 0, 0]], [[6, 1, 1]])
+    assert not boxes.intersects(far)[0]
+    assert boxes.intersects(boxes)[0]
+
+
+@pytest.mark.parametrize("type", ["box", "region", "sphere"])
+def test_union_contains_members(gdf, type):
+    if type == "region":
+        volumes = BoundingVolumeArray.from_gdf(gdf, type="region")
+    else:
+        volumes = BoundingVolumeArray.from_volumes(list(feature_boxes(gdf)), type=type)
+    union = BoundingVolumeArray.from_volumes([volumes.union_all()])
+    assert union.contains(volumes, pairwise=True).all()
+    assert volumes.contains(volumes).all()
+
+
+def test_contains_implies_intersects(gdf):
+    boxes = feature_boxes(gdf)
+    others = shifted(boxes, seed=2)
+    for a, b in [(boxes, boxes), (boxes, others), (others, boxes)]:
+        contains = a.contains(b, pairwise=True)
+        assert not (contains & ~a.intersects(b, pairwise=True)).any()
+
+
+def test_contains_points_of_own_corners(gdf):
+    boxes = feature_boxes(gdf)
+    corners = boxes.get_corners()
+    for i in range(len(boxes)):
+        assert boxes[i : i + 1].contains_points(corners[i]).all()
+
+
+def test_from_gdf_regions_match_feature_bounds(gdf):
+    regions = BoundingVolumeArray.from_gdf(gdf, type="region")
+    assert len(regions) == len(gdf)
+    assert np.allclose(np.rad2deg(regions.values[:, :4]), gdf.geometry.bounds.values)
+    assert (regions.values[:, 4:] == 0).all()
+
+
+def test_from_gdf_volumes_contain_their_features(gdf):
+    boxes = BoundingVolumeArray.from_gdf(gdf, type="box")
+    spheres = BoundingVolumeArray.from_gdf(gdf, type="sphere")
+    mins, maxs = boxes.get_bounds()
+    centers, radii = spheres.get_spheres()
+    for i, geom in enumerate(gdf.geometry):
+        coords = np.deg2rad(shapely.get_coordinates(geom))
+        points = geodetic_to_ecef(coords[:, 0], coords[:, 1], 0)
+        # Within a millimeter, which covers the rounding of the reprojection
+        assert (points >= mins[i] - 1e-3).all() and (points <= maxs[i] + 1e-3).all()
+        assert (np.linalg.norm(points - centers[i], axis=1) <= radii[i] + 1e-3).all()
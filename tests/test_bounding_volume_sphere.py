@@ -0,0 +1,94 @@
+import numpy as np
+import pytest
+
+from pdg3dtiles import BoundingVolume, BoundingVolumeArray, BoundingVolumeSphere
+from pdg3dtiles.BoundingVolume import ecef_to_geodetic
+
+# A tolerance for rounding, in meters
+TOL = 1e-6
+
+
+def encloses(sphere, points):
+    distances = np.linalg.norm(np.asarray(points) - sphere.center, axis=1)
+    return bool((distances <= sphere.radius + TOL).all())
+
+
+def test_from_points_encloses_feature_points(gdf):
+    points = BoundingVolume.ecef_points_from_gdf(gdf)
+    sphere = BoundingVolumeSphere.from_points(points)
+    assert encloses(sphere, points)
+    # Ritter's sphere is no larger than the sphere around the points' envelope
+    envelope = np.linalg.norm(points.max(0) - points.min(0)) / 2
+    assert sphere.radius <= envelope + TOL
+
+
+def test_from_points_single_and_two_points():
+    sphere = BoundingVolumeSphere.from_points([[1.0, 2.0, 3.0]])
+    assert sphere.to_list() == [1.0, 2.0, 3.0, 0.0]
+    sphere = BoundingVolumeSphere.from_points([[0.0, 0.0, 0.0], [4.0, 0.0, 0.0]])
+    assert sphere.to_list() == [2.0, 0.0, 0.0, 2.0]
+
+
+def test_from_spheres_encloses_every_sphere(gdf):
+    spheres = BoundingVolumeArray.from_gdf(gdf, type="sphere")
+    centers, radii = spheres.get_spheres()
+    union = BoundingVolumeSphere.from_spheres(centers, radii)
+    reach = np.linalg.norm(centers - union.center, axis=1) + radii
+    assert (reach <= union.radius + TOL).all()
+    assert union.radius <= (np.linalg.norm(centers - centers[0], axis=1) + radii).max()
+
+
+@pytest.mark.parametrize(
+    "a, b, expected",
+    [
+        ([0, 0, 0, 1], [3, 0, 0, 1], [1.5, 0, 0, 2.5]),
+        ([0, 0, 0, 5], [1, 0, 0, 1], [0, 0, 0, 5]),
+        ([1, 0, 0, 1], [0, 0, 0, 5], [0, 0, 0, 5]),
+    ],
+)
+def test_add(a, b, expected):
+    a, b = BoundingVolumeSphere(a), BoundingVolumeSphere(b)
+    assert np.allclose(a.add(b).to_list(), expected)
+    assert np.allclose(b.add(a).to_list(), expected)
+    a.add(b, inplace=True)
+    assert np.allclose(a.to_list(), expected)
+
+
+def test_add_converts_other_volumes():
+    sphere = BoundingVolumeSphere([0.0, 0.0, 0.0, 1.0])
+    box = [10.0, 0.0, 0.0, 1.0, 0, 0, 0, 1.0, 0, 0, 0, 1.0]
+    union = sphere.add(box)
+    assert isinstance(union, BoundingVolumeSphere)
+    assert encloses(union, BoundingVolume(box).get_corners())
+
+
+def test_parsed_from_lists_and_dicts():
+    values = [1.0, 2.0, 3.0, 4.0]
+    for parsed in [
+        BoundingVolume(values),
+        BoundingVolume({"sphere": values}),
+        BoundingVolume.from_json({"sphere": values}),
+    ]:
+        assert isinstance(parsed, BoundingVolumeSphere)
+        assert parsed.to_dict() == {"sphere": values}
+
+
+def test_conversions_enclose_the_sphere(gdf):
+    sphere = BoundingVolumeSphere.from_gdf(gdf)
+    assert sphere.to_sphere() is sphere
+    # The box around the sphere touches it at the middle of each face
+    box = sphere.to_box()
+    center, axes = BoundingVolumeArray.from_volumes([box]).get_axes()
+    faces = np.concatenate([center + axes[0], center - axes[0]])
+    assert np.allclose(np.linalg.norm(faces - sphere.center, axis=1), sphere.radius)
+    region = BoundingVolumeArray.from_volumes([sphere.convert("region")])
+    corners = ecef_to_geodetic(sphere.get_corners())
+    corners[:, :2] = np.rad2deg(corners[:, :2])
+    mins, maxs = region.get_bounds()
+    assert (corners >= mins - TOL).all() and (corners <= maxs + TOL).all()
+
+
+def test_volume():
+    sphere = BoundingVolumeSphere([0.0, 0.0, 0.0, 2.0])
+    assert sphere.volume() == pytest.approx(4 / 3 * np.pi * 8)
+    assert sphere.volume(min_extent=10) == pytest.approx(4 / 3 * np.pi * 125)
@@ -0,0 +1,108 @@
+import os
+
+import numpy as np
+import pytest
+
+from pdg3dtiles import (
+    BatchedModel,
+    ContentInfo,
+    Tileset,
+    coalesce_leaf_tiles,
+    combine_leaf_tiles,
+    leaf_tile_from_gdf,
+    parent_tile_from_children_json,
+)
+
+
+@pytest.fixture
+def leaves(gdf, tmp_path):
+    """
+    Leaf tilesets of 5 features each, as tileset JSON paths.
+    """
+    paths = []
+    dir = tmp_path / "leaves"
+    dir.mkdir()
+    for i in range(0, 20, 5):
+        _, tileset = leaf_tile_from_gdf(
+            gdf.iloc[i : i + 5].copy(), dir=str(dir), filename=str(i)
+        )
+        paths.append(tileset.file_path)
+    return paths
+
+
+def content_path(path):
+    tileset = Tileset.from_file(path)
+    return os.path.join(os.path.dirname(path), tileset.root.content.uri)
+
+
+def models(paths):
+    return [BatchedModel.from_file(content_path(path)) for path in paths]
+
+
+def test_merge_offsets_batch_ids(leaves):
+    parts = models(leaves)
+    merged = BatchedModel.from_bytes(BatchedModel.merge(parts).to_bytes())
+    assert merged.batch_length == sum(part.batch_length for part in parts) == 20
+    batch_ids = np.concatenate([ids for _, ids in merged._batch_ids()])
+    assert set(batch_ids.astype(int)) == set(range(20))
+    properties = merged.get_properties()
+    for name in parts[0].get_properties():
+        assert properties[name] == sum(
+            [part.get_properties()[name] for part in parts], []
+        )
+    assert len(merged.gltf["scenes"][0]["nodes"]) == sum(
+        len(part.gltf["scenes"][0]["nodes"]) for part in parts
+    )
+    # The geometry is kept as it is
+    info = ContentInfo.from_bytes(merged.to_bytes())
+    assert info.triangles == sum(
+        ContentInfo.from_bytes(part.to_bytes()).triangles for part in parts
+    )
+
+
+def test_merge_fills_missing_properties(leaves):
+    first, second = models(leaves[:2])
+    first.batch_table["extra"] = list(range(first.batch_length))
+    properties = BatchedModel.merge([first, second]).get_properties()
+    assert properties["extra"] == list(range(5)) + [None] * 5
+
+
+def test_merge_rejects_different_rtc_centers(leaves):
+    first, second = models(leaves[:2])
+    first.feature_table["RTC_CENTER"] = [1.0, 2.0, 3.0]
+    with pytest.raises(ValueError):
+        BatchedModel.merge([first, second])
+    with pytest.raises(ValueError):
+        BatchedModel.merge([])
+
+
+def test_combine_leaf_tilesets(leaves, tmp_path):
+    model, tileset = combine_leaf_tiles(
+        leaves, dir=str(tmp_path / "combined"), filename="all"
+    )
+    assert tileset.root.content.uri == "all.b3dm"
+    assert BatchedModel.from_file(content_path(tileset.file_path)).batch_length == 20
+    errors = [Tileset.from_file(path).geometricError for path in leaves]
+    assert tileset.geometricError == max(errors)
+    assert tileset.root.children is None or tileset.root.children == []
+
+
+def test_combine_rejects_tiles_with_children(leaves, tmp_path):
+    parent = parent_tile_from_children_json(leaves[:2], dir=str(tmp_path))
+    with pytest.raises(ValueError):
+        combine_leaf_tiles([parent.file_path, leaves[2]], dir=str(tmp_path))
+    with pytest.raises(ValueError):
+        combine_leaf_tiles([], dir=str(tmp_path))
+
+
+def test_coalesce_small_siblings(leaves):
+    sizes = [os.path.getsize(content_path(path)) for path in leaves]
+    # Each group needs two tiles to reach min_bytes
+    children = coalesce_leaf_tiles(leaves, min_bytes=max(sizes) + 1)
+    assert len(children) == 2
+    assert all(path.endswith("_combined.json") for path in children)
+    lengths = [models([path])[0].batch_length for path in children]
+    assert lengths == [10, 10]
+
+    # Tiles at least min_bytes large are kept as they are
+    assert coalesce_leaf_tiles(leaves, min_bytes=min(sizes)) == leaves
@@ -0,0 +1,57 @@
+import os
+
+import pytest
+
+from pdg3dtiles import Cesium3DTile, Tileset
+
+
+def make_tiles(gdf, dir, compact_after_write=False):
+    tiles = []
+    for i in range(0, 10, 5):
+        tile = Cesium3DTile()
+        tile.save_to = dir
+        tile.save_as = f"tile{i}"
+        tile.compact_after_write = compact_after_write
+        tile.from_geodataframe(gdf.iloc[i : i + 5].copy())
+        tiles.append(tile)
+    return tiles
+
+
+def test_compact_after_write(gdf, tmp_path):
+    tile = make_tiles(gdf, str(tmp_path), compact_after_write=True)[0]
+    assert tile.geometries == []
+    assert tile.transformed_geometries is None
+    assert tile.gltf is None and tile.batch_table is None
+    assert len(tile.geodataframe) == 0
+    summary = tile.summary
+    assert summary["filename"] == "tile0.b3dm"
+    assert summary["features"] == 5
+    assert summary["bytes"] == os.path.getsize(tmp_path / "tile0.b3dm")
+    assert summary["boundingVolume"] == tile.bounding_volume.to_dict()
+    assert tile.get_summary() is summary
+
+
+def test_compacted_tiles_give_the_same_tileset(gdf, tmp_path):
+    full = make_tiles(gdf, str(tmp_path))
+    compacted = make_tiles(gdf, str(tmp_path), compact_after_write=True)
+    path = str(tmp_path / "tileset.json")
+    expected = Tileset.from_Cesium3DTiles(full, path).to_dict()
+    assert Tileset.from_Cesium3DTiles(compacted, path).to_dict() == expected
+
+
+def test_compacted_volume_is_converted(gdf, tmp_path):
+    tiles = make_tiles(gdf, str(tmp_path), compact_after_write=True)
+    path = str(tmp_path / "tileset.json")
+    tileset = Tileset.from_Cesium3DTiles(tiles, path, bv_type="region")
+    for child in tileset.root.children:
+        assert child.boundingVolume.JSON_KEY == "region"
+
+
+def test_compacted_tiles_have_no_content(gdf, tmp_path):
+    tiles = make_tiles(gdf, str(tmp_path))
+    tiles[0].compact()
+    with pytest.raises(ValueError):
+        tiles[0].get_b3dm()
+    combined = Cesium3DTile()
+    with pytest.raises(ValueError):
+        combined.from_tiles(tiles)
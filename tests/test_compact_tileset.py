@@ -0,0 +1,46 @@
+import json
+
+import numpy as np
+
+from pdg3dtiles import CompactTileset, Tileset
+from .helpers import synthetic_tileset
+
+
+def test_round_trip_json(gdf):
+    data = synthetic_tileset(gdf)
+    compact = CompactTileset.from_json(data)
+    assert len(compact) == len(gdf) + compact.num_children().astype(bool).sum()
+    assert compact.to_dict() == data
+    assert CompactTileset.from_json(compact.to_dict()).to_dict() == data
+
+
+def test_round_trip_file(gdf, tmp_path):
+    data = synthetic_tileset(gdf)
+    path = tmp_path / "tileset.json"
+    CompactTileset.from_json(data).to_file(str(path))
+    with open(path) as f:
+        assert json.load(f) == data
+    assert CompactTileset.from_file(str(path)).to_dict() == data
+
+
+def test_from_tileset_matches_from_json(gdf):
+    data = synthetic_tileset(gdf)
+    from_json = CompactTileset.from_json(data)
+    from_tileset = CompactTileset.from_tileset(Tileset.from_json(data))
+    assert from_tileset.to_dict() == from_json.to_dict()
+    assert np.array_equal(from_tileset.parent, from_json.parent)
+    assert from_tileset.to_tileset().to_dict() == Tileset.from_json(data).to_dict()
+
+
+def test_tree_structure(gdf):
+    compact = CompactTileset.from_json(synthetic_tileset(gdf, fanout=3))
+    # Tiles are numbered depth first, so parents come before their children
+    assert compact.parent[0] == -1
+    assert (compact.parent[1:] < np.arange(1, len(compact))).all()
+    leaves = compact.leaves()
+    assert len(leaves) == len(gdf)
+    assert sorted(compact.get_uri(i) for i in leaves) == sorted(
+        f"tiles/{i}.b3dm" for i in range(len(gdf))
+    )
+    for i in range(len(compact)):
+        assert all(compact.parent[c] == i for c in compact.children(i))
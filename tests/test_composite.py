@@ -0,0 +1,102 @@
+import os
+import struct
+
+import pytest
+
+from pdg3dtiles import (
+    BatchedModel,
+    Composite,
+    ContentInfo,
+    combine_leaf_tiles,
+    leaf_tile_from_gdf,
+)
+
+
+@pytest.fixture
+def leaves(gdf, tmp_path):
+    """
+    Leaf tilesets of 5 features each, as tileset JSON paths.
+    """
+    paths = []
+    for i in range(0, 15, 5):
+        _, tileset = leaf_tile_from_gdf(
+            gdf.iloc[i : i + 5].copy(), dir=str(tmp_path), filename=str(i)
+        )
+        paths.append(tileset.file_path)
+    return paths
+
+
+def b3dm_paths(paths):
+    return [path[: -len(".json")] + ".b3dm" for path in paths]
+
+
+def test_inner_tiles_are_padded_and_kept(leaves):
+    tiles = []
+    for path in b3dm_paths(leaves):
+        with open(path, "rb") as f:
+            tiles.append(f.read())
+    data = Composite(tiles).to_bytes()
+    magic, version, byte_length, tiles_length = struct.unpack("<4s3I", data[:16])
+    assert (magic, version, byte_length, tiles_length) == (b"cmpt", 1, len(data), 3)
+
+    composite = Composite.from_bytes(data)
+    assert len(composite) == 3
+    for inner, tile in zip(composite.tiles, tiles):
+        assert len(inner) % 8 == 0
+        assert struct.unpack("<I", inner[8:12])[0] == len(inner)
+        model, original = BatchedModel.from_bytes(inner), BatchedModel.from_bytes(tile)
+        assert model.get_properties() == original.get_properties()
+        assert model.gltf_binary == original.gltf_binary
+
+
+def test_content_info_adds_inner_tiles(leaves):
+    paths = b3dm_paths(leaves)
+    info = ContentInfo.from_bytes(Composite.from_files(paths).to_bytes())
+    inner = [ContentInfo.from_file(path) for path in paths]
+    assert (info.format, info.tiles) == ("cmpt", 3)
+    assert info.triangles == sum(i.triangles for i in inner)
+
+
+def test_nested_composite(leaves):
+    paths = b3dm_paths(leaves)
+    inner = Composite.from_files(paths[:2])
+    outer = Composite([inner, BatchedModel.from_file(paths[2])])
+    info = ContentInfo.from_bytes(outer.to_bytes())
+    assert info.tiles == 3
+    assert info.triangles == sum(ContentInfo.from_file(p).triangles for p in paths)
+
+
+def test_rejects_other_content():
+    with pytest.raises(ValueError):
+        Composite([b"glTF" + bytes(20)])
+    with pytest.raises(ValueError):
+        Composite.from_bytes(b"b3dm" + bytes(20))
+
+
+def test_combine_leaf_tilesets_into_composite(leaves, tmp_path):
+    composite, tileset = combine_leaf_tiles(
+        leaves, dir=str(tmp_path / "combined"), filename="all", composite=True
+    )
+    assert tileset.root.content.uri == "all.cmpt"
+    saved = Composite.from_file(str(tmp_path / "combined" / "all.cmpt"))
+    assert len(saved) == len(composite) == 3
+    # The batch tables are kept separate
+    for inner in saved.tiles:
+        assert BatchedModel.from_bytes(inner).batch_length == 5
+
+
+def test_leaf_tile_composite_by(gdf, tmp_path):
+    gdf = gdf.iloc[:20].copy()
+    composite, tileset = leaf_tile_from_gdf(
+        gdf, dir=str(tmp_path), filename="leaf", composite_by="class"
+    )
+    assert tileset.root.content.uri == "leaf.cmpt"
+    saved = Composite.from_file(str(tmp_path / "leaf.cmpt"))
+    assert len(saved) == gdf["class"].nunique()
+    classes = []
+    for inner in saved.tiles:
+        values = BatchedModel.from_bytes(inner).get_properties()["class"]
+        assert len(set(values)) == 1
+        classes.append(str(values[0]))
+    assert classes == [str(c) for c in sorted(gdf["class"].unique())]
+    assert os.path.isfile(tileset.file_path)
@@ -0,0 +1,77 @@
+import hashlib
+import os
+
+import pandas as pd
+
+from pdg3dtiles import Cesium3DTile, leaf_tile_from_gdf
+
+
+def content_path(tileset):
+    return os.path.join(os.path.dirname(tileset.file_path), tileset.root.content.uri)
+
+
+def read(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def test_content_is_named_by_its_hash(gdf, tmp_path):
+    _, tileset = leaf_tile_from_gdf(
+        gdf.copy(), dir=str(tmp_path), filename="leaf", content_addressed=True
+    )
+    path = content_path(tileset)
+    digest = hashlib.sha256(read(path)).hexdigest()
+    assert tileset.root.content.uri == digest + ".b3dm"
+    assert tileset.file_path == str(tmp_path / "leaf.json")
+
+
+def test_same_features_give_the_same_bytes(gdf, tmp_path):
+    first, second = tmp_path / "first", tmp_path / "second"
+    tilesets = [
+        leaf_tile_from_gdf(
+            gdf.copy(), dir=str(dir), filename="leaf", content_addressed=True
+        )[1]
+        for dir in (first, second)
+    ]
+    assert tilesets[0].root.content.uri == tilesets[1].root.content.uri
+    assert read(content_path(tilesets[0])) == read(content_path(tilesets[1]))
+
+
+def test_identical_contents_are_stored_once(gdf, tmp_path):
+    uris = []
+    for filename in ("a", "b"):
+        _, tileset = leaf_tile_from_gdf(
+            gdf.iloc[:10].copy(),
+            dir=str(tmp_path),
+            filename=filename,
+            content_addressed=True,
+        )
+        uris.append(tileset.root.content.uri)
+    _, other = leaf_tile_from_gdf(
+        gdf.iloc[10:20].copy(), dir=str(tmp_path), filename="c", content_addressed=True
+    )
+    assert uris[0] == uris[1] != other.root.content.uri
+    b3dms = [name for name in os.listdir(tmp_path) if name.endswith(".b3dm")]
+    assert len(b3dms) == 2
+
+
+def test_duplicated_rows_get_unique_uuids(gdf):
+    tile = Cesium3DTile()
+    # The rows and their index are duplicated
+    doubled = pd.concat([gdf, gdf, gdf])
+    uuids = tile.feature_uuids(doubled)
+    assert len(set(uuids)) == len(doubled)
+    assert tile.feature_uuids(doubled) == uuids
+    # The first copy keeps the UUIDs it has on its own
+    assert uuids[: len(gdf)] == tile.feature_uuids(gdf)
+
+
+def test_uuids_depend_on_the_features(gdf):
+    tile = Cesium3DTile()
+    uuids = tile.feature_uuids(gdf)
+    changed = gdf.copy()
+    changed["class"] = changed["class"] + 1
+    assert not set(uuids) & set(tile.feature_uuids(changed))
+    moved = gdf.copy()
+    moved.index = moved.index + 1000
+    assert not set(uuids) & set(tile.feature_uuids(moved))
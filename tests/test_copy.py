@@ -0,0 +1,62 @@
+import sys
+
+import pytest
+
+from pdg3dtiles import Tile, Tileset, deferred_validation
+
+from .helpers import synthetic_tileset
+
+
+@pytest.fixture
+def tileset(gdf):
+    data = synthetic_tileset(gdf)
+    data["root"]["children"][0]["extras"] = {"names": ["a"]}
+    tileset = Tileset.from_json(data)
+    tileset.file_path = "somewhere/tileset.json"
+    return tileset
+
+
+def test_copy_matches_original(tileset):
+    copy = tileset.copy()
+    assert copy.to_dict() == tileset.to_dict()
+    assert isinstance(copy, Tileset)
+    copy.validate_tree()
+    originals = list(tileset.iter_tiles())
+    copies = list(copy.iter_tiles())
+    assert len(copies) == len(originals)
+    assert not any(c is o for c, o in zip(copies, originals))
+    assert not hasattr(copy, "file_path")
+
+
+def test_copy_is_independent(tileset):
+    before = tileset.to_dict()
+    copy = tileset.copy()
+    child = copy.root.children[0]
+    child.extras["names"].append("b")
+    child.geometricError = 123.0
+    child.children.pop()
+    child.boundingVolume.add(copy.root.children[-1].boundingVolume, inplace=True)
+    copy.root.boundingVolume.update([0.0, 0.0, 0.1, 0.1, 0.0, 1.0])
+    copy.asset.tilesetVersion = "2"
+    assert tileset.to_dict() == before
+
+
+def test_copy_without_subtree(tileset):
+    copy = tileset.root.copy(subtree=False)
+    assert copy.children is None
+    expected = tileset.root.to_dict(exclude=["children"])
+    assert copy.to_dict() == expected
+    assert tileset.root.children
+
+
+def test_copy_of_a_deep_tree():
+    depth = sys.getrecursionlimit() + 100
+    with deferred_validation():
+        tile = Tile(geometricError=0.0)
+        for _ in range(depth):
+            tile = Tile(geometricError=1.0, children=[tile])
+    copy = tile.copy()
+    leaf = copy
+    for _ in range(depth):
+        leaf = leaf.children[0]
+    assert leaf.geometricError == 0.0 and leaf.children is None
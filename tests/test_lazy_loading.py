@@ -0,0 +1,110 @@
+import json
+import os
+
+import pytest
+
+from pdg3dtiles import LazyChildren, Tile, Tileset
+
+from .helpers import synthetic_tileset
+
+
+@pytest.fixture
+def path(gdf, tmp_path):
+    path = str(tmp_path / "tileset.json")
+    with open(path, "w") as f:
+        json.dump(synthetic_tileset(gdf), f)
+    return path
+
+
+def test_children_load_on_access(path):
+    tileset = Tileset.from_file(path, lazy=True)
+    children = tileset.root.children
+    assert isinstance(children, LazyChildren)
+    assert children.loaded() == []
+    first = children[0]
+    assert isinstance(first, Tile)
+    assert children.is_loaded(0)
+    assert not any(children.is_loaded(i) for i in range(1, len(children)))
+    assert children[0] is first
+    # The children of a loaded tile are lazy too
+    if first.children:
+        assert isinstance(first.children, LazyChildren)
+        assert first.children.loaded() == []
+
+
+def test_lazy_matches_eager(path):
+    lazy = Tileset.from_file(path, lazy=True)
+    eager = Tileset.from_file(path)
+    assert lazy.to_dict() == eager.to_dict()
+    assert [t.to_dict() for t in lazy.iter_tiles()] == [
+        t.to_dict() for t in eager.iter_tiles()
+    ]
+
+
+def test_iteration_loads_only_what_is_reached(path):
+    tileset = Tileset.from_file(path, lazy=True)
+    tiles = tileset.iter_tiles()
+    assert next(tiles) is tileset.root
+    first = next(tiles)
+    assert first is tileset.root.children[0]
+    # Only the children of the tiles visited so far are loaded
+    for tile in tileset.root.children.loaded()[1:]:
+        assert tile.children.loaded() == []
+
+
+def test_invalid_child_fails_when_loaded(path):
+    with open(path) as f:
+        data = json.load(f)
+    data["root"]["children"][1]["refine"] = "SOMETIMES"
+    with open(path, "w") as f:
+        json.dump(data, f)
+    tileset = Tileset.from_file(path, lazy=True)
+    tileset.root.children[0]
+    with pytest.raises(ValueError):
+        tileset.root.children[1]
+    unchecked = Tileset.from_file(path, lazy=True, validate=False)
+    assert unchecked.root.children[1].refine == "SOMETIMES"
+
+
+def test_copy_keeps_unloaded_children(path):
+    tileset = Tileset.from_file(path, lazy=True)
+    tileset.root.children[0]
+    copy = tileset.copy()
+    assert isinstance(copy.root.children, LazyChildren)
+    assert copy.root.children.is_loaded(0)
+    assert not copy.root.children.is_loaded(1)
+    assert copy.to_dict() == tileset.to_dict()
+    assert copy.root.children[0] is not tileset.root.children[0]
+
+
+def test_external_tilesets(gdf, path, tmp_path):
+    # Move the first child of the root to an external tileset
+    with open(path) as f:
+        data = json.load(f)
+    child = data["root"]["children"][0]
+    external = {"asset": data["asset"], "geometricError": 1.0, "root": child}
+    os.makedirs(tmp_path / "sub")
+    with open(tmp_path / "sub" / "external.json", "w") as f:
+        json.dump(external, f)
+    data["root"]["children"][0] = {
+        "boundingVolume": child["boundingVolume"],
+        "geometricError": child["geometricError"],
+        "content": {"uri": "sub/external.json"},
+    }
+    with open(path, "w") as f:
+        json.dump(data, f)
+
+    tileset = Tileset.from_file(path, lazy=True)
+    stub = tileset.root.children[0]
+    loaded = stub.get_external_tileset(os.path.dirname(path))
+    assert loaded.root.to_dict() == Tile(**child).to_dict()
+    assert stub.get_external_tileset(os.path.dirname(path)) is loaded
+    assert tileset.root.children[1].get_external_tileset() is None
+
+    def leaves(tiles):
+        return sorted(t.content.uri for t in tiles if t.content is not None)
+
+    expected = sorted(f"tiles/{i}.b3dm" for i in range(len(gdf)))
+    followed = leaves(tileset.iter_tiles(follow_external=True))
+    assert followed == sorted(expected + ["sub/external.json"])
+    assert len(leaves(tileset.iter_tiles())) < len(expected)
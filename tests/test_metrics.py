@@ -0,0 +1,90 @@
+import json
+
+import pytest
+
+from pdg3dtiles import Metrics, leaf_tile_from_gdf, parent_tile_from_children_json
+
+
+@pytest.fixture
+def writes(monkeypatch):
+    """
+    The paths of the Prometheus files written by Metrics, in order.
+    """
+    paths = []
+    write = Metrics.write
+
+    def counted(self, path=None):
+        paths.append(path or self.path)
+        write(self, path)
+
+    monkeypatch.setattr(Metrics, "write", counted)
+    return paths
+
+
+def build(gdf, tmp_path, metrics):
+    leaves = []
+    for i in range(0, 10, 5):
+        _, tileset = leaf_tile_from_gdf(
+            gdf.iloc[i : i + 5].copy(),
+            dir=str(tmp_path),
+            filename=f"leaf{i}",
+            metrics=metrics,
+        )
+        leaves.append(tileset.file_path)
+    return parent_tile_from_children_json(
+        leaves, dir=str(tmp_path), filename="parent", metrics=metrics
+    )
+
+
+def test_prometheus_file_is_written_once_per_tile(gdf, tmp_path, writes):
+    path = str(tmp_path / "metrics.prom")
+    with Metrics(path) as metrics:
+        build(gdf, tmp_path, metrics)
+        assert writes == [path] * 3
+    assert writes == [path] * 3
+
+    counters = metrics.counters
+    assert counters[("tiles_built_total", (("kind", "leaf"),))] == 2
+    assert counters[("tiles_built_total", (("kind", "parent"),))] == 1
+    assert counters[("features_total", (("kind", "leaf"),))] == 10
+    with open(path) as f:
+        text = f.read()
+    assert 'pdg3dtiles_tiles_built_total{kind="leaf"} 2' in text
+    assert 'pdg3dtiles_build_seconds_count{kind="parent"} 1' in text
+
+
+def test_interval_limits_writes(gdf, tmp_path, writes):
+    path = str(tmp_path / "metrics.prom")
+    with Metrics(path, interval=3600) as metrics:
+        build(gdf, tmp_path, metrics)
+        assert writes == [path]
+    # The last updates are written when the metrics are closed
+    assert writes == [path] * 2
+
+
+def test_jsonl_events(gdf, tmp_path):
+    path = str(tmp_path / "metrics.jsonl")
+    with Metrics(path, labels={"job": "test"}) as metrics:
+        build(gdf, tmp_path, metrics)
+    with open(path) as f:
+        events = [json.loads(line) for line in f]
+    built = [e for e in events if e["name"] == "pdg3dtiles_tiles_built_total"]
+    assert [e["labels"]["kind"] for e in built] == ["leaf", "leaf", "parent"]
+    assert all(e["labels"]["job"] == "test" for e in events)
+
+
+def test_errors_are_counted(tmp_path):
+    metrics = Metrics()
+    with pytest.raises(ValueError):
+        parent_tile_from_children_json(
+            [str(tmp_path / "missing.json")], dir=str(tmp_path), metrics=metrics
+        )
+    key = ("errors_total", (("error", "ValueError"), ("kind", "parent")))
+    assert metrics.counters == {key: 1}
+
+
+def test_unknown_metric_and_format():
+    with pytest.raises(ValueError):
+        Metrics().inc("unknown_total")
+    with pytest.raises(ValueError):
+        Metrics("metrics.txt", format="csv")
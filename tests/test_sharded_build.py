@@ -0,0 +1,125 @@
+import json
+import os
+
+import numpy as np
+import pytest
+
+from pdg3dtiles import ShardedBuild, TileMatrix
+
+
+@pytest.fixture
+def cells(gdf):
+    """
+    The synthetic data, with a "cell" column that puts 4 features in each of
+    10 cells.
+    """
+    gdf = gdf.copy()
+    gdf["cell"] = gdf.index // 4
+    return gdf
+
+
+def build(gdf, dir, shard_count):
+    for i in range(shard_count):
+        ShardedBuild(dir, i, shard_count).build(gdf, partition_by="cell")
+
+
+def read_tree(dir):
+    tree = {}
+    for name in os.listdir(dir):
+        if name.startswith("tileset"):
+            with open(os.path.join(dir, name)) as f:
+                tree[name] = json.load(f)
+    return tree
+
+
+def test_every_key_belongs_to_one_shard():
+    keys = [f"{z}/{x}/{y}" for z in range(3) for x in range(5) for y in range(5)]
+    shards = [ShardedBuild("out", i, 4).select(keys) for i in range(4)]
+    assert sorted(sum(shards, [])) == sorted(keys)
+    assert all(shards)
+    assert ShardedBuild.shard_of("1/2/3", 4) == ShardedBuild.shard_of("1/2/3", 4)
+    with pytest.raises(ValueError):
+        ShardedBuild("out", 4, 4)
+
+
+def test_manifests(cells, tmp_path):
+    dir = str(tmp_path)
+    build(cells, dir, 3)
+    names = sorted(os.listdir(tmp_path / "manifests"))
+    assert names == [f"shard-0000{i}-of-00003.json" for i in range(3)]
+    entries = ShardedBuild.read_manifests(dir)
+    assert [entry["key"] for entry in entries] == sorted(str(i) for i in range(10))
+    for entry in entries:
+        assert os.path.isfile(os.path.join(dir, entry["path"]))
+        root = entry["summary"]["root"]
+        assert root["content"]["uri"] == entry["key"] + ".b3dm"
+
+
+def test_missing_manifest(cells, tmp_path):
+    dir = str(tmp_path)
+    ShardedBuild(dir, 0, 3).build(cells, partition_by="cell")
+    ShardedBuild(dir, 2, 3).build(cells, partition_by="cell")
+    with pytest.raises(ValueError, match=r"\[1\]"):
+        ShardedBuild.merge(dir)
+    with pytest.raises(ValueError):
+        ShardedBuild.read_manifests(str(tmp_path / "empty"))
+
+
+def test_merge_matches_one_shard(cells, tmp_path):
+    one, three = str(tmp_path / "one"), str(tmp_path / "three")
+    build(cells, one, 1)
+    build(cells, three, 3)
+    # Parents are built from the manifests, without the leaf JSON files
+    for entry in ShardedBuild.read_manifests(three):
+        os.remove(os.path.join(three, entry["path"]))
+    ShardedBuild.merge(one, fanout=4)
+    root = ShardedBuild.merge(three, fanout=4)
+    assert read_tree(three) == read_tree(one)
+    assert sorted(read_tree(three)) == [
+        "tileset.json",
+        "tileset_0_0.json",
+        "tileset_0_1.json",
+        "tileset_0_2.json",
+    ]
+    assert len(root.root.children) == 3
+
+
+def test_merge_checks_fanout(cells, tmp_path):
+    build(cells, str(tmp_path), 1)
+    with pytest.raises(ValueError):
+        ShardedBuild.merge(str(tmp_path), fanout=1)
+
+
+def grid(z=2):
+    tms = TileMatrix()
+    n = 2**z
+    keys = [f"{z}/{x}/{y}" for x in range(n) for y in range(n)]
+    summaries = [
+        {"root": {"boundingVolume": {"region": tms.region(z, x, y, 0, 10).to_list()}}}
+        for x in range(n)
+        for y in range(n)
+    ]
+    order = np.random.default_rng(0).permutation(len(keys))
+    return [keys[i] for i in order], [summaries[i] for i in order]
+
+
+@pytest.mark.parametrize("use_keys", [True, False])
+def test_spatial_order_groups_quadrants(use_keys):
+    keys, summaries = grid()
+    order = ShardedBuild.spatial_order(summaries, keys if use_keys else None)
+    assert sorted(order) == list(range(len(keys)))
+    xy = np.array([TileMatrix.parse_path(keys[i])[1:] for i in order])
+    # Each run of 4 tiles is one quadrant of the 4 by 4 grid
+    quadrants = xy // 2
+    for start in range(0, 16, 4):
+        assert len({tuple(q) for q in quadrants[start : start + 4]}) == 1
+    assert len({tuple(q) for q in quadrants[::4]}) == 4
+
+
+def test_spatial_order_with_mixed_levels():
+    keys = ["1/0/0", "2/3/3", "2/0/1", "1/1/0"]
+    summaries = [{} for _ in keys]
+    order = ShardedBuild.spatial_order(summaries, keys)
+    # Level 1 tiles are placed at their first cell of level 2
+    assert [keys[i] for i in order] == ["1/0/0", "2/0/1", "1/1/0", "2/3/3"]
+    assert ShardedBuild.spatial_order([]) == []
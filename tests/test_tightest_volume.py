@@ -0,0 +1,87 @@
+import numpy as np
+import pytest
+
+from pdg3dtiles import BoundingVolume, BoundingVolumeArray, Tile
+
+from .helpers import feature_boxes
+
+
+def volumes_of(points):
+    return {t: BoundingVolume.from_ecef_points(points, t) for t in BoundingVolume.TYPES}
+
+
+def test_from_ecef_points_keeps_smallest(gdf):
+    points = BoundingVolume.ecef_points_from_gdf(gdf)
+    candidates = volumes_of(points)
+    tightest = BoundingVolume.from_ecef_points(points, "tightest")
+    smallest = min(v.volume(1.0) for v in candidates.values())
+    assert tightest.volume(1.0) == smallest
+    assert BoundingVolume.from_gdf(gdf, "tightest").to_dict() == tightest.to_dict()
+
+
+def test_long_thin_content_gets_a_box():
+    # A diagonal line of points fits in a thin oriented box, but a region is
+    # aligned to longitude and latitude and a sphere spans the whole line
+    lon = np.deg2rad(np.linspace(-150, -149, 50))
+    lat = np.deg2rad(np.linspace(68, 69, 50))
+    points = np.column_stack(
+        [
+            6378137 * np.cos(lat) * np.cos(lon),
+            6378137 * np.cos(lat) * np.sin(lon),
+            6356752 * np.sin(lat),
+        ]
+    )
+    assert BoundingVolume.from_ecef_points(points, "tightest").JSON_KEY == "box"
+
+
+def test_min_extent_keeps_flat_content_comparable():
+    flat = BoundingVolume([0.0, 0.0, 0.0, 10.0, 0, 0, 0, 10.0, 0, 0, 0, 0.0])
+    sphere = BoundingVolume([0.0, 0.0, 0.0, 3.0])
+    assert flat.volume() == 0
+    assert BoundingVolume.tightest([flat, sphere], min_extent=0) is flat
+    assert BoundingVolume.tightest([flat, sphere], min_extent=1.0) is sphere
+
+
+@pytest.mark.parametrize("type", BoundingVolume.TYPES)
+def test_convert_encloses_the_volume(gdf, type):
+    box = BoundingVolume.from_gdf(gdf, "box")
+    converted = box.convert(type)
+    assert converted.JSON_KEY == type
+    volumes = BoundingVolumeArray.from_volumes([converted.convert("box")])
+    corners = box.get_corners()
+    # Conversions go through sampled points, so allow for rounding
+    grown = BoundingVolumeArray(volumes.values.copy(), "box")
+    grown.values[:, 3:] *= 1 + 1e-9
+    assert grown.contains_points(corners).all()
+
+
+def test_convert_to_unknown_type():
+    with pytest.raises(ValueError):
+        BoundingVolume([0.0, 0.0, 0.0, 1.0]).convert("cylinder")
+
+
+def test_union_volumes_tightest(gdf):
+    boxes = list(feature_boxes(gdf))
+    tightest = BoundingVolumeArray.union_volumes(boxes, "tightest")
+    candidates = [
+        BoundingVolumeArray.union_volumes(boxes, t) for t in BoundingVolume.TYPES
+    ]
+    assert tightest.volume(1.0) == min(c.volume(1.0) for c in candidates)
+
+
+@pytest.mark.parametrize("bv_type", [None, "region", "sphere", "tightest"])
+def test_add_children_bv_type(gdf, bv_type):
+    children = [
+        Tile(boundingVolume=box, geometricError=0.0) for box in feature_boxes(gdf)
+    ]
+    parent = Tile(geometricError=1.0)
+    parent.add_children(
+        children, bv_method="replace", bv_source="root", bv_type=bv_type
+    )
+    expected = "box" if bv_type in (None, "tightest") else bv_type
+    if bv_type == "tightest":
+        union = BoundingVolumeArray.union_volumes(
+            [c.boundingVolume for c in children], "tightest"
+        )
+        expected = union.JSON_KEY
+    assert parent.boundingVolume.JSON_KEY == expected
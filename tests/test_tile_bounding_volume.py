@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+
+from pdg3dtiles import BoundingVolume, Cesium3DTile
+
+
+def make_tile(gdf, dir, bv_type="box"):
+    tile = Cesium3DTile()
+    tile.save_to = dir
+    tile.save_as = "tile"
+    tile.bounding_volume_type = bv_type
+    tile.from_geodataframe(gdf.copy(), write=False)
+    return tile
+
+
+@pytest.mark.parametrize("bv_type", ["box", "region", "sphere"])
+def test_volume_matches_the_geometries(gdf, tmp_path, bv_type):
+    tile = make_tile(gdf, str(tmp_path), bv_type)
+    assert tile.bounding_volume.JSON_KEY == bv_type
+    assert tile.get_bounding_volume() is tile.bounding_volume
+    expected = BoundingVolume.from_z_polygons(tile.transformed_geometries, bv_type)
+    assert np.allclose(
+        tile.bounding_volume.to_list(), expected.to_list(), rtol=1e-6, atol=1e-3
+    )
+
+
+def test_other_types_are_computed(gdf, tmp_path):
+    tile = make_tile(gdf, str(tmp_path), "box")
+    region = tile.get_bounding_volume("region")
+    assert region.JSON_KEY == "region"
+    assert tile.bounding_volume.JSON_KEY == "box"
+
+
+def test_bounding_volume_is_its_own_stage(gdf, tmp_path):
+    tile = make_tile(gdf, str(tmp_path))
+    stages = tile.stats.stages
+    assert stages["bounding_volume"]["calls"] == 1
+    assert stages["tesselate"]["calls"] == 1
+    # The volume is fit after tesselation, not within it
+    assert list(stages).index("bounding_volume") > list(stages).index("tesselate")
+
+
+def test_combined_volume_encloses_the_tiles(gdf, tmp_path):
+    tiles = [make_tile(gdf.iloc[i : i + 10], str(tmp_path), "region") for i in (0, 10)]
+    combined = Cesium3DTile()
+    combined.save_to = str(tmp_path)
+    combined.save_as = "combined"
+    combined.bounding_volume_type = "region"
+    combined.from_tiles(tiles)
+    outer = combined.bounding_volume.to_list()
+    for tile in tiles:
+        inner = tile.bounding_volume.to_list()
+        assert outer[0] <= inner[0] and outer[1] <= inner[1]
+        assert outer[2] >= inner[2] and outer[3] >= inner[3]
+        assert outer[4] <= inner[4] and outer[5] >= inner[5]
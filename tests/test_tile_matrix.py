@@ -0,0 +1,174 @@
+import json
+import os
+
+import numpy as np
+import pytest
+
+from pdg3dtiles import BoundingVolumeArray, TileMatrix
+from .synthetic import GENERATORS
+
+
+@pytest.fixture
+def tms():
+    return TileMatrix()
+
+
+def contains(outer, inner):
+    # Whether region outer contains region inner, as lists of 6 values
+    outer, inner = np.asarray(outer), np.asarray(inner)
+    tol = 1e-12
+    return bool(
+        (outer[[0, 1, 4]] <= inner[[0, 1, 4]] + tol).all()
+        and (outer[[2, 3, 5]] >= inner[[2, 3, 5]] - tol).all()
+    )
+
+
+def test_level_zero(tms):
+    assert tms.matrix_size(0) == (2, 1)
+    assert tms.tile_bounds(0, 0, 0) == (-180, -90, 0, 90)
+    assert tms.tile_bounds(0, 1, 0) == (0, -90, 180, 90)
+
+
+@pytest.mark.parametrize("tile", [(0, 1, 0), (5, 10, 3), (12, 762, 455)])
+def test_children_partition_parent(tms, tile):
+    west, south, east, north = tms.tile_bounds(*tile)
+    children = [tms.tile_bounds(*child) for child in tms.children(*tile)]
+    assert min(c[0] for c in children) == west
+    assert min(c[1] for c in children) == south
+    assert max(c[2] for c in children) == east
+    assert max(c[3] for c in children) == north
+    area = sum((c[2] - c[0]) * (c[3] - c[1]) for c in children)
+    assert area == pytest.approx((east - west) * (north - south))
+    for child in tms.children(*tile):
+        assert tms.parent(*child) == tile
+
+
+def test_rows_count_from_the_north(tms):
+    _, south, _, north = tms.tile_bounds(3, 0, 0)
+    assert north == 90
+    assert tms.tile_bounds(3, 0, 1)[3] == south
+
+
+def test_region_matches_bounds(tms):
+    region = tms.region(12, 762, 455, min_height=-5, max_height=30)
+    bounds = tms.tile_bounds(12, 762, 455)
+    assert np.allclose(np.rad2deg(region.to_list()[:4]), bounds)
+    assert region.to_list()[4:] == [-5, 30]
+
+
+def test_region_margin_contains_tile_and_is_clipped(tms):
+    tile = tms.region(4, 3, 2).to_list()
+    padded = tms.region(4, 3, 2, margin=0.1).to_list()
+    assert contains(padded, tile)
+    assert not contains(tile, padded)
+    west, south, east, north = tms.tile_bounds(0, 0, 0, margin=0.5)
+    assert (west, south, east, north) == (-180, -90, 90, 90)
+
+
+@pytest.mark.parametrize("tile", [(0, 2, 0), (0, 0, 1), (3, -1, 0), (3, 0, 8)])
+def test_tile_outside_of_set(tms, tile):
+    with pytest.raises(ValueError):
+        tms.tile_bounds(*tile)
+
+
+def test_parse_path(tms):
+    path = os.path.join("out", "WorldCRS84Quad", "12", "762", "455.json")
+    assert tms.parse_path(path) == (12, 762, 455)
+    with pytest.raises(ValueError):
+        tms.parse_path(os.path.join("out", "tileset.json"))
+
+
+def test_geometric_error_halves_per_level(tms):
+    assert tms.geometric_error(5) == pytest.approx(2 * tms.geometric_error(6))
+
+
+def leaves_of(gdf, tms, z):
+    # Group the features of a GeoDataFrame by the tile of their first vertex,
+    # with the region around the features of each tile as its summary
+    columns, rows = tms.matrix_size(z)
+    west, south, east, north = tms.bounds
+    groups = {}
+    for i, geom in enumerate(gdf.geometry):
+        x, y = np.asarray(geom.representative_point().coords[0])
+        col = int((x - west) / (east - west) * columns)
+        row = int((north - y) / (north - south) * rows)
+        groups.setdefault((z, col, row), []).append(i)
+    summaries = {}
+    for key, rows in groups.items():
+        regions = BoundingVolumeArray.from_gdf(gdf.iloc[rows], type="region")
+        region = regions.union_all().to_list()
+        region[4:] = [0.0, 10.0]
+        summaries[key] = {
+            "tileset": {"asset": {"version": "1.0"}, "geometricError": 1.0},
+            "root": {"boundingVolume": {"region": region}, "geometricError": 1.0},
+        }
+    return summaries
+
+
+def uncontained_leaves(path, leaf_regions):
+    # Check that every tile's region contains the regions of its children, and
+    # list the leaf entries whose region does not contain all of their features
+    with open(path) as f:
+        tileset = json.load(f)
+    region = tileset["root"]["boundingVolume"]["region"]
+    uncontained = []
+    for child in tileset["root"]["children"]:
+        assert contains(region, child["boundingVolume"]["region"])
+        child_path = os.path.normpath(
+            os.path.join(os.path.dirname(path), child["content"]["uri"])
+        )
+        if child_path in leaf_regions:
+            if not contains(
+                child["boundingVolume"]["region"], leaf_regions[child_path]
+            ):
+                uncontained.append(child_path)
+        else:
+            uncontained += uncontained_leaves(child_path, leaf_regions)
+    return uncontained
+
+
+def build_leaves(gdf, tms, tmp_path, z=10, **kwargs):
+    summaries = leaves_of(gdf, tms, z)
+    leaves = {
+        key: os.path.join(str(tmp_path), *map(str, key)) + ".json" for key in summaries
+    }
+    leaf_regions = {
+        os.path.normpath(leaves[key]): summary["root"]["boundingVolume"]["region"]
+        for key, summary in summaries.items()
+    }
+    if kwargs.pop("summaries", False):
+        kwargs["summaries"] = summaries
+    root = tms.build_pyramid(leaves, str(tmp_path), min_z=6, max_height=10, **kwargs)
+    assert root.file_path == os.path.join(str(tmp_path), "tileset.json")
+    return uncontained_leaves(root.file_path, leaf_regions)
+
+
+def test_build_pyramid_contains_summaries(gdf, tms, tmp_path):
+    assert build_leaves(gdf, tms, tmp_path, margin=0, summaries=True) == []
+
+
+def test_build_pyramid_without_margin_misses_overhangs(tms, tmp_path):
+    # Features are grouped by one of their points, so the larger ones overhang
+    # their tile, and only a margin or summaries keep them in its region
+    gdf = GENERATORS["multipolygons"](40, seed=1)
+    assert build_leaves(gdf, tms, tmp_path / "bare", margin=0) != []
+    assert build_leaves(gdf, tms, tmp_path / "margin", margin=2) == []
+
+
+def test_build_pyramid_levels(tms, tmp_path):
+    leaves = {
+        (3, x, y): f"{tmp_path}/3/{x}/{y}.json" for x in (0, 1, 4) for y in (0, 1)
+    }
+    root = tms.build_pyramid(leaves, str(tmp_path), min_z=1)
+    # 3/0-1/0-1 share the parent 2/0/0, and 3/4/0-1 have the parent 2/2/0
+    assert sorted(os.listdir(tmp_path / "2")) == ["0", "2"]
+    assert sorted(os.listdir(tmp_path / "1")) == ["0", "1"]
+    assert [c.content.uri for c in root.root.children] == ["1/0/0.json", "1/1/0.json"]
+    with open(tmp_path / "2" / "0" / "0.json") as f:
+        assert len(json.load(f)["root"]["children"]) == 4
+
+
+def test_build_pyramid_leaf_and_parent(tms, tmp_path):
+    leaves = {(3, 0, 0): "a/3/0/0.json", (2, 0, 0): "a/2/0/0.json"}
+    with pytest.raises(ValueError):
+        tms.build_pyramid(leaves, str(tmp_path))
@@ -0,0 +1,68 @@
+import pytest
+
+from pdg3dtiles import TileStats, leaf_tile_from_gdf
+
+
+def allocate(size):
+    # Allocate and free about size bytes
+    data = bytearray(size)
+    del data
+
+
+def test_nested_stage_keeps_outer_peak():
+    stats = TileStats()
+    stats.track_memory = True
+    with stats.stage("outer"):
+        allocate(4_000_000)
+        with stats.stage("inner"):
+            allocate(1_000_000)
+        with stats.stage("inner"):
+            pass
+    outer, inner = stats.stages["outer"], stats.stages["inner"]
+    assert inner["calls"] == 2
+    assert 1_000_000 <= inner["peak_memory"] < 4_000_000
+    assert outer["peak_memory"] >= 4_000_000
+
+
+def test_inner_peak_is_folded_into_outer():
+    stats = TileStats()
+    stats.track_memory = True
+    with stats.stage("outer"):
+        allocate(1_000_000)
+        with stats.stage("inner"):
+            allocate(4_000_000)
+    assert stats.stages["inner"]["peak_memory"] >= 4_000_000
+    assert stats.stages["outer"]["peak_memory"] >= 4_000_000
+
+
+def test_memory_is_not_tracked_by_default():
+    stats = TileStats()
+    with stats.stage("outer"):
+        with stats.stage("inner"):
+            allocate(1_000_000)
+    assert stats.stages["outer"]["peak_memory"] is None
+    assert stats.stages["outer"]["calls"] == stats.stages["inner"]["calls"] == 1
+
+
+def test_hooks_get_each_call():
+    records = []
+    stats = TileStats("tile")
+    stats.add_hook(lambda tile, stage, record: records.append((tile, stage, record)))
+    for _ in range(3):
+        with stats.stage("write"):
+            pass
+    assert [(tile, stage) for tile, stage, _ in records] == [("tile", "write")] * 3
+    assert stats.stages["write"]["wall"] == pytest.approx(
+        sum(record["wall"] for _, _, record in records)
+    )
+
+
+def test_leaf_tile_stats(gdf, tmp_path):
+    tile, _ = leaf_tile_from_gdf(gdf.copy(), dir=str(tmp_path), filename="leaf")
+    stats = tile.stats.to_dict()
+    assert stats["features"] == len(gdf)
+    assert stats["triangles"] == stats["vertices"] // 3 > 0
+    assert stats["bytes"] == (tmp_path / "leaf.b3dm").stat().st_size
+    for stage in ("tesselate", "gltf", "batch_table", "write"):
+        assert stats["stages"][stage]["calls"] >= 1
+    assert stats["wall"] == pytest.approx(tile.stats.total("wall"))
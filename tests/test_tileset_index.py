@@ -0,0 +1,86 @@
+import json
+import os
+
+import numpy as np
+import pytest
+
+from pdg3dtiles import Tileset, TilesetIndex, TilesetWriter
+
+from .helpers import synthetic_tileset
+
+
+@pytest.fixture
+def path(gdf, tmp_path):
+    path = str(tmp_path / "tileset.json")
+    with open(path, "w") as f:
+        json.dump(synthetic_tileset(gdf), f)
+    return path
+
+
+def brute_force(index, bbox):
+    west, south, east, north = bbox
+    b = index.bounds
+    return np.nonzero(
+        (b[:, 0] <= east) & (b[:, 2] >= west) & (b[:, 1] <= north) & (b[:, 3] >= south)
+    )[0]
+
+
+def test_query_matches_brute_force(gdf, path):
+    index = TilesetIndex.from_file(path)
+    assert len(index) == len(list(Tileset.from_file(path).iter_tiles()))
+    assert index.leaf.sum() == len(gdf)
+    west, south, east, north = gdf.total_bounds
+    rng = np.random.default_rng(0)
+    for _ in range(20):
+        x = np.sort(rng.uniform(west, east, 2))
+        y = np.sort(rng.uniform(south, north, 2))
+        bbox = (x[0], y[0], x[1], y[1])
+        assert np.array_equal(index.query(bbox), brute_force(index, bbox))
+        leaves = index.query(bbox, leaves_only=True)
+        assert index.leaf[leaves].all()
+
+
+def test_leaf_at_feature(gdf, path):
+    index = TilesetIndex.from_file(path)
+    for i, geom in enumerate(gdf.geometry):
+        point = geom.representative_point()
+        uris = [index.get_uri(t) for t in index.leaf_at(point.x, point.y)]
+        assert f"tiles/{i}.b3dm" in uris
+
+
+def test_ancestors_lead_to_the_root(path):
+    index = TilesetIndex.from_file(path)
+    for leaf in np.nonzero(index.leaf)[0]:
+        ancestors = index.ancestors(leaf)
+        assert ancestors[-1] == 0
+        west, south, east, north = index.bounds[leaf]
+        for a in ancestors:
+            assert index.bounds[a][0] <= west and index.bounds[a][2] >= east
+            assert index.bounds[a][1] <= south and index.bounds[a][3] >= north
+
+
+def test_external_tilesets_are_followed(gdf, path, tmp_path):
+    sharded = str(tmp_path / "sharded" / "tileset.json")
+    os.makedirs(os.path.dirname(sharded))
+    files = TilesetWriter().write_sharded(Tileset.from_file(path), sharded, max_nodes=6)
+    index = TilesetIndex.from_file(sharded)
+    assert sorted(index.files) == sorted(os.path.basename(f) for f in files)
+    leaves = sorted(index.get_uri(i) for i in np.nonzero(index.leaf)[0])
+    assert leaves == sorted(f"tiles/{i}.b3dm" for i in range(len(gdf)))
+    shallow = TilesetIndex.from_file(sharded, follow_external=False)
+    assert shallow.files == ["tileset.json"]
+    assert TilesetIndex.from_directory(os.path.dirname(sharded)).leaf.sum() == len(gdf)
+    uris = index.query_uris(gdf.total_bounds, leaves_only=True)
+    assert sorted(uris) == leaves
+
+
+def test_save_and_load(path, tmp_path):
+    index = TilesetIndex.from_file(path)
+    saved = str(tmp_path / "index.npz")
+    index.save(saved)
+    loaded = TilesetIndex.load(saved)
+    for name in TilesetIndex.ARRAYS:
+        assert np.array_equal(getattr(loaded, name), getattr(index, name))
+    assert loaded.uris == index.uris and loaded.files == index.files
+    bbox = tuple(index.bounds[5])
+    assert np.array_equal(loaded.query(bbox), index.query(bbox))
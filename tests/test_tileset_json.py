@@ -0,0 +1,86 @@
+import json
+
+import numpy as np
+import pytest
+
+from pdg3dtiles import Tile, Tileset, TilesetWriter
+
+from .helpers import synthetic_tileset
+
+
+@pytest.fixture
+def tileset(gdf):
+    data = synthetic_tileset(gdf)
+    data["root"]["transform"] = [float(i) for i in range(16)]
+    data["root"]["children"][0]["extras"] = {"names": ["a", "b"], "empty": {}}
+    return Tileset.from_json(data)
+
+
+@pytest.mark.parametrize("precision", [None, 2])
+def test_streamed_json_matches_dict(tileset, precision):
+    expected = TilesetWriter(precision=precision).to_dict(tileset)
+    minified = tileset.to_bytes(precision=precision)
+    assert minified == json.dumps(expected, separators=(",", ":")).encode()
+    pretty = tileset.to_bytes(minify=False, precision=precision)
+    assert pretty == json.dumps(expected, separators=(",", ": "), indent=2).encode()
+
+
+@pytest.mark.parametrize("minify", [True, False])
+def test_to_file_matches_to_bytes(tileset, tmp_path, minify):
+    path = str(tmp_path / "tileset.json")
+    tileset.to_file(path, minify=minify)
+    with open(path, "rb") as f:
+        assert f.read() == tileset.to_bytes(minify=minify)
+    assert tileset.file_path == path
+    assert Tileset.from_file(path).to_dict() == tileset.to_dict()
+
+
+@pytest.mark.parametrize("minify", [True, False])
+def test_tree_dict_is_never_built(tileset, monkeypatch, minify):
+    # Only single tiles, without their children, are converted to dicts
+    to_dict = Tile.to_dict
+
+    def tile_to_dict(self, exclude=None):
+        assert "children" in (exclude or [])
+        return to_dict(self, exclude)
+
+    monkeypatch.setattr(Tile, "to_dict", tile_to_dict)
+    tileset.to_bytes(minify=minify)
+
+
+def test_precision(tileset):
+    data = json.loads(tileset.to_bytes(precision=2))
+    root = data["root"]
+    region = root["boundingVolume"]["region"]
+    assert region[:4] == [round(v, 9) for v in region[:4]]
+    assert region[4:] == [round(v, 2) for v in region[4:]]
+    assert region[:4] != [round(v, 2) for v in region[:4]]
+    writer = TilesetWriter(precision=1, radian_precision=3)
+    rounded = writer.round_bounding_volume(
+        {"region": [0.12345] * 6, "box": [1.26] * 12, "sphere": [1.26] * 4}
+    )
+    assert rounded["region"] == [0.123] * 4 + [0.1] * 2
+    assert rounded["box"] == [1.3] * 12
+    assert rounded["sphere"] == [1.3] * 4
+
+
+def test_numpy_values():
+    tile = Tile(
+        boundingVolume={"sphere": [0.0, 0.0, 0.0, 1.0]},
+        geometricError=np.float64(2.5),
+        extras={"ids": np.arange(3), "n": np.int64(4)},
+    )
+    data = json.loads(TilesetWriter().dumps(tile))
+    assert data["geometricError"] == 2.5
+    assert data["extras"] == {"ids": [0, 1, 2], "n": 4}
+
+
+def test_orjson_backend(tileset):
+    pytest.importorskip("orjson")
+    data = tileset.to_bytes(json_backend="orjson")
+    assert json.loads(data) == json.loads(tileset.to_bytes())
+
+
+def test_unknown_backend():
+    with pytest.raises(ValueError):
+        TilesetWriter(backend="yaml")
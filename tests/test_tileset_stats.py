@@ -0,0 +1,89 @@
+import json
+
+import numpy as np
+import pytest
+
+from pdg3dtiles import Tileset, TilesetStats
+
+from .helpers import synthetic_tileset, write_glb
+
+
+@pytest.fixture
+def data(gdf):
+    return synthetic_tileset(gdf)
+
+
+def write(data, tmp_path, missing=()):
+    """
+    Write a tileset and a GLB for each leaf that is not missing, with i + 1
+    triangles for leaf i.
+    """
+    path = str(tmp_path / "tileset.json")
+    with open(path, "w") as f:
+        json.dump(data, f)
+    sizes = {}
+    for tile in Tileset.from_file(path).iter_tiles():
+        uri = tile.content.uri if tile.content else None
+        if uri and uri not in missing:
+            i = int(uri[len("tiles/") : -len(".b3dm")])
+            sizes[uri] = write_glb(str(tmp_path / uri), i + 1)
+    return path, sizes
+
+
+def test_counts_and_sizes(gdf, data, tmp_path):
+    path, sizes = write(data, tmp_path)
+    stats = TilesetStats.from_file(path)
+    tiles = stats.tiles
+    assert len(tiles) == len(list(Tileset.from_file(path).iter_tiles()))
+    assert tiles["uri"].count() == len(gdf)
+    assert tiles["triangles"].sum() == sum(range(1, len(gdf) + 1))
+    assert tiles["byte_length"].sum() == sum(sizes.values())
+    assert (tiles["parent"] < tiles.index).all()
+
+    levels = stats.levels()
+    assert levels["tiles"].sum() == len(tiles)
+    assert levels["tiles"].iloc[0] == 1
+    assert levels["contents"].iloc[-1] == len(gdf)
+    problems = stats.problems()
+    assert problems["missing_content"] == problems["error_increasing"] == []
+
+
+def test_problems(gdf, data, tmp_path):
+    # Make the first leaf's error larger than its parent's, and the children
+    # of the root cover the same area
+    first = data["root"]["children"][0]["children"][0]["children"][0]
+    first["geometricError"] = 1e6
+    for child in data["root"]["children"]:
+        child["boundingVolume"] = data["root"]["boundingVolume"]
+    path, _ = write(data, tmp_path, missing=("tiles/1.b3dm",))
+    stats = TilesetStats.from_file(path)
+    tiles = stats.tiles
+
+    problems = stats.problems()
+    assert tiles.loc[problems["missing_content"], "uri"].tolist() == ["tiles/1.b3dm"]
+    assert tiles.loc[problems["error_increasing"], "uri"].tolist() == ["tiles/0.b3dm"]
+    assert 0 in problems["overlapping_children"]
+    # Of n identical boxes, all but one box's area is covered more than once
+    n = len(data["root"]["children"])
+    assert tiles.loc[0, "overlap"] == pytest.approx(1 - 1 / n)
+
+
+def test_overlap_ratio_of_disjoint_tiles(data):
+    tileset = Tileset.from_json(data)
+    leaves = [tile for tile in tileset.iter_tiles() if tile.content]
+    # The geohash cells do not overlap, and the other features mostly do not
+    assert TilesetStats.overlap_ratio(leaves[:1]) is np.nan
+    assert 0 <= TilesetStats.overlap_ratio(leaves) < 0.5
+
+
+def test_to_json(gdf, data, tmp_path):
+    path, _ = write(data, tmp_path)
+    stats = TilesetStats.from_file(path)
+    stats.to_json(str(tmp_path / "stats.json"), n=3)
+    with open(tmp_path / "stats.json") as f:
+        summary = json.load(f)
+    assert summary["summary"]["tiles"] == len(stats.tiles)
+    assert summary["summary"]["contents"] == len(gdf)
+    assert len(summary["largest_content"]) == 3
+    assert summary["most_triangles"][0]["uri"] == f"tiles/{len(gdf) - 1}.b3dm"
+    assert summary["geometric_error"]["1"] == stats.tiles["geometric_error"].max()
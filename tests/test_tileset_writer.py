@@ -0,0 +1,107 @@
+import json
+import os
+
+import pytest
+
+from pdg3dtiles import Tileset, TilesetWriter
+from .helpers import synthetic_tileset
+
+
+def read(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def reassemble(tile, directory, files):
+    # Replace each tile that points to an external tileset written by
+    # write_sharded with the root of that tileset
+    uri = tile.get("content", {}).get("uri", "")
+    if uri in files:
+        root = dict(read(os.path.join(directory, uri))["root"])
+        if "transform" in tile:
+            root["transform"] = tile["transform"]
+        tile = root
+    if "children" in tile:
+        tile = dict(tile)
+        tile["children"] = [reassemble(c, directory, files) for c in tile["children"]]
+    return tile
+
+
+def walk(tile, depth=0):
+    yield tile, depth
+    for child in tile.get("children", []):
+        yield from walk(child, depth + 1)
+
+
+def is_stub(tile):
+    return tile.get("content", {}).get("uri", "").endswith(".json")
+
+
+def minified_size(tile):
+    return len(json.dumps(tile, separators=(",", ":")))
+
+
+# Node budgets are at least 1 + fanout, the tiles of a parent and the stubs of
+# its children, which is the smallest file that write_sharded can write
+BUDGETS = [
+    {"max_nodes": 7},
+    {"max_nodes": 5},
+    {"max_depth": 1},
+    {"max_bytes": 1500},
+    {"max_bytes": 3000, "max_nodes": 10, "max_depth": 2},
+]
+
+
+@pytest.mark.parametrize("budget", BUDGETS)
+def test_write_sharded_round_trip(gdf, tmp_path, budget):
+    data = synthetic_tileset(gdf)
+    path = str(tmp_path / "tileset.json")
+    paths = TilesetWriter().write_sharded(Tileset.from_json(data), path, **budget)
+    assert paths[0] == path
+    assert len(paths) > 1
+    files = {os.path.basename(p) for p in paths[1:]}
+    root = reassemble(read(path)["root"], str(tmp_path), files)
+    assert root == Tileset.from_json(data).to_dict()["root"]
+
+
+@pytest.mark.parametrize("budget", BUDGETS)
+def test_write_sharded_budgets(gdf, tmp_path, budget):
+    data = synthetic_tileset(gdf)
+    path = str(tmp_path / "tileset.json")
+    paths = TilesetWriter().write_sharded(Tileset.from_json(data), path, **budget)
+    for p in paths:
+        root = read(p)["root"]
+        tiles = list(walk(root))
+        if "max_nodes" in budget:
+            assert len(tiles) <= budget["max_nodes"]
+        if "max_depth" in budget:
+            depths = [depth for tile, depth in tiles if not is_stub(tile)]
+            assert max(depths) <= budget["max_depth"]
+            assert max(depth for _, depth in tiles) <= budget["max_depth"] + 1
+        if "max_bytes" in budget:
+            assert minified_size(root) <= budget["max_bytes"]
+
+
+def test_external_tilesets_keep_the_geometric_error(gdf, tmp_path):
+    data = synthetic_tileset(gdf)
+    path = str(tmp_path / "tileset.json")
+    paths = TilesetWriter().write_sharded(Tileset.from_json(data), path, max_nodes=5)
+    for p in paths[1:]:
+        external = read(p)
+        assert external["geometricError"] == external["root"]["geometricError"]
+        assert external["asset"] == data["asset"]
+
+
+def test_plan_shards_without_budgets(gdf):
+    tileset = Tileset.from_json(synthetic_tileset(gdf))
+    writer = TilesetWriter()
+    assert writer.plan_shards(tileset.root) == []
+    assert writer.plan_shards(tileset.root, max_nodes=10**6) == []
+
+
+def test_plan_shards_moves_largest_subtrees_first(gdf):
+    tileset = Tileset.from_json(synthetic_tileset(gdf, fanout=2))
+    cuts = TilesetWriter().plan_shards(tileset.root, max_nodes=len(gdf))
+    # The tree has about 2 * len(gdf) tiles, so about half of it is moved,
+    # in a few large subtrees rather than many small ones
+    assert 0 < len(cuts) <= 3
@@ -0,0 +1,155 @@
+import json
+import os
+
+import pytest
+
+from pdg3dtiles import BoundingVolumeRegion, Camera, Tileset, TraversalSimulator
+
+from .helpers import synthetic_tileset, write_glb
+
+
+@pytest.fixture
+def path(gdf, tmp_path):
+    """
+    The synthetic tileset, with a GLB for each leaf that has i + 1 triangles.
+    """
+    path = str(tmp_path / "tileset.json")
+    with open(path, "w") as f:
+        json.dump(synthetic_tileset(gdf), f)
+    for i in range(len(gdf)):
+        write_glb(str(tmp_path / "tiles" / f"{i}.b3dm"), i + 1)
+    return path
+
+
+def above(geom, height):
+    point = geom.representative_point()
+    return Camera.from_geodetic(point.x, point.y, height)
+
+
+def test_far_camera_shows_nothing(gdf, path):
+    west, south, east, north = gdf.total_bounds
+    camera = Camera.from_geodetic((west + east) / 2, (south + north) / 2, 1e8)
+    result = TraversalSimulator(path).simulate(camera)
+    assert result["requests"] == 0
+    assert result["rendered"] == []
+
+
+def test_close_camera_renders_the_leaf_below(gdf, path):
+    simulator = TraversalSimulator(path)
+    for i in (0, len(gdf) // 2):
+        result = simulator.simulate(above(gdf.geometry.iloc[i], 50))
+        assert os.path.join("tiles", f"{i}.b3dm") in result["rendered"]
+        # The parents are refined (REPLACE) and have no content
+        assert result["rendered"] == result["requested"]
+        assert result["rendered_tiles"] == len(result["rendered"])
+        numbers = [int(os.path.basename(p)[:-5]) for p in result["rendered"]]
+        assert result["triangles"] == sum(n + 1 for n in numbers)
+        sizes = [
+            os.path.getsize(os.path.join(simulator.base_dir, p))
+            for p in result["rendered"]
+        ]
+        assert result["bytes"] == sum(sizes)
+
+
+def test_camera_looking_away_culls_the_root(gdf, path):
+    point = gdf.geometry.iloc[0].representative_point()
+    camera = Camera.from_geodetic(point.x, point.y, 1e4, pitch=90)
+    result = TraversalSimulator(path, maximum_sse=1e-3).simulate(camera)
+    assert result["rendered"] == []
+    assert result["visited"] == result["culled"] == 1
+
+
+def test_larger_sse_renders_less(gdf, path):
+    west, south, east, north = gdf.total_bounds
+    height = 2 * max(east - west, north - south) * 111e3
+    camera = Camera.from_geodetic((west + east) / 2, (south + north) / 2, height)
+    visited = [
+        TraversalSimulator(path, maximum_sse=sse).simulate(camera)["visited"]
+        for sse in (1e-3, 1, 1e3)
+    ]
+    assert visited[0] >= visited[1] >= visited[2]
+    assert visited[0] == len(list(Tileset.from_file(path).iter_tiles()))
+
+
+def test_path_requests_cached_content_once(gdf, path):
+    simulator = TraversalSimulator(path)
+    cameras = [above(gdf.geometry.iloc[i], 50) for i in (0, 1, 0)]
+    result = simulator.simulate_path(cameras)
+    views = result["views"]
+    assert views[2]["new_requests"] == views[2]["new_bytes"] == 0
+    assert views[2]["requested"] == views[0]["requested"]
+    unique = set().union(*[view["requested"] for view in views])
+    assert result["total"]["requests"] == len(unique)
+    assert result["total"]["max_triangles"] == max(v["triangles"] for v in views)
+
+
+def small_tileset(tmp_path, refine, root_error=1.0):
+    """
+    A root tile with content and one child tile with content over the same
+    area, around (0, 0).
+    """
+    region = BoundingVolumeRegion.values_list_from_degrees(
+        -0.001, -0.001, 0.001, 0.001, 0, 10
+    )
+    for name in ("root", "child"):
+        write_glb(str(tmp_path / f"{name}.b3dm"), 1)
+    data = {
+        "asset": {"version": "1.0"},
+        "geometricError": 1000.0,
+        "root": {
+            "boundingVolume": {"region": region},
+            "geometricError": root_error,
+            "refine": refine,
+            "content": {"uri": "root.b3dm"},
+            "children": [
+                {
+                    "boundingVolume": {"region": region},
+                    "geometricError": 0.0,
+                    "content": {"uri": "child.b3dm"},
+                }
+            ],
+        },
+    }
+    path = str(tmp_path / "tileset.json")
+    with open(path, "w") as f:
+        json.dump(data, f)
+    return path
+
+
+@pytest.mark.parametrize(
+    "refine, rendered",
+    [("ADD", ["root.b3dm", "child.b3dm"]), ("REPLACE", ["child.b3dm"])],
+)
+def test_refinement(tmp_path, refine, rendered):
+    path = small_tileset(tmp_path, refine)
+    result = TraversalSimulator(path).simulate(Camera.from_geodetic(0, 0, 20))
+    assert result["rendered"] == rendered
+
+
+def test_root_is_not_refined_from_far(tmp_path):
+    path = small_tileset(tmp_path, "REPLACE")
+    result = TraversalSimulator(path).simulate(Camera.from_geodetic(0, 0, 1e4))
+    assert result["rendered"] == ["root.b3dm"]
+
+
+def test_external_tileset_is_requested_and_traversed(tmp_path):
+    os.makedirs(tmp_path / "sub")
+    small_tileset(tmp_path / "sub", "REPLACE")
+    region = BoundingVolumeRegion.values_list_from_degrees(
+        -0.001, -0.001, 0.001, 0.001, 0, 10
+    )
+    data = {
+        "asset": {"version": "1.0"},
+        "geometricError": 1000.0,
+        "root": {
+            "boundingVolume": {"region": region},
+            "geometricError": 100.0,
+            "content": {"uri": "sub/tileset.json"},
+        },
+    }
+    path = str(tmp_path / "tileset.json")
+    with open(path, "w") as f:
+        json.dump(data, f)
+    result = TraversalSimulator(path).simulate(Camera.from_geodetic(0, 0, 20))
+    assert result["requested"][0] == os.path.join("sub", "tileset.json")
+    assert result["rendered"] == [os.path.join("sub", "child.b3dm")]
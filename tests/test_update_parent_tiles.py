@@ -0,0 +1,191 @@
+import glob
+import json
+import os
+
+import numpy as np
+import pytest
+
+from pdg3dtiles import (
+    BoundingVolumeRegion,
+    TileMatrix,
+    build_tree_index,
+    parent_tile_from_children_json,
+    tile_summary,
+    update_parent_tiles,
+)
+
+
+def write_leaf(path, region, error):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    data = {
+        "asset": {"version": "1.0"},
+        "geometricError": error,
+        "root": {
+            "boundingVolume": {"region": list(region)},
+            "geometricError": error,
+            "content": {"uri": os.path.basename(path)[:-5] + ".b3dm"},
+        },
+    }
+    with open(path, "w") as f:
+        json.dump(data, f)
+
+
+def read(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def read_tree(dir):
+    paths = glob.glob(os.path.join(dir, "**", "*.json"), recursive=True)
+    return {os.path.relpath(path, dir): read(path) for path in paths}
+
+
+def leaf_region(bounds, grow=0.0):
+    west, south, east, north = bounds
+    return BoundingVolumeRegion.values_list_from_degrees(
+        west, south, east + grow, north + grow, 0, 10
+    )
+
+
+def build_tree(gdf, dir, changed=None, fanout=4):
+    """
+    Write a leaf for each feature, then parents of fanout tiles until there
+    is one root, and return the path of the root. changed maps the number of
+    a leaf to a new geometric error, and the regions of those leaves are
+    grown.
+    """
+    changed = changed or {}
+    level = []
+    for i, bounds in enumerate(gdf.geometry.bounds.values):
+        path = os.path.join(dir, "leaves", f"{i}.json")
+        if i in changed:
+            write_leaf(path, leaf_region(bounds, 0.5), changed[i])
+        else:
+            write_leaf(path, leaf_region(bounds), 1.0 + i % 3)
+        level.append(path)
+    z = 0
+    while len(level) > 1:
+        parents = []
+        for start in range(0, len(level), fanout):
+            parent = parent_tile_from_children_json(
+                level[start : start + fanout],
+                dir=os.path.join(dir, str(z)),
+                filename=str(start // fanout),
+            )
+            parents.append(parent.file_path)
+        level = parents
+        z += 1
+    return level[0]
+
+
+@pytest.mark.parametrize("cached", [False, True])
+@pytest.mark.parametrize("error", [99.0, 0.5])
+def test_update_matches_full_rebuild(gdf, tmp_path, error, cached):
+    updated, rebuilt = str(tmp_path / "updated"), str(tmp_path / "rebuilt")
+    root = build_tree(gdf, updated)
+    before = read_tree(updated)
+    summaries = {}
+    if cached:
+        summaries = {
+            os.path.join(updated, p): tile_summary(os.path.join(updated, p))
+            for p in before
+        }
+
+    # Leaf 0 is the first child of each of its ancestors
+    changed = {0: error, 17: error / 2}
+    build_tree(gdf, rebuilt, changed)
+    paths = []
+    for i, new_error in changed.items():
+        paths.append(os.path.join(updated, "leaves", f"{i}.json"))
+        write_leaf(
+            paths[-1], leaf_region(gdf.geometry.bounds.values[i], 0.5), new_error
+        )
+    written = update_parent_tiles(paths, build_tree_index(updated), summaries)
+
+    assert written[-1] == root
+    after = read_tree(updated)
+    assert after == read_tree(rebuilt)
+    rewritten = {os.path.relpath(p, updated) for p in written + paths}
+    assert {p for p in after if after[p] != before[p]} == rewritten
+    assert summaries[root] == tile_summary(root)
+
+
+def pyramid_leaves(dir, error=1.0):
+    tms = TileMatrix()
+    leaves = {}
+    for x in (0, 1, 4):
+        for y in (0, 1):
+            path = os.path.join(dir, "3", str(x), f"{y}.json")
+            write_leaf(path, tms.region(3, x, y, 0, 10).to_list(), error)
+            leaves[(3, x, y)] = path
+    return tms, leaves
+
+
+def test_pyramid_errors_are_kept(tmp_path):
+    dir = str(tmp_path)
+    tms, leaves = pyramid_leaves(dir)
+    root = tms.build_pyramid(leaves, dir, max_height=10)
+    before = read_tree(dir)
+
+    # The new leaf is larger than its tile, and has another error
+    leaf = leaves[(3, 0, 0)]
+    region = tms.region(3, 0, 0, 0, 50, margin=0.5).to_list()
+    write_leaf(leaf, region, 99.0)
+    written = update_parent_tiles([leaf], build_tree_index(dir))
+    assert written[0] == os.path.join(dir, "2", "0", "0.json")
+    assert written[-1] == root.file_path
+
+    after = read_tree(dir)
+    for path in [os.path.relpath(p, dir) for p in written]:
+        assert after[path]["geometricError"] == before[path]["geometricError"]
+        assert after[path]["root"]["geometricError"] == (
+            before[path]["root"]["geometricError"]
+        )
+        errors = [c["geometricError"] for c in after[path]["root"]["children"]]
+        assert errors == [c["geometricError"] for c in before[path]["root"]["children"]]
+    entry = after["2/0/0.json"]["root"]["children"][0]
+    assert entry["boundingVolume"]["region"] == region
+    parent_region = after["2/0/0.json"]["root"]["boundingVolume"]["region"]
+    assert parent_region[2] >= region[2] and parent_region[5] == 50
+
+
+def test_nested_references(tmp_path):
+    dir = str(tmp_path)
+    tms, leaves = pyramid_leaves(dir)
+    paths = list(leaves.values())
+    parent = parent_tile_from_children_json(paths, dir=dir, filename="parent")
+    # Move the first two children under a tile with content of its own
+    data = read(parent.file_path)
+    children = data["root"]["children"]
+    middle = {
+        "boundingVolume": children[0]["boundingVolume"],
+        "geometricError": 5.0,
+        "content": {"uri": "middle.b3dm"},
+        "children": children[:2],
+    }
+    data["root"]["children"] = [middle] + children[2:]
+    with open(parent.file_path, "w") as f:
+        json.dump(data, f)
+
+    region = tms.region(3, 0, 0, 0, 50, margin=1).to_list()
+    write_leaf(paths[1], region, 7.0)
+    update_parent_tiles([paths[1]], build_tree_index(dir))
+
+    root = read(parent.file_path)["root"]
+    middle = root["children"][0]
+    assert middle["children"][1]["boundingVolume"]["region"] == region
+    assert middle["children"][1]["geometricError"] == 7.0
+    assert middle["geometricError"] == 5.0
+    for volume in (middle, root):
+        assert volume["boundingVolume"]["region"][2] >= region[2]
+        assert volume["boundingVolume"]["region"][5] == 50
+
+
+def test_changed_child_that_is_not_referenced(tmp_path):
+    dir = str(tmp_path)
+    _, leaves = pyramid_leaves(dir)
+    paths = list(leaves.values())
+    parent_tile_from_children_json(paths[1:], dir=dir, filename="parent")
+    index = {paths[0]: os.path.join(dir, "parent.json")}
+    with pytest.raises(ValueError):
+        update_parent_tiles([paths[0]], index)
@@ -0,0 +1,90 @@
+import sys
+import threading
+
+import pytest
+
+from pdg3dtiles import Tile, Tileset, deferred_validation
+from pdg3dtiles.Cesium3DTileset import validation_deferred
+
+from .helpers import synthetic_tileset
+
+
+def deepest_leaf(data):
+    tile = data["root"]
+    while tile.get("children"):
+        tile = tile["children"][-1]
+    return tile
+
+
+def count_tiles(tile):
+    return 1 + sum(count_tiles(child) for child in tile.get("children", []))
+
+
+@pytest.mark.parametrize(
+    "change",
+    [
+        {"refine": "SOMETIMES"},
+        {"transform": [1] * 16},
+        {"geometricError": "large"},
+        {"extras": "not a dict"},
+    ],
+)
+def test_invalid_leaf_is_found(gdf, change):
+    data = synthetic_tileset(gdf)
+    deepest_leaf(data).update(change)
+    with pytest.raises(ValueError):
+        Tileset.from_json(data)
+    tileset = Tileset.from_json(data, validate=False)
+    with pytest.raises(ValueError):
+        tileset.validate_tree()
+
+
+def test_each_tile_is_validated_once(gdf, monkeypatch):
+    data = synthetic_tileset(gdf)
+    calls = []
+    validate = Tile.validate
+
+    def counting_validate(self, recursive=True):
+        calls.append(recursive)
+        return validate(self, recursive)
+
+    monkeypatch.setattr(Tile, "validate", counting_validate)
+    n = count_tiles(data["root"])
+    Tileset.from_json(data)
+    assert calls == [False] * n
+
+
+def test_deferred_validation_context():
+    assert not validation_deferred()
+    with deferred_validation():
+        with deferred_validation():
+            assert validation_deferred()
+        Tile(refine="SOMETIMES")
+        assert validation_deferred()
+    assert not validation_deferred()
+    with pytest.raises(ValueError):
+        Tile(refine="SOMETIMES")
+
+
+def test_deferred_validation_is_per_thread():
+    seen = []
+    with deferred_validation():
+        thread = threading.Thread(target=lambda: seen.append(validation_deferred()))
+        thread.start()
+        thread.join()
+    assert seen == [False]
+
+
+def test_validate_tree_of_a_deep_tree():
+    depth = sys.getrecursionlimit() + 100
+    with deferred_validation():
+        tile = Tile(geometricError=0.0)
+        for _ in range(depth):
+            tile = Tile(geometricError=1.0, children=[tile])
+    tile.validate_tree()
+    leaf = tile
+    while leaf.children:
+        leaf = leaf.children[0]
+    leaf.refine = "SOMETIMES"
+    with pytest.raises(ValueError):
+        tile.validate_tree()
@@ -0,0 +1,123 @@
+import os
+import threading
+
+import pytest
+
+from pdg3dtiles import (
+    WriteBehindQueue,
+    leaf_tile_from_gdf,
+    parent_tile_from_children_json,
+)
+
+
+def test_files_are_written(tmp_path):
+    written = []
+    with WriteBehindQueue(workers=2) as writer:
+        for i in range(10):
+            path = str(tmp_path / "dir" / f"{i}.txt")
+            writer.write(path, "x" * i, lambda p, size: written.append((p, size)))
+    for i in range(10):
+        assert (tmp_path / "dir" / f"{i}.txt").read_text() == "x" * i
+    assert sorted(size for _, size in written) == list(range(10))
+    stats = writer.get_stats()
+    assert stats["files"] == 10 and stats["bytes"] == 45
+    assert stats["pending"] == stats["errors"] == 0
+    assert not [p for p in os.listdir(tmp_path / "dir") if p.endswith(".tmp")]
+
+
+def test_errors_are_raised_once(tmp_path):
+    (tmp_path / "file").write_text("")
+    writer = WriteBehindQueue()
+    # The directory of the file is a file, so the write fails
+    future = writer.write(str(tmp_path / "file" / "a.txt"), b"a")
+    with pytest.raises(OSError):
+        future.result()
+    with pytest.raises(OSError, match="a.txt"):
+        writer.flush()
+    writer.flush()
+    writer.write(str(tmp_path / "b.txt"), b"b")
+    writer.close()
+    assert [os.path.basename(path) for path, _ in writer.errors] == ["a.txt"]
+    assert writer.files == 1
+
+
+def test_error_is_raised_by_next_write(tmp_path):
+    (tmp_path / "file").write_text("")
+    writer = WriteBehindQueue()
+    writer.write(str(tmp_path / "file" / "a.txt"), b"a").exception()
+    with pytest.raises(OSError):
+        writer.write(str(tmp_path / "b.txt"), b"b")
+    writer.close()
+    assert not (tmp_path / "b.txt").exists()
+
+
+def test_full_queue_blocks(tmp_path, monkeypatch):
+    release = threading.Event()
+    write_file = WriteBehindQueue.write_file
+
+    def slow_write(path, data):
+        release.wait()
+        write_file(path, data)
+
+    monkeypatch.setattr(WriteBehindQueue, "write_file", staticmethod(slow_write))
+    writer = WriteBehindQueue(workers=1, max_pending=2)
+    writer.write(str(tmp_path / "0.txt"), b"0")
+    writer.write(str(tmp_path / "1.txt"), b"1")
+    third = threading.Thread(target=writer.write, args=(str(tmp_path / "2.txt"), b"2"))
+    third.start()
+    third.join(0.2)
+    assert third.is_alive()
+    assert writer.pending == 2 and writer.blocked == 0
+
+    release.set()
+    third.join()
+    writer.close()
+    assert writer.blocked == 1 and writer.blocked_seconds > 0
+    assert sorted(os.listdir(tmp_path)) == ["0.txt", "1.txt", "2.txt"]
+
+
+def test_closed_queue(tmp_path):
+    writer = WriteBehindQueue()
+    writer.close()
+    with pytest.raises(ValueError):
+        writer.write(str(tmp_path / "a.txt"), b"a")
+    with pytest.raises(ValueError):
+        WriteBehindQueue(workers=0)
+
+
+def test_body_error_is_not_hidden(tmp_path):
+    (tmp_path / "file").write_text("")
+    with pytest.raises(KeyError):
+        with WriteBehindQueue() as writer:
+            writer.write(str(tmp_path / "file" / "a.txt"), b"a").exception()
+            raise KeyError("body")
+
+
+def test_tiles_with_writer(gdf, tmp_path):
+    direct, queued = tmp_path / "direct", tmp_path / "queued"
+    direct.mkdir()
+    leaves = []
+    for i in range(0, 10, 5):
+        _, tileset = leaf_tile_from_gdf(
+            gdf.iloc[i : i + 5].copy(), dir=str(direct), filename=str(i)
+        )
+        leaves.append(tileset.file_path)
+    parent_tile_from_children_json(leaves, dir=str(direct), filename="parent")
+
+    with WriteBehindQueue() as writer:
+        leaves = []
+        for i in range(0, 10, 5):
+            _, tileset = leaf_tile_from_gdf(
+                gdf.iloc[i : i + 5].copy(),
+                dir=str(queued),
+                filename=str(i),
+                writer=writer,
+            )
+            leaves.append(tileset.file_path)
+        writer.flush()
+        parent_tile_from_children_json(
+            leaves, dir=str(queued), filename="parent", writer=writer
+        )
+    assert sorted(os.listdir(queued)) == sorted(os.listdir(direct))
+    for name in ("0.json", "parent.json"):
+        assert (queued / name).read_text() == (direct / name).read_text()